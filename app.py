@@ -6,28 +6,24 @@ Docling PDF 번역기의 웹 인터페이스(Streamlit) 진입점입니다.
 이 모듈은 다음 기능을 수행합니다:
 1.  **UI 구성**: Streamlit을 사용하여 사이드바(설정)와 메인 영역(파일 업로드, 결과 표시)을 구성합니다.
 2.  **상태 관리**: 세션 상태(Session State)를 사용하여 번역 기록, 언어 설정 등을 관리합니다.
-3.  **문서 처리 요청**: `src.core.process_document`를 호출하여 문서 변환 및 번역을 실행합니다.
+3.  **문서 처리 요청**: 업로드한 파일을 `src.job_queue.JobQueue`에 제출하고, 백그라운드 워커가 `src.core.process_document`로 변환 및 번역을 실행합니다.
+    진행 상태 패널만 주기적으로 다시 그리며(`st.fragment`), 파일이 완료될 때만 화면 전체를 다시 그려 결과를 한 번 표시합니다.
 4.  **결과 표시**: 번역된 결과를 화면에 보여주고, 다운로드 기능을 제공합니다.
 5.  **히스토리 관리**: `src.utils.load_history_from_disk`를 통해 이전 작업 기록을 불러옵니다.
 """
 
-# [FIX] PyTorch + Streamlit 호환성 워크어라운드 (Issue #102)
-# Streamlit의 파일 감시(hot-reload) 기능이 torch.classes.__path__._path를 잘못 참조하는 문제 해결
-# 반드시 streamlit import 전에 실행되어야 함
-import torch
-torch.classes.__path__ = []
-
 import streamlit as st
 import os
+import sys
 import logging
 from pathlib import Path
-import shutil
 from datetime import datetime
 
 # src 모듈 임포트
-from src.core import process_document, create_converter
+from src.core import create_converter
+from src.job_queue import JobQueue, QUEUED, RUNNING, DONE, FAILED, CANCELLED
 from src.i18n import t, set_current_lang, get_current_lang
-from src.utils import inject_images, load_history_from_disk
+from src.utils import inject_images, load_history_from_disk, parse_output_dir_name
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -39,15 +35,142 @@ st.set_page_config(
     layout="wide"
 )
 
-# 캐시된 Converter 생성 (speed_mode에 따라 분기)
+# 작업 상태 조회 주기(초): 처리 중인 배치가 있으면 이 간격으로 진행 상태 패널만 다시 그림
+_POLL_INTERVAL = 1.0
+
+# 작업 상태 아이콘
+_STATUS_ICONS = {QUEUED: "⏳", RUNNING: "🔄", DONE: "✅", FAILED: "❌", CANCELLED: "⏹️"}
+
+# Converter 생성 (speed_mode에 따라 분기)
 # Issue #100: 속도 모드에 따라 다른 설정의 Converter 생성
+def _create_converter(speed_mode: str = "balanced"):
+    """
+    Docling Converter 인스턴스를 생성합니다.
+    작업 큐가 speed_mode별로 한 번만 호출하여 모든 작업이 공유합니다.
+    """
+    converter = create_converter(speed_mode=speed_mode)
+    _patch_torch_classes()
+    return converter
+
 @st.cache_resource
-def get_converter(speed_mode: str = "balanced"):
+def get_job_queue() -> JobQueue:
+    """
+    프로세스 전역 작업 큐를 반환합니다 (모든 세션이 공유).
+    작업 상태가 스크립트 재실행/브라우저 재접속과 무관하게 유지됩니다.
+    """
+    return JobQueue(converter_factory=_create_converter)
+
+def _patch_torch_classes():
+    """
+    [FIX] PyTorch + Streamlit 호환성 워크어라운드 (Issue #102)
+    Streamlit의 파일 감시(hot-reload) 기능이 torch.classes.__path__._path를 잘못 참조하는 문제 해결.
+    PyTorch는 Docling 변환기를 만들 때 로드되므로, 앱 시작 시가 아니라 변환기 생성 직후에 적용합니다.
+    (파일 감시는 스크립트 실행이 끝난 뒤 모듈 목록을 확인하므로 이 시점이면 충분함)
+    """
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.classes.__path__ = []
+
+def _sync_batch_query_param():
+    """진행 중인 배치 ID를 URL 쿼리 파라미터에 기록합니다 (브라우저 재접속 시 다시 연결)."""
+    if st.session_state["batches"]:
+        st.query_params["jobs"] = ",".join(st.session_state["batches"])
+    elif "jobs" in st.query_params:
+        del st.query_params["jobs"]
+
+def _add_history(results: list, source_lang: str, target_lang: str, engine: str):
+    """완료된 배치의 결과를 히스토리 맨 앞에 추가합니다 (load_history_from_disk와 같은 형식)."""
+    parsed = parse_output_dir_name(Path(results[0]["output_dir"]).name)
+    ts_str = parsed[3] if parsed else ""
+    try:
+        dt = datetime.strptime(ts_str, "%Y%m%d_%H%M%S")
+        display_time = dt.strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        display_time = ts_str
+
+    st.session_state.history.insert(0, {
+        "timestamp": display_time,
+        "results": results,
+        "source": source_lang,
+        "target": target_lang,
+        "engine": engine
+    })
+
+def render_result(res: dict, key: str):
+    """
+    결과 HTML 하나를 뷰어로 표시합니다.
+    """
+    output_dir = Path(res['output_dir'])
+    html_path = Path(res['html_path'])
+
+    if not html_path.exists():
+        st.error(t("html_not_found"))
+        return
+
+    # HTML 읽기 및 이미지 임베딩
+    with open(html_path, "r", encoding="utf-8") as f:
+        html_content = f.read()
+
+    # 로컬 이미지를 Base64로 변환하여 HTML에 주입
+    html_content = inject_images(html_content, output_dir)
+
+    # 뷰 모드 설정 스크립트 주입
+    # HTML 로드 직후 실행되도록 body 끝에 스크립트 추가
+    # 검수 모드 활성화 (view-mode-inspect 클래스 추가) - 항상 적용
+    script = """
+    <script>
+        document.addEventListener('DOMContentLoaded', function() {
+            document.getElementById('content-container').classList.add('view-mode-inspect');
+            document.getElementById('btn-mode').classList.add('active');
+            document.getElementById('btn-mode').innerText = UI_STRINGS[currentUiLang].mode_read; // 버튼 텍스트는 반대로 (누르면 읽기모드)
+            updateUiText();
+        });
+    </script>
+    """
+    html_content += script
+
+    # 집중 모드: 1컬럼 (전체 너비)
+    st.info(t("single_tip"))
+
+    # 뷰어 (전체 너비)
+    st.components.v1.html(html_content, height=900, scrolling=True)
+
+    # 폴더 열기 버튼
+    if st.button(t("open_folder"), key=f"open_{key}_focus"):
+        try:
+            os.startfile(output_dir)
+            st.success(t("open_folder_success").format(path=output_dir))
+        except Exception as e:
+            st.error(t("open_folder_failed").format(error=e))
+
+@st.fragment(run_every=_POLL_INTERVAL)
+def render_batch_status(batch_id: str, shown_done: frozenset):
     """
-    Docling Converter 인스턴스를 캐싱하여 반환합니다.
-    speed_mode에 따라 다른 설정으로 생성됩니다.
+    처리 중인 배치 하나의 진행 상태 패널입니다. 이 부분만 주기적으로 다시 그립니다.
+    화면에 표시한 완료 파일(`shown_done`)과 달라졌거나 배치가 끝나면 화면 전체를 한 번 다시 그려 결과를 표시합니다.
     """
-    return create_converter(speed_mode=speed_mode)
+    job_queue = get_job_queue()
+    batch = job_queue.get_batch(batch_id)
+    jobs = job_queue.get_jobs(batch_id)
+    if batch is None or batch.finished_at is not None:
+        st.rerun()
+    if frozenset(job.job_id for job in jobs if job.status in (DONE, FAILED)) != shown_done:
+        st.rerun()
+
+    # 강제 중단 버튼 (대기 중인 파일은 바로, 처리 중인 파일은 다음 단계에서 중단)
+    if st.button("🛑 " + t("stop_button"), key=f"stop_{batch_id}"):
+        job_queue.cancel_batch(batch_id)
+        st.rerun()
+
+    total_files = len(jobs)
+    for i, job in enumerate(jobs):
+        if job.status in (DONE, FAILED):
+            continue
+        label = t("status_processing").format(current=i+1, total=total_files, filename=job.file_name)
+        if job.status == RUNNING:
+            st.progress(job.progress, text=f"{_STATUS_ICONS[job.status]} {label} ({job.message})")
+        else:
+            st.text(f"{_STATUS_ICONS[job.status]} {label}")
 
 def main():
     """
@@ -58,6 +181,16 @@ def main():
         # 앱 시작 시 디스크에서 히스토리 로드
         st.session_state.history = load_history_from_disk()
 
+    # 이 세션이 제출한 배치 (재접속 시 URL 쿼리 파라미터에서 복원)
+    if "batches" not in st.session_state:
+        st.session_state["batches"] = [b for b in st.query_params.get("jobs", "").split(",") if b]
+
+    job_queue = get_job_queue()
+    st.session_state["is_processing"] = any(
+        (batch := job_queue.get_batch(batch_id)) is not None and batch.finished_at is None
+        for batch_id in st.session_state["batches"]
+    )
+
     # 언어 변경 콜백
     def set_lang_and_rerun():
         st.session_state["lang"] = st.session_state["lang_choice"]
@@ -179,126 +312,53 @@ def main():
         accept_multiple_files=True
     )
 
-    # 4. 번역 실행
+    # 4. 번역 실행: 작업 큐에 제출하고 바로 반환 (처리는 백그라운드 워커가 담당)
     if uploaded_files:
-        if st.button(t("translate_button"), type="primary", disabled="is_processing" in st.session_state and st.session_state["is_processing"]):
-            st.session_state["is_processing"] = True
-            st.rerun()
-
-    if "is_processing" in st.session_state and st.session_state["is_processing"] and uploaded_files:
-        # 강제 중단/초기화 버튼
-        if st.button("🛑 " + t("stop_button")):
-            st.session_state["is_processing"] = False
+        if st.button(t("translate_button"), type="primary"):
+            batch_id = job_queue.submit_batch(
+                [(f.name, f.getvalue()) for f in uploaded_files],
+                source_lang=source_lang,
+                dest_lang=target_lang,
+                engine=engine,
+                max_workers=max_workers,
+                speed_mode=speed_mode,
+                ui_lang=get_current_lang()
+            )
+            st.session_state["batches"].append(batch_id)
+            _sync_batch_query_param()
             st.rerun()
 
-        # 속도 모드에 따른 Converter 생성 (Issue #100)
-        converter = get_converter(speed_mode=speed_mode)
-        
-        # 진행 상태 표시줄
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        total_files = len(uploaded_files)
-        results = []
-
-        try:
-            for i, uploaded_file in enumerate(uploaded_files):
-                # 임시 파일 저장
-                with open(uploaded_file.name, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                
-                # 진행률 콜백
-                def update_progress(ratio, msg):
-                    # 전체 진행률 = (현재 파일 인덱스 + 현재 파일 진행률) / 전체 파일 수
-                    global_ratio = (i + ratio) / total_files
-                    progress_bar.progress(min(global_ratio, 1.0))
-                    status_text.text(t("status_processing").format(
-                        current=i+1, total=total_files, filename=uploaded_file.name
-                    ) + f" ({msg})")
-
-                try:
-                    # 핵심 처리 로직 호출
-                    result = process_document(
-                        file_path=uploaded_file.name,
-                        converter=converter,
-                        source_lang=source_lang,
-                        dest_lang=target_lang,
-                        engine=engine,
-                        max_workers=max_workers,
-                        progress_cb=update_progress,
-                        ui_lang=get_current_lang()
-                    )
-                    
-                    if result:
-                        results.append({
-                            "filename": uploaded_file.name,
-                            "output_dir": str(result["output_dir"]),
-                            "html_path": str(result["html_path"])
-                        })
-                    
-                    # 임시 파일 삭제
-                    os.remove(uploaded_file.name)
-
-                except Exception as e:
-                    st.error(t("translate_error").format(filename=uploaded_file.name, error=str(e)))
-                    logging.error(f"Processing failed for {uploaded_file.name}: {e}")
-                    import traceback
-                    st.error(traceback.format_exc())
-
-            # 배치 처리 완료 결과 저장
+    # 4-1. 제출한 배치의 진행 상태 표시 (완료된 파일은 결과를 바로 표시)
+    for batch_id in list(st.session_state["batches"]):
+        batch = job_queue.get_batch(batch_id)
+        jobs = job_queue.get_jobs(batch_id)
+        if batch is None:
+            st.session_state["batches"].remove(batch_id)
+            _sync_batch_query_param()
+            continue
+
+        for job in jobs:
+            if job.status == FAILED:
+                st.error(t("translate_error").format(filename=job.file_name, error=job.error))
+
+        # 배치가 끝나면 히스토리로 옮김
+        if batch.finished_at is not None:
+            results = [job.result for job in jobs if job.status == DONE]
             if results:
+                _add_history(results, batch.options["source_lang"], batch.options["dest_lang"], batch.options["engine"])
                 st.success(t("status_all_done"))
-                # 히스토리에 저장 (첫 번째 파일 기준으로 타이틀 생성)
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                first_file = uploaded_files[0].name
-                batch_title = f"[{timestamp}] {first_file}"
-                if len(uploaded_files) > 1:
-                    batch_title += f" (+{len(uploaded_files)-1})"
-                
-                new_history_item = {
-                    "id": batch_title,
-                    "timestamp": timestamp,
-                    "results": results,
-                    "source_lang": source_lang,
-                    "target_lang": target_lang,
-                    "engine": engine
-                }
-                
-                # 히스토리 형식 맞추기 (app.py 하단에서 사용하는 형식과 일치시켜야 함)
-                # 하단 format_history_option에서는 h['results'] (리스트), h['source'], h['target'] 등을 씀
-                # 여기서 insert하는 new_history_item 구조를 하단 코드와 맞춰야 함.
-                # 기존 코드:
-                # new_history_item = {
-                #     "timestamp": display_time,
-                #     "results": results,
-                #     "source": source_lang,
-                #     "target": target_lang,
-                #     "engine": engine
-                # }
-                # id 필드는 하단에서 안 쓰는 것 같지만... 일단 놔둠.
-                # display_time 포맷팅 로직 추가 필요.
-                
-                result_dir = results[0]["output_dir"]
-                ts_str = result_dir.split("_")[-2] + "_" + result_dir.split("_")[-1]
-                try:
-                    dt = datetime.strptime(ts_str, "%Y%m%d_%H%M%S")
-                    display_time = dt.strftime("%Y-%m-%d %H:%M:%S")
-                except:
-                    display_time = ts_str
-
-                new_history_item = {
-                    "timestamp": display_time,
-                    "results": results,
-                    "source": source_lang,
-                    "target": target_lang,
-                    "engine": engine
-                }
-                st.session_state.history.insert(0, new_history_item)
                 st.info(t("batch_hint"))
+            st.session_state["batches"].remove(batch_id)
+            _sync_batch_query_param()
+            continue
 
-        finally:
-            st.session_state["is_processing"] = False
-            st.rerun()
+        # 완료된 파일의 결과는 전체 화면을 그릴 때 한 번만 표시 (진행 상태 패널의 주기적 갱신에는 포함하지 않음)
+        for job in jobs:
+            if job.status == DONE:
+                with st.expander(f"{_STATUS_ICONS[job.status]} {job.file_name}"):
+                    render_result(job.result, key=job.job_id)
+
+        render_batch_status(batch_id, frozenset(job.job_id for job in jobs if job.status in (DONE, FAILED)))
 
     st.markdown("---")
 
@@ -337,48 +397,7 @@ def main():
             
             for i, res in enumerate(selected_record['results']):
                 with tabs[i]:
-                    output_dir = Path(res['output_dir'])
-                    html_path = Path(res['html_path'])
-                    
-                    if not html_path.exists():
-                        st.error(t("html_not_found"))
-                        continue
-
-                    # HTML 읽기 및 이미지 임베딩
-                    with open(html_path, "r", encoding="utf-8") as f:
-                        html_content = f.read()
-                    
-                    # 로컬 이미지를 Base64로 변환하여 HTML에 주입
-                    html_content = inject_images(html_content, output_dir)
-
-                    # 뷰 모드 설정 스크립트 주입
-                    # HTML 로드 직후 실행되도록 body 끝에 스크립트 추가
-                    # 검수 모드 활성화 (view-mode-inspect 클래스 추가) - 항상 적용
-                    script = """
-                    <script>
-                        document.addEventListener('DOMContentLoaded', function() {
-                            document.getElementById('content-container').classList.add('view-mode-inspect');
-                            document.getElementById('btn-mode').classList.add('active');
-                            document.getElementById('btn-mode').innerText = UI_STRINGS[currentUiLang].mode_read; // 버튼 텍스트는 반대로 (누르면 읽기모드)
-                            updateUiText();
-                        });
-                    </script>
-                    """
-                    html_content += script
-
-                    # 집중 모드: 1컬럼 (전체 너비)
-                    st.info(t("single_tip"))
-                    
-                    # 뷰어 (전체 너비)
-                    st.components.v1.html(html_content, height=900, scrolling=True)
-                    
-                    # 폴더 열기 버튼
-                    if st.button(t("open_folder"), key=f"open_{selected_idx}_{i}_focus"):
-                        try:
-                            os.startfile(output_dir)
-                            st.success(t("open_folder_success").format(path=output_dir))
-                        except Exception as e:
-                            st.error(t("open_folder_failed").format(error=e))
+                    render_result(res, key=f"{selected_idx}_{i}")
 
 if __name__ == "__main__":
     main()
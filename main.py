@@ -6,7 +6,11 @@ Docling PDF 번역기의 CLI(Command Line Interface) 진입점입니다.
 이 모듈은 다음 기능을 수행합니다:
 1.  **명령줄 인수 파싱**: `argparse`를 사용하여 파일 경로, 언어 설정, 엔진 선택 등의 인수를 받습니다.
 2.  **문서 처리 요청**: `src.core.process_document`를 호출하여 문서 변환 및 번역을 실행합니다.
-3.  **결과 출력**: 처리 결과를 콘솔에 출력합니다.
+    상주 데몬(`python -m src.daemon`)이 실행 중이면 데몬에 작업을 보내 모델 로드 시간을 생략합니다.
+    데몬에 연결하지 못하거나 데몬이 오류를 반환하면 이 프로세스에서 직접 처리합니다.
+3.  **배치 처리**: 디렉토리, glob 패턴, 목록 파일(`--manifest`)로 여러 파일을 지정하면 `src.batch`로 한 번에 처리하고
+    파일별 결과와 소요 시간을 JSON 요약(`--summary`)으로 저장합니다.
+4.  **결과 출력**: 처리 결과를 콘솔에 출력합니다.
 
 지원 파일 형식:
 - 문서: PDF, DOCX, PPTX, HTML, Image
@@ -17,15 +21,18 @@ Docling PDF 번역기의 CLI(Command Line Interface) 진입점입니다.
     python main.py document.pdf --source en --target ko --engine google
     python main.py README.md --source en --target ko
     python main.py script.py --source ko --target en
+    python main.py samples/ --recursive --summary output/summary.json
+    python main.py "reports/*.pdf" --benchmark
 """
 
+import os
 import argparse
 import logging
 
 from dotenv import load_dotenv
 load_dotenv()  # 현재 작업 디렉터리(.env)를 읽어서 환경변수로 올림
 
-from src.core import process_document, create_converter
+# src.core(및 Docling)는 인수 파싱 후에 임포트 (`--help`가 모델 라이브러리를 로드하지 않도록)
 
 # 로깅 설정
 logging.basicConfig(
@@ -33,14 +40,76 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+def run_local(input_file: str, speed_mode: str, source: str, target: str, engine: str, workers: int) -> dict:
+    """
+    현재 프로세스에서 변환기를 만들고 문서를 처리합니다.
+    """
+    from src.core import process_document, create_converter
+    from src.text_parser import is_text_file
+
+    # Converter 생성 (텍스트 파일은 Docling을 사용하지 않으므로 생략)
+    converter = None
+    if not is_text_file(input_file):
+        converter = create_converter(speed_mode=speed_mode)
+
+    # 문서 처리 실행
+    return process_document(
+        file_path=input_file,
+        converter=converter,
+        source_lang=source,
+        dest_lang=target,
+        engine=engine,
+        max_workers=workers
+    )
+
+def report_benchmark(workers: int, sequential: bool):
+    """벤치마크 리포트를 출력하고 docs/BENCHMARK_LOG.md에 추가합니다."""
+    from src.benchmark import global_benchmark as bench
+
+    bench.max_workers = workers
+    bench.sequential = sequential
+    print(bench.report())
+    bench.save_to_file("docs/BENCHMARK_LOG.md")
+
+def run_batch_cli(args, job_env: dict, speed_mode: str, workers: int) -> int:
+    """
+    여러 파일을 배치로 처리하고 JSON 요약을 저장합니다. 실패한 파일이 있으면 1을 반환합니다.
+    배치는 항상 이 프로세스에서 처리합니다 (데몬은 파일 하나씩만 받음).
+    """
+    from src.batch import collect_inputs, run_batch, write_summary
+
+    files = collect_inputs(args.inputs, manifest=args.manifest, recursive=args.recursive)
+    if not files:
+        print("No input files found.")
+        return 1
+    logging.info(f"Batch mode: {len(files)} files")
+
+    os.environ.update(job_env)
+    summary = run_batch(files, source_lang=args.source, dest_lang=args.target, engine=args.engine,
+                        max_workers=workers, speed_mode=speed_mode, sequential=args.sequential)
+    summary_path = write_summary(summary, args.summary)
+
+    if args.benchmark:
+        report_benchmark(workers, sequential=args.sequential)
+
+    for entry in summary["results"]:
+        if entry["status"] == "done":
+            print(f"[OK]     {entry['file']} -> {entry['html_path']}")
+        else:
+            print(f"[FAILED] {entry['file']}" + (f": {entry['error']}" if entry["error"] else ""))
+    print(f"Processed {summary['succeeded']}/{summary['files']} files in {summary['elapsed']:.2f}s "
+          f"({summary['dedup_hits']} duplicate sentences reused)")
+    print(f"Summary: {summary_path}")
+    return 0 if summary["failed"] == 0 else 1
+
 def main():
     """
     CLI 메인 함수입니다.
     """
     parser = argparse.ArgumentParser(description="Docling PDF Translator CLI")
     
-    # 필수 인수: 입력 파일 경로
-    parser.add_argument("input_file", help="Path to the input file (PDF, DOCX, PPTX, HTML, Image, .md, .py, .txt, etc.)")
+    # 필수 인수: 입력 파일 경로 (여러 개, 디렉토리, glob 패턴 가능)
+    parser.add_argument("inputs", nargs="*", metavar="input", help="Input files (PDF, DOCX, PPTX, HTML, Image, .md, .py, .txt, etc.), directories or glob patterns")
     
     # 선택 인수
     parser.add_argument("--source", default="en", help="Source language code (default: en)")
@@ -48,12 +117,29 @@ def main():
     parser.add_argument("--engine", default="google", choices=["google", "deepl", "gemini", "openai", "qwen-0.6b", "lfm2", "lfm2-koen-mt", "nllb", "nllb-koen", "yanolja"], help="Translation engine (default: google)")
     parser.add_argument("--workers", type=int, default=8, help="Number of parallel workers (default: 8)")
     parser.add_argument("--fast", action="store_true", help="Enable fast mode (optimized for speed)")
+    parser.add_argument("--replicas", type=int, default=None, help="Number of local model replica processes, each pinned to its own CPU cores (default: TRANSLATOR_REPLICAS or 1)")
+    parser.add_argument("--stream", action="store_true", help="Convert PDFs in page ranges and translate them while later pages are still converting")
+    parser.add_argument("--conversion-workers", type=int, default=None, help="Number of processes converting PDF page ranges in parallel (default: CONVERSION_WORKERS or 1)")
+    parser.add_argument("--incremental", action="store_true", help="Reconvert only pages that changed since a previous revision of the PDF was converted")
+    parser.add_argument("--profile", choices=["auto", "full"], default=None, help="PDF converter profile: 'auto' pre-scans each PDF and enables only the models it needs (default: CONVERTER_PROFILE or full)")
+    parser.add_argument("--page-budget", type=float, default=None, help="Per-page PDF conversion time limit in seconds; slower pages fall back to the fast backend or a page image (default: PAGE_TIME_BUDGET or 0 = no limit)")
+
+    parser.add_argument("--no-daemon", action="store_true", help="Process the file in this process even if a translation daemon (python -m src.daemon) is running")
+
+    # 배치 처리 (여러 파일)
+    parser.add_argument("--manifest", default=None, help="File listing input paths (one per line, or a JSON array)")
+    parser.add_argument("--recursive", action="store_true", help="Include files in subdirectories of directory inputs")
+    parser.add_argument("--summary", default=None, help="Path of the JSON batch summary (default: output/batch_summary_<timestamp>.json)")
+    parser.add_argument("--sequential", action="store_true", help="Process batch files one at a time instead of overlapping stages (for comparison)")
+    parser.add_argument("--benchmark", action="store_true", help="Print a benchmark report and append it to docs/BENCHMARK_LOG.md")
 
     args = parser.parse_args()
+    if not args.inputs and not args.manifest:
+        parser.error("at least one input or --manifest is required")
 
-    # Converter 생성
-    speed_mode = "fast" if args.fast else "balanced"
-    converter = create_converter(speed_mode=speed_mode)
+    if args.benchmark:
+        from src.benchmark import global_benchmark as bench
+        bench.enabled = True
 
     # 로컬 모델(Qwen, Yanolja) 사용 시 기본 워커 수를 1로 조정 (사용자가 명시적으로 지정하지 않은 경우)
     # argparse의 default는 8이지만, 로컬 모델의 메모리 사용량을 고려하여 안전하게 처리
@@ -64,18 +150,79 @@ def main():
         workers = 1
         logging.info(f"{args.engine} engine selected: Defaulting to 1 worker for memory safety.")
 
-    # 문서 처리 실행
-    result = process_document(
-        file_path=args.input_file,
-        converter=converter,
-        source_lang=args.source,
-        dest_lang=args.target,
-        engine=args.engine,
-        max_workers=workers
-    )
+    # CLI 옵션은 환경 변수로 전달 (core/레지스트리가 읽음, 데몬에는 작업별로 전달)
+    job_env = {}
+
+    # 로컬 모델 복제본 수 (레지스트리가 엔진 생성 시 읽음)
+    if args.replicas is not None:
+        job_env["TRANSLATOR_REPLICAS"] = str(max(args.replicas, 1))
+
+    # PDF 병렬 변환 워커 수 (core가 파일 변환 시 읽음)
+    if args.conversion_workers is not None:
+        job_env["CONVERSION_WORKERS"] = str(max(args.conversion_workers, 1))
+
+    # 변환기 프로필 자동 선택 (core가 파일마다 사전 스캔 시 읽음)
+    if args.profile:
+        job_env["CONVERTER_PROFILE"] = args.profile
+
+    # 페이지당 변환 시간 제한 (core가 파일 변환 시 읽음)
+    if args.page_budget is not None:
+        job_env["PAGE_TIME_BUDGET"] = str(max(args.page_budget, 0.0))
+
+    # 페이지 단위 증분 변환 (core가 파일 변환 시 읽음)
+    if args.incremental:
+        job_env["INCREMENTAL_CONVERSION"] = "1"
+
+    # 스트리밍 파이프라인 (core가 파일 처리 시 읽음)
+    if args.stream:
+        job_env["PIPELINE_STREAMING"] = "1"
+
+    speed_mode = "fast" if args.fast else "balanced"
+
+    # 여러 파일(디렉토리, glob, 목록 파일)은 배치로 처리
+    single_file = (len(args.inputs) == 1 and not args.manifest and not os.path.isdir(args.inputs[0])
+                   and not any(c in args.inputs[0] for c in "*?["))
+    if not single_file:
+        exit(run_batch_cli(args, job_env, speed_mode, workers))
+
+    input_file = args.inputs[0]
+
+    # 상주 데몬이 실행 중이면 작업을 보내고, 아니면 이 프로세스에서 직접 처리
+    from src.daemon import is_daemon_enabled, daemon_available, submit_job, DaemonError
+
+    result = None
+    ran_on_daemon = False
+    if not args.no_daemon and is_daemon_enabled() and daemon_available():
+        logging.info("Translation daemon detected: submitting job")
+        try:
+            result = submit_job(
+                file_path=input_file,
+                source_lang=args.source,
+                dest_lang=args.target,
+                engine=args.engine,
+                max_workers=workers,
+                speed_mode=speed_mode,
+                env=job_env,
+            )
+            ran_on_daemon = True
+        except (DaemonError, OSError) as e:
+            # 데몬 연결/처리 오류는 이 프로세스에서 직접 처리 (데몬이 없는 것과 같은 결과를 보장)
+            logging.warning(f"Translation daemon failed, processing locally: {e}")
+
+    if result is None:
+        os.environ.update(job_env)
+        result = run_local(input_file, speed_mode, args.source, args.target, args.engine, workers)
+
+    if args.benchmark:
+        if ran_on_daemon:
+            # 시간 측정은 데몬 프로세스에서 이루어지므로 이 프로세스에는 기록이 없음
+            logging.warning("--benchmark: the job ran on the translation daemon, so no benchmark report was recorded "
+                            "in this process (use --no-daemon to benchmark)")
+        else:
+            report_benchmark(workers, sequential=args.sequential)
 
     if result:
-        print(f"Successfully processed: {args.input_file}")
+        print(f"Successfully processed: {input_file}")
         print(f"Output directory: {result['output_dir']}")
         print(f"HTML file: {result['html_path']}")
     else:
@@ -0,0 +1,192 @@
+"""
+src/batch.py
+============
+여러 파일(디렉토리, glob 패턴, 목록 파일)을 한 번에 번역하는 CLI 배치 처리 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **입력 확장**: 디렉토리(지원하는 문서/텍스트 파일), glob 패턴(`"docs/**/*.pdf"`), 목록 파일(한 줄에 경로 하나 또는 JSON 배열)을
+    처리할 파일 목록으로 펼칩니다. 같은 파일은 한 번만 처리합니다.
+2.  **배치 실행**: 모든 파일을 배치 스케줄러(`src.batch_scheduler`)로 단계를 겹쳐 처리합니다.
+    번역 요청은 공유 스레드 풀과 속도 제한(`src.translation.executor`)을 함께 사용하고,
+    여러 파일에 같은 문장이 있으면 한 번만 번역합니다(`src.translation.dedup`).
+3.  **요약 저장**: 파일별 상태, 출력 경로, 단계별 소요 시간과 배치 전체 통계(API 엔진의 동시성 한도 포함)를 JSON으로 저장합니다.
+
+사용 예시:
+    python main.py samples/ --summary output/nightly.json
+    python main.py "reports/**/*.pdf" --manifest extra_files.txt
+"""
+
+import glob
+import json
+import time
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.benchmark import global_benchmark as bench
+
+# 디렉토리 입력에서 처리하는 문서 확장자 (텍스트/코드 파일은 TextFileParser.EXTENSION_MAP 기준)
+DOCUMENT_EXTENSIONS = frozenset({"pdf", "docx", "pptx", "html", "htm", "png", "jpg", "jpeg"})
+
+_GLOB_CHARS = set("*?[")
+
+
+def is_supported_file(path: Path) -> bool:
+    """디렉토리 입력에서 처리할 파일인지 확인합니다 (확장자 기준)."""
+    from src.text_parser import TextFileParser
+
+    ext = path.suffix.lstrip(".").lower()
+    return ext in DOCUMENT_EXTENSIONS or ext in TextFileParser.EXTENSION_MAP
+
+
+def read_manifest(manifest_path: str) -> List[str]:
+    """
+    목록 파일에서 경로를 읽습니다. JSON 배열이거나 한 줄에 경로 하나(`#`으로 시작하는 줄은 주석)입니다.
+    상대 경로는 목록 파일이 있는 디렉토리를 기준으로 합니다.
+    """
+    manifest = Path(manifest_path)
+    content = manifest.read_text(encoding="utf-8")
+    if content.lstrip().startswith("["):
+        entries = [str(entry) for entry in json.loads(content)]
+    else:
+        entries = [line.strip() for line in content.splitlines()]
+        entries = [line for line in entries if line and not line.startswith("#")]
+    return [str(manifest.parent / entry) if not Path(entry).is_absolute() else entry for entry in entries]
+
+
+def collect_inputs(inputs: List[str], manifest: Optional[str] = None, recursive: bool = False) -> List[str]:
+    """
+    입력 인수(파일, 디렉토리, glob 패턴)와 목록 파일을 처리할 파일 목록으로 펼칩니다.
+
+    Args:
+        inputs: 파일 경로, 디렉토리, glob 패턴 목록
+        manifest: 목록 파일 경로 (선택)
+        recursive: 디렉토리 입력에서 하위 디렉토리까지 찾을지 여부
+
+    Returns:
+        List[str]: 입력 순서를 유지한, 중복 없는 파일 경로 목록
+    """
+    entries = list(inputs)
+    if manifest:
+        entries.extend(read_manifest(manifest))
+
+    files: List[str] = []
+    for entry in entries:
+        path = Path(entry)
+        if path.is_dir():
+            candidates = path.rglob("*") if recursive else path.iterdir()
+            files.extend(str(p) for p in sorted(candidates)
+                         if p.is_file() and not p.name.startswith(".") and is_supported_file(p))
+        elif _GLOB_CHARS & set(entry):
+            matches = sorted(glob.glob(entry, recursive=True))
+            if not matches:
+                logging.warning(f"[Batch] 패턴과 일치하는 파일이 없습니다: {entry}")
+            files.extend(m for m in matches if Path(m).is_file())
+        else:
+            # 존재하지 않는 파일도 목록에 남겨 요약에 실패로 기록
+            files.append(entry)
+
+    seen = set()
+    unique = []
+    for f in files:
+        key = Path(f).resolve()
+        if key not in seen:
+            seen.add(key)
+            unique.append(f)
+    return unique
+
+
+def run_batch(
+    files: List[str],
+    source_lang: str = "en",
+    dest_lang: str = "ko",
+    engine: str = "google",
+    max_workers: int = 8,
+    speed_mode: str = "balanced",
+    sequential: bool = False,
+) -> Dict:
+    """
+    파일 목록을 처리하고 요약을 반환합니다.
+
+    Args:
+        sequential (bool): True면 단계를 겹치지 않고 파일을 하나씩 차례로 처리 (비교용)
+
+    Returns:
+        Dict: 배치 요약 (파일별 결과, 단계별 시간 합계, 중복 제거 적중 수 등)
+    """
+    from src.core import create_converter
+    from src.batch_scheduler import BatchScheduler
+    from src.translation.dedup import batch_dedup
+    from src.translation.executor import concurrency_stats
+
+    converter_factory = lambda mode: create_converter(speed_mode=mode)
+    # 순차 모드: 모든 단계가 워커 하나씩만 사용하고 큐에 파일을 쌓지 않음
+    scheduler = (BatchScheduler(converter_factory, cpu_slots=1, net_slots=1, queue_size=1) if sequential
+                 else BatchScheduler(converter_factory))
+
+    started = datetime.now()
+    bench.start("Total Batch Execution")
+    t_start = time.time()
+    with batch_dedup() as dedup:
+        items = []
+        for path in files:
+            item = scheduler.submit(path, speed_mode=speed_mode, source_lang=source_lang, dest_lang=dest_lang,
+                                    engine=engine, max_workers=max_workers)
+            if sequential:
+                item.wait()
+            items.append(item)
+        for item in items:
+            item.wait()
+    elapsed = time.time() - t_start
+    bench.end("Total Batch Execution")
+
+    results = []
+    stage_totals: Dict[str, float] = {}
+    for item in items:
+        error = (str(item.error) or type(item.error).__name__) if item.error else ""
+        if not item.result and not error:
+            error = "processing failed (see log)"
+        for stage, seconds in item.timings.items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+        results.append({
+            "file": item.file_path,
+            "status": "done" if item.result else "failed",
+            "output_dir": str(item.result.get("output_dir", "")),
+            "html_path": str(item.result.get("html_path", "")),
+            "error": error,
+            "timings": {stage: round(seconds, 3) for stage, seconds in item.timings.items()},
+        })
+
+    succeeded = sum(1 for r in results if r["status"] == "done")
+    logging.info(
+        f"[Batch] {succeeded}/{len(results)}개 파일 성공, {elapsed:.2f}초 "
+        f"(단계별 합계 {sum(stage_totals.values()):.2f}초, 중복 문장 {dedup.hits}개 재사용)"
+    )
+    return {
+        "started": started.isoformat(timespec="seconds"),
+        "elapsed": round(elapsed, 3),
+        "engine": engine,
+        "source_lang": source_lang,
+        "dest_lang": dest_lang,
+        "sequential": sequential,
+        "files": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "dedup_hits": dedup.hits,
+        "stage_totals": {stage: round(seconds, 3) for stage, seconds in stage_totals.items()},
+        # API 엔진별 적응형 동시성 상태 (배치 종료 시점의 한도, 요청 제한 횟수 등)
+        "concurrency": concurrency_stats(),
+        "results": results,
+    }
+
+
+def write_summary(summary: Dict, path: Optional[str] = None) -> Path:
+    """배치 요약을 JSON으로 저장합니다 (기본 경로: output/batch_summary_{타임스탬프}.json)."""
+    if path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = str(Path("output") / f"batch_summary_{timestamp}.json")
+    summary_path = Path(path)
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    summary_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return summary_path
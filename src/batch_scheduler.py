@@ -0,0 +1,277 @@
+"""
+src/batch_scheduler.py
+======================
+여러 파일을 단계별 워커로 나누어 겹쳐 처리하는 배치 스케줄러 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **단계 분리**: 문서 처리를 변환(Docling) → 번역 → HTML 생성 단계로 나누고, 단계마다 별도 워커가 처리합니다.
+    파일 A를 번역하는 동안 파일 B를 변환하므로, 여러 파일의 전체 시간이 (단계 시간의 합)에서 (가장 긴 단계의 합)에 가깝게 줄어듭니다.
+2.  **크기가 제한된 큐**: 단계 사이는 크기가 제한된 큐로 연결됩니다. 번역이 변환보다 느리면 큐가 가득 차 변환이 잠시 멈추므로,
+    메모리에 쌓이는 변환 결과(DoclingDocument) 수가 제한됩니다.
+3.  **전역 동시성 제한**: CPU를 쓰는 작업(변환, HTML 생성, 로컬 모델 번역)은 `BATCH_CPU_SLOTS`개의 슬롯을 나누어 쓰고,
+    네트워크 번역(Google, DeepL 등)은 `BATCH_NET_SLOTS`개의 워커가 동시에 처리합니다.
+4.  **텍스트 파일**: 변환이 필요 없는 텍스트/코드 파일은 번역 워커에서 바로 처리합니다.
+
+각 단계의 처리 내용은 `src.core`의 `convert_document_stage`, `translate_document_stage`, `render_document_stage`와 같으며,
+`process_single_file`로 파일 하나씩 처리한 결과와 동일한 출력을 만듭니다.
+
+환경 변수:
+- `BATCH_CPU_SLOTS`: 동시에 실행할 CPU 작업(변환, HTML 생성, 로컬 모델 번역) 수 (기본값: 1)
+- `BATCH_NET_SLOTS`: 동시에 번역할 파일 수 (기본값: 4)
+- `BATCH_QUEUE_SIZE`: 다음 단계를 기다리며 보관할 파일 수 (기본값: 2)
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, str(default))), 1)
+    except ValueError:
+        return default
+
+
+@dataclass
+class BatchItem:
+    """스케줄러에 제출한 파일 하나의 처리 상태입니다."""
+    file_path: str
+    options: Dict[str, Any]
+    speed_mode: str = "balanced"
+    progress_cb: Optional[Callable[[float, str], None]] = None
+    on_done: Optional[Callable[["BatchItem"], None]] = None
+    # 처리 결과 (output_dir, html_path). 실패 시 빈 딕셔너리
+    result: dict = field(default_factory=dict)
+    error: Optional[BaseException] = None
+    # 단계별 소요 시간(초): convert, translate, render
+    timings: Dict[str, float] = field(default_factory=dict)
+    done: threading.Event = field(default_factory=threading.Event)
+    # 단계 사이에 전달되는 문서 처리 상태 (core.DocumentJob)
+    job: Any = None
+
+    def wait(self, timeout: Optional[float] = None) -> dict:
+        """처리가 끝날 때까지 기다린 뒤 결과를 반환합니다."""
+        self.done.wait(timeout)
+        return self.result
+
+
+class BatchScheduler:
+    """
+    변환, 번역, HTML 생성 워커를 유지하며 제출된 파일을 단계별로 처리하는 스케줄러입니다.
+    워커는 처음 제출할 때 시작되어 프로세스가 끝날 때까지 유지됩니다.
+    """
+
+    def __init__(
+        self,
+        converter_factory: Callable[[str], Any],
+        cpu_slots: Optional[int] = None,
+        net_slots: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            converter_factory: 속도 모드("balanced", "fast")를 받아 Docling 변환기를 만드는 함수 (모드별로 한 번만 호출)
+            cpu_slots (Optional[int]): CPU 작업 동시 실행 수. None이면 BATCH_CPU_SLOTS 또는 1
+            net_slots (Optional[int]): 번역 워커 수. None이면 BATCH_NET_SLOTS 또는 4
+            queue_size (Optional[int]): 단계 사이 큐 크기. None이면 BATCH_QUEUE_SIZE 또는 2
+        """
+        self.converter_factory = converter_factory
+        self.cpu_slots = cpu_slots or _env_int("BATCH_CPU_SLOTS", 1)
+        self.net_slots = net_slots or _env_int("BATCH_NET_SLOTS", 4)
+        queue_size = queue_size or _env_int("BATCH_QUEUE_SIZE", 2)
+
+        self._cpu = threading.BoundedSemaphore(self.cpu_slots)
+        self._convert_q: "queue.Queue[BatchItem]" = queue.Queue()
+        self._translate_q: "queue.Queue[BatchItem]" = queue.Queue(maxsize=queue_size)
+        self._render_q: "queue.Queue[BatchItem]" = queue.Queue(maxsize=queue_size)
+
+        self._converters: Dict[str, Any] = {}
+        self._converter_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._started = False
+
+    # ------------------------------------------------------------------
+    # 제출
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        file_path: str,
+        speed_mode: str = "balanced",
+        progress_cb: Optional[Callable[[float, str], None]] = None,
+        on_done: Optional[Callable[[BatchItem], None]] = None,
+        **options,
+    ) -> BatchItem:
+        """
+        파일 하나를 제출합니다.
+
+        Args:
+            file_path (str): 처리할 파일 경로
+            speed_mode (str): 변환기 속도 모드 ("balanced", "fast")
+            progress_cb: 진행률 콜백 (process_document와 같은 형식)
+            on_done: 처리가 끝나면(성공/실패 모두) 호출되는 함수
+            **options: source_lang, dest_lang, engine, max_workers, ui_lang
+
+        Returns:
+            BatchItem: 처리 상태 (`wait()`로 결과를 기다릴 수 있음)
+        """
+        self._ensure_started()
+        item = BatchItem(file_path=file_path, options=options, speed_mode=speed_mode,
+                         progress_cb=progress_cb, on_done=on_done)
+        self._convert_q.put(item)
+        return item
+
+    def run(self, files: List[str], speed_mode: str = "balanced", **options) -> List[BatchItem]:
+        """
+        파일 목록을 모두 제출하고 끝날 때까지 기다립니다.
+
+        Returns:
+            List[BatchItem]: 제출 순서대로의 처리 상태
+        """
+        t_start = time.time()
+        items = [self.submit(path, speed_mode=speed_mode, **options) for path in files]
+        for item in items:
+            item.wait()
+
+        elapsed = time.time() - t_start
+        stage_total = sum(sum(item.timings.values()) for item in items)
+        logging.info(
+            f"[Batch] {len(items)}개 파일 처리 완료: {elapsed:.2f}초 "
+            f"(단계별 처리 시간 합계 {stage_total:.2f}초)"
+        )
+        return items
+
+    # ------------------------------------------------------------------
+    # 워커
+    # ------------------------------------------------------------------
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._started:
+                return
+            workers = [(self._convert_worker, self.cpu_slots, "convert"),
+                       (self._translate_worker, self.net_slots, "translate"),
+                       (self._render_worker, 1, "render")]
+            for target, count, name in workers:
+                for i in range(count):
+                    threading.Thread(target=target, name=f"batch-{name}-{i}", daemon=True).start()
+            self._started = True
+
+    def _get_converter(self, speed_mode: str):
+        with self._converter_lock:
+            converter = self._converters.get(speed_mode)
+            if converter is None:
+                converter = self._converters[speed_mode] = self.converter_factory(speed_mode)
+            return converter
+
+    def _cpu_slot_for(self, engine: str):
+        """로컬 모델 엔진의 번역은 CPU 작업이므로 CPU 슬롯을 사용합니다."""
+        from src.translation import LOCAL_ENGINES
+
+        return self._cpu if engine.lower() in LOCAL_ENGINES else nullcontext()
+
+    def _finish(self, item: BatchItem, error: Optional[BaseException] = None):
+        if error is not None:
+            logging.error(f"[Batch] 처리 실패: {Path(item.file_path).name}: {str(error) or type(error).__name__}")
+            item.error = error
+            item.result = {}
+        elif item.job is not None:
+            item.result = item.job.result
+        item.job = None  # 변환 결과(문서)를 메모리에서 해제
+        item.done.set()
+        if item.on_done:
+            try:
+                item.on_done(item)
+            except Exception as e:
+                logging.warning(f"[Batch] 완료 콜백 오류(무시됨): {e}")
+
+    def _timed(self, item: BatchItem, stage: str, func, *args):
+        t_start = time.time()
+        try:
+            return func(*args)
+        finally:
+            item.timings[stage] = item.timings.get(stage, 0.0) + time.time() - t_start
+
+    def _convert_worker(self):
+        from src.core import DocumentJob, PROGRESS_MESSAGES, convert_document_stage
+        from src.text_parser import is_text_file
+
+        while True:
+            item = self._convert_q.get()
+            try:
+                options = item.options
+                msgs = PROGRESS_MESSAGES.get(options.get("ui_lang", "ko"), PROGRESS_MESSAGES["ko"])
+                file_name = Path(item.file_path).name
+                if item.progress_cb:
+                    item.progress_cb(0.02, msgs["analyzing"].format(file_name=file_name))
+
+                # 텍스트 파일은 변환 없이 번역 워커에서 처리
+                if is_text_file(item.file_path):
+                    self._translate_q.put(item)
+                    continue
+
+                item.job = DocumentJob(
+                    file_path=item.file_path,
+                    converter=self._get_converter(item.speed_mode),
+                    source_lang=options.get("source_lang", "en"),
+                    target_lang=options.get("dest_lang", "ko"),
+                    engine=options.get("engine", "google"),
+                    max_workers=options.get("max_workers", 8),
+                    progress_cb=item.progress_cb,
+                    msgs=msgs,
+                )
+                with self._cpu:
+                    converted = self._timed(item, "convert", convert_document_stage, item.job)
+            except Exception as e:
+                self._finish(item, e)
+                continue
+
+            if converted:
+                # 번역 워커가 밀려 있으면 여기서 대기 (변환 결과가 메모리에 쌓이지 않도록)
+                self._translate_q.put(item)
+            else:
+                self._finish(item)
+
+    def _translate_worker(self):
+        from src.core import process_text_file, translate_document_stage
+
+        while True:
+            item = self._translate_q.get()
+            options = item.options
+            engine = options.get("engine", "google")
+            try:
+                with self._cpu_slot_for(engine):
+                    if item.job is None:
+                        item.result = self._timed(
+                            item, "translate", process_text_file,
+                            item.file_path, options.get("source_lang", "en"), options.get("dest_lang", "ko"),
+                            engine, options.get("max_workers", 8), item.progress_cb, options.get("ui_lang", "ko"),
+                        )
+                    else:
+                        self._timed(item, "translate", translate_document_stage, item.job)
+            except Exception as e:
+                self._finish(item, e)
+                continue
+
+            if item.job is None:
+                self._finish(item)
+            else:
+                self._render_q.put(item)
+
+    def _render_worker(self):
+        from src.core import render_document_stage
+
+        while True:
+            item = self._render_q.get()
+            try:
+                with self._cpu:
+                    self._timed(item, "render", render_document_stage, item.job)
+            except Exception as e:
+                self._finish(item, e)
+                continue
+            self._finish(item)
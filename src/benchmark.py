@@ -7,9 +7,14 @@ src/benchmark.py
 1.  **시간 측정**: 특정 작업 구간의 실행 시간을 측정하고 기록합니다.
 2.  **통계 수집**: 처리된 문자 수, 단어 수 등의 통계 데이터를 수집합니다.
 3.  **리포트 생성**: 수집된 데이터를 바탕으로 성능 분석 리포트를 생성하고 파일로 저장합니다.
+
+배치 스케줄러와 공유 스레드 풀의 여러 스레드가 동시에 기록하므로 모든 기록은 잠금 안에서 수행합니다.
+타이머의 시작과 종료는 같은 단계(같은 스레드) 안에서 호출해야 하며,
+여러 단계에 걸친 구간은 `add_manual_record`로 기록합니다.
 """
 
 import time
+import threading
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 import logging
@@ -36,6 +41,7 @@ class Benchmark:
         self.stats: Dict[str, StatRecord] = {}
         self.active_timers: Dict[str, float] = {}
         self._start_time = time.time()
+        self._lock = threading.Lock()
         self.enabled = False  # 기본값은 False, main.py에서 활성화
         
         # 실행 메타데이터 (리포트에 표시용)
@@ -46,43 +52,42 @@ class Benchmark:
         """타이머 시작"""
         if not self.enabled:
             return
-        if name in self.active_timers:
-            pass
-        self.active_timers[name] = time.time()
+        with self._lock:
+            self.active_timers[name] = time.time()
 
     def end(self, name: str):
         """타이머 종료 및 기록"""
         if not self.enabled:
             return
-        if name not in self.active_timers:
-            return
-        
-        start_time = self.active_timers.pop(name)
         end_time = time.time()
-        duration = end_time - start_time
-        
-        self.records.append(TimeRecord(name, start_time, end_time, duration))
+        with self._lock:
+            start_time = self.active_timers.pop(name, None)
+            if start_time is None:
+                return
+            self.records.append(TimeRecord(name, start_time, end_time, end_time - start_time))
 
     def add_manual_record(self, name: str, start_time: float, end_time: float):
         """수동으로 시간 기록 추가 (예: Import Time)"""
         if not self.enabled:
             return
         duration = end_time - start_time
-        self.records.append(TimeRecord(name, start_time, end_time, duration))
+        with self._lock:
+            self.records.append(TimeRecord(name, start_time, end_time, duration))
 
     def add_stat(self, name: str, duration: float, count: int = 1, volume: float = 0.0, unit: str = ""):
         """통계 데이터 추가 (예: 이미지 저장 1회, 0.5초 소요)"""
         if not self.enabled:
             return
-        
-        if name not in self.stats:
-            self.stats[name] = StatRecord(name, unit=unit)
-        
-        record = self.stats[name]
-        record.count += count
-        record.volume += volume
-        record.total_duration += duration
-        record.unit = unit
+
+        with self._lock:
+            if name not in self.stats:
+                self.stats[name] = StatRecord(name, unit=unit)
+
+            record = self.stats[name]
+            record.count += count
+            record.volume += volume
+            record.total_duration += duration
+            record.unit = unit
 
     def report(self) -> str:
         """벤치마크 리포트 생성"""
@@ -90,6 +95,10 @@ class Benchmark:
             return ""
 
         total_duration = time.time() - self._start_time
+        with self._lock:
+            records = list(self.records)
+            stats = [(name, StatRecord(s.name, s.count, s.volume, s.total_duration, s.unit))
+                     for name, s in self.stats.items()]
         
         lines = []
         lines.append("=" * 60)
@@ -109,17 +118,17 @@ class Benchmark:
         lines.append("-" * 60)
         
         # 1. 일반 타이머 기록
-        sorted_records = sorted(self.records, key=lambda r: r.start_time)
+        sorted_records = sorted(records, key=lambda r: r.start_time)
         for record in sorted_records:
             lines.append(f"{record.name:<40} | {record.duration:.2f}초")
             
         lines.append("-" * 60)
         
         # 2. 통계 기록 (있을 경우)
-        if self.stats:
+        if stats:
             lines.append(f"{'통계 항목':<30} | {'횟수':<6} | {'평균 시간':<10} | {'처리량 (Throughput)'}")
             lines.append("-" * 60)
-            for name, stat in self.stats.items():
+            for name, stat in stats:
                 avg_time = stat.total_duration / stat.count if stat.count > 0 else 0
                 throughput = ""
                 if stat.volume > 0 and stat.total_duration > 0:
@@ -0,0 +1,226 @@
+"""
+src/conversion_cache.py
+=======================
+Docling 변환 결과(`DoclingDocument`)를 디스크에 보관하는 변환 캐시 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **내용 기반 키**: (파일 내용 해시, 변환기 설정, Docling 버전)으로 캐시 키를 만듭니다.
+    파일 이름이나 경로가 달라도 내용이 같으면 같은 변환 결과를 재사용합니다.
+2.  **영구 저장**: 변환된 문서를 이미지가 포함된 JSON으로 저장하고, 다음 실행에서 그대로 불러옵니다.
+3.  **크기 제한 LRU**: 전체 캐시 크기가 제한을 넘으면 가장 오래 사용하지 않은 문서부터 삭제합니다.
+
+같은 문서를 여러 언어나 여러 엔진으로 번역할 때 가장 느린 변환 단계를 한 번만 수행합니다.
+
+환경 변수:
+- `CONVERSION_CACHE`: `0`/`false`/`off`로 설정하면 변환 캐시를 비활성화합니다. (기본값: 활성화)
+- `CONVERSION_CACHE_DIR`: 캐시 디렉토리 (기본값: `.cache/conversions`)
+- `CONVERSION_CACHE_MAX_MB`: 캐시 최대 크기(MB). `0`이면 제한 없음 (기본값: `2048`)
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from docling_core.types.doc import DoclingDocument, ImageRefMode
+
+from src.benchmark import global_benchmark as bench
+
+DEFAULT_CACHE_DIR = Path(".cache") / "conversions"
+
+# 파일 해시 계산 시 한 번에 읽는 크기
+_READ_CHUNK = 1 << 20
+
+
+def file_hash(file_path: str) -> str:
+    """파일 내용의 SHA-256 해시(16진수 문자열)를 반환합니다."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_READ_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _package_version(name: str) -> str:
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return "unknown"
+
+
+def converter_fingerprint(converter: Any) -> str:
+    """
+    변환 결과에 영향을 주는 변환기 설정(포맷별 파이프라인/백엔드/파이프라인 옵션)과
+    Docling 버전을 하나의 해시로 요약합니다. 속도 모드가 다르면 다른 값이 됩니다.
+    """
+    parts = [f"docling={_package_version('docling')}", f"docling-core={_package_version('docling-core')}"]
+    format_options = getattr(converter, "format_to_options", {}) or {}
+    for fmt in sorted(format_options, key=str):
+        option = format_options[fmt]
+        pipeline_options = getattr(option, "pipeline_options", None)
+        options_json = pipeline_options.model_dump_json() if hasattr(pipeline_options, "model_dump_json") else repr(pipeline_options)
+        parts.append(
+            f"{fmt}|{getattr(getattr(option, 'pipeline_cls', None), '__name__', '')}"
+            f"|{getattr(getattr(option, 'backend', None), '__name__', '')}|{options_json}"
+        )
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class ConversionCache:
+    """
+    디렉토리 기반의 변환 결과 캐시입니다. 문서 하나가 `<키>.json` 파일 하나에 저장됩니다.
+    파일 수정 시각을 마지막 사용 시각으로 사용하여 LRU로 정리합니다.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            cache_dir (Optional[Path]): 캐시 디렉토리. None이면 환경 변수 또는 기본 경로를 사용합니다.
+            max_bytes (Optional[int]): 최대 크기(바이트). None이면 환경 변수 `CONVERSION_CACHE_MAX_MB`를 사용하며, 0이면 제한 없음
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("CONVERSION_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if max_bytes is None:
+            try:
+                max_bytes = int(float(os.getenv("CONVERSION_CACHE_MAX_MB", "2048")) * 1024 * 1024)
+            except ValueError:
+                max_bytes = 2048 * 1024 * 1024
+        self.max_bytes = max(max_bytes, 0)
+        self._lock = threading.Lock()
+        # 변환기 id -> 설정 해시 (변환기마다 한 번만 계산)
+        self._fingerprints: Dict[int, str] = {}
+        # (경로, 수정 시각, 크기) -> 파일 내용 해시 (조회와 저장에서 같은 파일을 두 번 읽지 않도록)
+        self._file_hashes: Dict[tuple, str] = {}
+
+    def settings_key(self, converter: Any) -> str:
+        """변환기 설정 해시를 반환합니다 (변환기마다 한 번만 계산)."""
+        fingerprint = self._fingerprints.get(id(converter))
+        if fingerprint is None:
+            fingerprint = self._fingerprints[id(converter)] = converter_fingerprint(converter)
+        return fingerprint
+
+    def make_key(self, file_path: str, converter: Any) -> str:
+        """(파일 내용 해시, 변환기 설정 해시)로 캐시 키를 만듭니다."""
+        fingerprint = self.settings_key(converter)
+        stat = os.stat(file_path)
+        stat_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        content_hash = self._file_hashes.get(stat_key)
+        if content_hash is None:
+            content_hash = self._file_hashes[stat_key] = file_hash(file_path)
+        return hashlib.sha256(f"{content_hash}:{fingerprint}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def load(self, key: str) -> Optional[DoclingDocument]:
+        """캐시된 문서를 불러옵니다. 없거나 손상되었으면 None을 반환합니다."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            doc = DoclingDocument.load_from_json(path)
+        except Exception as e:
+            logging.warning(f"[ConversionCache] 손상된 캐시 삭제: {path.name} ({e})")
+            path.unlink(missing_ok=True)
+            return None
+        # LRU: 마지막 사용 시각 갱신
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return doc
+
+    def store(self, key: str, doc: DoclingDocument):
+        """문서를 이미지 포함 JSON으로 저장하고, 크기 제한을 넘으면 오래된 항목을 정리합니다."""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            doc.save_as_json(tmp_path, image_mode=ImageRefMode.EMBEDDED)
+            # 다른 프로세스가 읽는 중에도 완성된 파일만 보이도록 원자적으로 교체
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self._evict()
+
+    def _evict(self):
+        """전체 크기가 제한을 넘으면 마지막 사용 시각이 오래된 항목부터 삭제합니다."""
+        if not self.max_bytes:
+            return
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                logging.info(f"[ConversionCache] 용량 초과로 삭제: {path.name}")
+
+
+_cache: Optional[ConversionCache] = None
+_cache_lock = threading.Lock()
+
+
+def is_cache_enabled() -> bool:
+    """환경 변수 `CONVERSION_CACHE`로 변환 캐시 사용 여부를 확인합니다."""
+    return os.getenv("CONVERSION_CACHE", "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+def get_conversion_cache() -> Optional[ConversionCache]:
+    """
+    프로세스 전역 변환 캐시 인스턴스를 반환합니다.
+    비활성화되어 있거나 초기화에 실패하면 None을 반환합니다.
+    """
+    global _cache
+    if not is_cache_enabled():
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = ConversionCache()
+            except OSError as e:
+                logging.warning(f"[ConversionCache] 초기화 실패, 비활성화합니다: {e}")
+                return None
+        return _cache
+
+
+def load_cached_document(file_path: str, converter: Any) -> Optional[DoclingDocument]:
+    """
+    캐시에서 변환 결과를 찾습니다. `src.core`의 파이프라인에서 사용하는 진입점입니다.
+
+    Returns:
+        Optional[DoclingDocument]: 캐시 적중 시 문서, 아니면 None
+    """
+    cache = get_conversion_cache()
+    if cache is None:
+        return None
+    t_start = time.time()
+    try:
+        doc = cache.load(cache.make_key(file_path, converter))
+    except OSError as e:
+        logging.warning(f"[ConversionCache] 조회 실패(무시됨): {e}")
+        return None
+    bench.add_stat("Conversion Cache (Hit)" if doc is not None else "Conversion Cache (Miss)",
+                   time.time() - t_start, count=1, unit="files")
+    return doc
+
+
+def store_document(file_path: str, converter: Any, doc: DoclingDocument):
+    """변환 결과를 캐시에 저장합니다. 실패해도 변환 결과 사용에는 영향이 없습니다."""
+    cache = get_conversion_cache()
+    if cache is None:
+        return
+    try:
+        cache.store(cache.make_key(file_path, converter), doc)
+    except Exception as e:
+        logging.warning(f"[ConversionCache] 저장 실패(무시됨): {e}")
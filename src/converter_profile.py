@@ -0,0 +1,244 @@
+"""
+src/converter_profile.py
+========================
+PDF를 가볍게 미리 살펴보고 필요한 모델만 켠 변환기 프로필을 자동으로 선택하는 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **사전 스캔**: pypdfium2로 페이지 수, 텍스트 레이어, 이미지/벡터 그래픽 객체, 표 단서(괘선, 표 캡션), 수학 기호를 확인합니다.
+    긴 문서는 고르게 뽑은 일부 페이지만 스캔합니다.
+2.  **프로필 선택**: 스캔 결과에 따라 표 구조 모델(TableFormer), 수식 추출 모델, 표/그림 이미지 생성을 켜거나 끕니다.
+    텍스트 레이어가 없거나 스캔에 실패하면 기존과 같은 전체 프로필을 사용합니다.
+3.  **프로필별 변환기 캐시**: 기준 변환기의 PDF 설정을 복사해 프로필을 적용한 변환기를 한 번만 생성하고 재사용합니다.
+
+본문 텍스트만 있는 일반 PDF는 수식/표 모델과 고해상도 페이지 이미지 생성을 건너뛰므로 변환이 빨라집니다.
+
+환경 변수:
+- `CONVERTER_PROFILE`: `auto`(사전 스캔으로 자동 선택) 또는 `full`(항상 모든 모델 사용) (기본값: full)
+- `PROFILE_SCAN_PAGES`: 사전 스캔할 최대 페이지 수 (기본값: 20)
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.benchmark import global_benchmark as bench
+
+# 표 캡션 (예: "Table 1", "Tab. 2", "표 3")
+_TABLE_CAPTION = re.compile(r"^\s*(?:Table|TABLE|Tab\.|표)\s*[0-9IVX]+", re.MULTILINE)
+
+# 수학 기호: 수학 연산자, 보조 연산자/기호, 수학용 영숫자 기호
+_MATH_CHARS = re.compile(r"[∀-⋿⟀-⟯⦀-⫿\U0001d400-\U0001d7ff]")
+
+# 페이지당 평균 이 글자 수 미만이면 텍스트 레이어가 없는(스캔한) 문서로 판단
+_MIN_TEXT_CHARS_PER_PAGE = 20
+# 한 페이지에 이 개수 이상의 경로(선/사각형) 객체가 있으면 괘선 표나 벡터 그림이 있다고 판단
+_MIN_PATH_OBJECTS = 8
+# 샘플 페이지 전체에서 이 개수 이상의 수학 기호가 있으면 수식이 있다고 판단
+_MIN_MATH_CHARS = 3
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, str(default))), 1)
+    except ValueError:
+        return default
+
+
+def is_auto_profile_enabled() -> bool:
+    """환경 변수 `CONVERTER_PROFILE`이 `auto`인지 확인합니다."""
+    return os.getenv("CONVERTER_PROFILE", "full").strip().lower() == "auto"
+
+
+def get_scan_pages() -> int:
+    """환경 변수 `PROFILE_SCAN_PAGES`로 사전 스캔할 최대 페이지 수를 읽습니다."""
+    return _env_int("PROFILE_SCAN_PAGES", 20)
+
+
+@dataclass(frozen=True)
+class DocumentScan:
+    """PDF 사전 스캔 결과입니다."""
+    page_count: int
+    scanned_pages: int
+    text_chars: int
+    image_objects: int
+    path_objects_max: int
+    table_captions: int
+    math_chars: int
+
+    @property
+    def has_text_layer(self) -> bool:
+        return self.scanned_pages > 0 and self.text_chars >= _MIN_TEXT_CHARS_PER_PAGE * self.scanned_pages
+
+    @property
+    def has_tables(self) -> bool:
+        return self.table_captions > 0 or self.path_objects_max >= _MIN_PATH_OBJECTS
+
+    @property
+    def has_graphics(self) -> bool:
+        return self.image_objects > 0 or self.path_objects_max >= _MIN_PATH_OBJECTS
+
+    @property
+    def has_math(self) -> bool:
+        return self.math_chars >= _MIN_MATH_CHARS
+
+
+@dataclass(frozen=True)
+class ConverterProfile:
+    """PDF 변환 시 켤 모델과 이미지 생성 여부입니다."""
+    table_structure: bool = True
+    formula_enrichment: bool = True
+    images: bool = True
+
+    @property
+    def name(self) -> str:
+        features = [
+            name for name, enabled in (
+                ("tables", self.table_structure),
+                ("formulas", self.formula_enrichment),
+                ("images", self.images),
+            ) if enabled
+        ]
+        return "+".join(["text"] + features)
+
+
+FULL_PROFILE = ConverterProfile()
+
+
+def _sample_indices(page_count: int, max_pages: int) -> List[int]:
+    """전체 페이지에서 고르게 max_pages개의 페이지 인덱스(0부터 시작)를 고릅니다."""
+    if page_count <= max_pages:
+        return list(range(page_count))
+    step = page_count / max_pages
+    return sorted({int(i * step) for i in range(max_pages)})
+
+
+def scan_pdf(file_path: str, max_pages: Optional[int] = None) -> DocumentScan:
+    """
+    pypdfium2로 PDF를 빠르게 스캔합니다 (렌더링이나 모델 추론 없음).
+
+    Raises:
+        ImportError: pypdfium2가 없는 경우
+        Exception: PDF를 열 수 없는 경우
+    """
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        page_count = len(pdf)
+        indices = _sample_indices(page_count, max_pages or get_scan_pages())
+        text_chars = image_objects = path_objects_max = table_captions = math_chars = 0
+        for index in indices:
+            page = pdf[index]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                text_chars += len(text.strip())
+                table_captions += len(_TABLE_CAPTION.findall(text))
+                math_chars += len(_MATH_CHARS.findall(text))
+
+                # Form XObject 안의 객체까지 포함하여 세기
+                image_objects += sum(1 for _ in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,), max_depth=2))
+                path_objects = sum(1 for _ in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_PATH,), max_depth=2))
+                path_objects_max = max(path_objects_max, path_objects)
+            finally:
+                page.close()
+    finally:
+        pdf.close()
+
+    return DocumentScan(
+        page_count=page_count,
+        scanned_pages=len(indices),
+        text_chars=text_chars,
+        image_objects=image_objects,
+        path_objects_max=path_objects_max,
+        table_captions=table_captions,
+        math_chars=math_chars,
+    )
+
+
+def select_profile(scan: DocumentScan) -> ConverterProfile:
+    """스캔 결과로 변환기 프로필을 고릅니다. 텍스트 레이어가 없으면 판단할 근거가 없으므로 전체 프로필입니다."""
+    if not scan.has_text_layer:
+        return FULL_PROFILE
+    return ConverterProfile(
+        table_structure=scan.has_tables,
+        formula_enrichment=scan.has_math,
+        # 표 이미지는 표가 있을 때, 그림 이미지는 이미지/벡터 그래픽이 있을 때 필요
+        images=scan.has_tables or scan.has_graphics,
+    )
+
+
+# (기준 변환기 id, 프로필) -> 프로필을 적용한 변환기
+_converters: Dict[Tuple[int, ConverterProfile], Any] = {}
+_converters_lock = threading.Lock()
+
+
+def get_profile_converter(base_converter: Any, profile: ConverterProfile) -> Any:
+    """
+    기준 변환기의 PDF 설정(백엔드, 표 모드, 이미지 배율 등)에 프로필을 적용한 변환기를 반환합니다.
+    같은 (기준 변환기, 프로필) 조합은 한 번만 생성합니다.
+    """
+    if profile == FULL_PROFILE:
+        return base_converter
+
+    key = (id(base_converter), profile)
+    with _converters_lock:
+        converter = _converters.get(key)
+        if converter is not None:
+            return converter
+
+        from docling.datamodel.base_models import InputFormat
+        from docling.document_converter import DocumentConverter, PdfFormatOption
+
+        base_option = base_converter.format_to_options[InputFormat.PDF]
+        pipeline_options = base_option.pipeline_options.model_copy(deep=True)
+        pipeline_options.do_table_structure = pipeline_options.do_table_structure and profile.table_structure
+        pipeline_options.do_formula_enrichment = pipeline_options.do_formula_enrichment and profile.formula_enrichment
+        if not profile.images:
+            pipeline_options.generate_picture_images = False
+            pipeline_options.generate_table_images = False
+
+        format_options = dict(base_converter.format_to_options)
+        format_options[InputFormat.PDF] = PdfFormatOption(
+            pipeline_cls=base_option.pipeline_cls,
+            pipeline_options=pipeline_options,
+            backend=base_option.backend,
+        )
+        converter = DocumentConverter(allowed_formats=list(format_options), format_options=format_options)
+        _converters[key] = converter
+        logging.info(f"[Profile] 변환기 생성: {profile.name}")
+        return converter
+
+
+def select_converter(base_converter: Any, file_path: str) -> Any:
+    """
+    `CONVERTER_PROFILE=auto`이면 PDF를 사전 스캔하여 프로필에 맞는 변환기를 반환합니다.
+    비활성화되어 있거나 PDF가 아니거나 스캔에 실패하면 기준 변환기를 그대로 반환합니다.
+    """
+    if not is_auto_profile_enabled() or Path(file_path).suffix.lower() != ".pdf":
+        return base_converter
+
+    t_start = time.time()
+    try:
+        scan = scan_pdf(file_path)
+    except Exception as e:
+        logging.warning(f"[Profile] 사전 스캔 실패, 전체 프로필을 사용합니다 ({file_path}): {e}")
+        return base_converter
+    bench.add_stat("Profile Pre-scan", time.time() - t_start, count=scan.scanned_pages, unit="pages")
+
+    profile = select_profile(scan)
+    logging.info(
+        f"[Profile] {Path(file_path).name}: {profile.name} "
+        f"(텍스트 {scan.text_chars}자, 이미지 {scan.image_objects}, 경로 최대 {scan.path_objects_max}, "
+        f"표 캡션 {scan.table_captions}, 수학 기호 {scan.math_chars} / {scan.scanned_pages}페이지)"
+    )
+    return get_profile_converter(base_converter, profile)
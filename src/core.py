@@ -5,19 +5,27 @@ src/core.py
 
 이 모듈은 다음 기능을 수행합니다:
 1.  **문서 변환**: Docling을 사용하여 PDF, DOCX 등의 문서를 구조화된 데이터로 변환합니다.
-2.  **텍스트 수집**: 변환된 문서에서 텍스트와 캡션을 추출합니다.
-3.  **번역 오케스트레이션**: 추출된 텍스트를 `src.translation` 패키지를 사용하여 병렬 번역합니다.
+2.  **텍스트 수집**: 렌더링 계획(`src.render_plan`)에 따라 HTML에 표시되는 텍스트와 캡션만 추출합니다.
+3.  **번역 오케스트레이션**: 추출된 텍스트를 `src.translation` 패키지를 사용하여 병렬 번역합니다. (번역 메모리 캐시 적용)
 4.  **HTML 생성**: `src.html_generator`를 사용하여 번역 결과가 포함된 인터랙티브 HTML을 생성합니다.
 5.  **텍스트 파일 처리**: txt, md, py 등 텍스트 파일의 스마트 번역을 지원합니다.
+6.  **스트리밍 파이프라인**: `PIPELINE_STREAMING=1`이면 긴 PDF를 페이지 범위 단위로 변환하면서 동시에 번역하고, HTML을 범위마다 이어서 기록합니다.
+7.  **병렬 변환**: `CONVERSION_WORKERS > 1`이면 긴 PDF를 페이지 범위로 나누어 여러 프로세스에서 변환한 뒤 병합합니다.
+8.  **변환 캐시**: 변환 결과를 (파일 내용, 변환 설정, Docling 버전) 키로 저장하여, 같은 문서를 다른 언어·엔진으로 번역할 때 변환을 생략합니다.
+9.  **증분 변환**: `INCREMENTAL_CONVERSION=1`이면 개정된 PDF에서 바뀐 페이지만 변환하고 나머지 페이지는 이전 변환 결과를 재사용합니다.
+10. **변환기 프로필 자동 선택**: `CONVERTER_PROFILE=auto`이면 PDF를 사전 스캔하여 표/수식 모델과 이미지 생성 중 필요한 것만 켠 변환기를 사용합니다.
+11. **페이지당 시간 제한**: `PAGE_TIME_BUDGET > 0`이면 제한 시간을 넘긴 PDF 페이지만 빠른 설정 또는 페이지 이미지로 대체하고 출력에 표시합니다.
+12. **엔진 미리 로드**: 문서 변환과 동시에 선택한 번역 엔진을 백그라운드에서 로드합니다 (`ENGINE_PREFETCH=0`이면 끔).
+13. **단계별 처리 함수**: 문서 처리를 변환/번역/HTML 생성 단계 함수로 나누어, 배치 스케줄러가 여러 파일의 단계를 겹쳐 실행할 수 있게 합니다.
 """
 
 import os
 import time
 import logging
-import nltk
+import itertools
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Callable
 import multiprocessing
 
 # [Issue #92] Docling CPU 병렬 처리 최적화
@@ -40,38 +48,31 @@ try:
 except Exception as e:
     logging.warning(f"[Optimization] Failed to set CPU threads: {e}")
 
-from docling.document_converter import (
-    DocumentConverter,
-    PdfFormatOption,
-    WordFormatOption,
-    PowerpointFormatOption,
-    HTMLFormatOption,
-    ImageFormatOption
-)
-from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
-from docling_core.types.doc import DoclingDocument, TextItem, TableItem, PictureItem
-
-# [NEW] pypdfium2 백엔드 import (Issue #100 - 속도 최적화)
-# Fast 모드에서 사용하면 3-5배 속도 향상
-try:
-    from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
-    PYPDFIUM_AVAILABLE = True
-except ImportError:
-    PYPDFIUM_AVAILABLE = False
-    logging.warning("[Speed] PyPdfiumDocumentBackend not available. Fast mode will use default backend.")
-
 from src.benchmark import global_benchmark as bench
-from src.translation import create_translator
-from src.html_generator import generate_html_content
-from src.utils import ensure_nltk_resources
+from src.translation.memory import translate_with_memory
+from src.translation.registry import get_registry, is_prefetch_enabled
+from src.pipeline import is_streaming_enabled, get_page_chunk, count_pdf_pages
+from src.converter_profile import select_converter
 from src.text_parser import TextFileParser, is_text_file
 from src.text_html_generator import generate_text_html, get_file_type_display, generate_code_file_html
+from src.utils import create_output_dir
+
+# Docling, NLTK와 문서 파이프라인 모듈은 문서(비텍스트) 파일을 처리할 때만 로드합니다.
+# (텍스트 파일 번역이나 `--help`에서는 Docling/PyTorch 로드 시간을 쓰지 않음)
+if TYPE_CHECKING:
+    from docling.document_converter import DocumentConverter
 
 # 진행률 콜백 타입 정의 (float: 진행률 0.0~1.0, str: 상태 메시지)
 ProgressCallback = Callable[[float, str], None]
 
-def create_converter(speed_mode: str = "balanced") -> DocumentConverter:
+# 벤치마크 타이머 이름에 붙이는 작업 번호 (같은 이름의 파일을 동시에 처리해도 타이머가 섞이지 않도록)
+_job_numbers = itertools.count(1)
+
+def bench_label(file_name: str) -> str:
+    """벤치마크 타이머에 사용할 작업별 고유 이름을 만듭니다 (예: "README.md #3")."""
+    return f"{file_name} #{next(_job_numbers)}"
+
+def create_converter(speed_mode: str = "balanced") -> "DocumentConverter":
     """
     Docling DocumentConverter를 초기화하고 반환합니다.
     
@@ -83,6 +84,26 @@ def create_converter(speed_mode: str = "balanced") -> DocumentConverter:
     Returns:
         DocumentConverter: 설정된 문서 변환기 인스턴스
     """
+    from docling.document_converter import (
+        DocumentConverter,
+        PdfFormatOption,
+        WordFormatOption,
+        PowerpointFormatOption,
+        HTMLFormatOption,
+        ImageFormatOption
+    )
+    from docling.datamodel.base_models import InputFormat
+    from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+
+    # [NEW] pypdfium2 백엔드 import (Issue #100 - 속도 최적화)
+    # Fast 모드에서 사용하면 3-5배 속도 향상
+    try:
+        from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+        pypdfium_available = True
+    except ImportError:
+        pypdfium_available = False
+        logging.warning("[Speed] PyPdfiumDocumentBackend not available. Fast mode will use default backend.")
+
     pipeline_options = PdfPipelineOptions()
     pipeline_options.do_ocr = False
     pipeline_options.do_table_structure = True
@@ -106,7 +127,7 @@ def create_converter(speed_mode: str = "balanced") -> DocumentConverter:
         pipeline_options.images_scale = 2.0  # 고해상도
 
     # [NEW] 속도 모드에 따른 PDF 백엔드 선택 (Issue #100)
-    if speed_mode == "fast" and PYPDFIUM_AVAILABLE:
+    if speed_mode == "fast" and pypdfium_available:
         # Fast 모드: pypdfium2 백엔드 (3-5배 속도 향상)
         pdf_format_option = PdfFormatOption(
             pipeline_options=pipeline_options,
@@ -145,6 +166,7 @@ PROGRESS_MESSAGES = {
         "translating_progress": "🤖 번역 중... {msg}",
         "saving": "💾 결과 파일 생성 및 이미지 저장 중... ({file_name})",
         "saving_progress": "💾 {msg}",
+        "streaming": "🔀 페이지 {start}-{end}/{total} 번역 중... ({file_name})",
         "done": "✅ 모든 작업 완료! ({file_name})"
     },
     "en": {
@@ -156,6 +178,7 @@ PROGRESS_MESSAGES = {
         "translating_progress": "🤖 Translating... {msg}",
         "saving": "💾 Generating result file and saving images... ({file_name})",
         "saving_progress": "💾 {msg}",
+        "streaming": "🔀 Translating pages {start}-{end}/{total}... ({file_name})",
         "done": "✅ All tasks completed! ({file_name})"
     }
 }
@@ -188,12 +211,11 @@ def process_text_file(
     Returns:
         결과 정보 딕셔너리 (output_dir, html_path)
     """
-    ensure_nltk_resources()
-    
     msgs = PROGRESS_MESSAGES.get(ui_lang, PROGRESS_MESSAGES["ko"])
     file_name = Path(file_path).name
+    label = bench_label(file_name)
     
-    bench.start(f"Total Process (Text): {file_name}")
+    bench.start(f"Total Process (Text): {label}")
     
     if progress_cb:
         progress_cb(0.05, f"📄 텍스트 파일 분석 중... ({file_name})")
@@ -203,13 +225,12 @@ def process_text_file(
         logging.error(f"입력 파일을 찾을 수 없습니다: {file_path}")
         if progress_cb:
             progress_cb(1.0, msgs["error_search"].format(file_name=file_name))
+        bench.end(f"Total Process (Text): {label}")
         return {}
     
-    # 2. 출력 경로 설정
+    # 2. 출력 경로 설정 (작업마다 새 폴더)
     base_filename = Path(file_path).stem
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_dir = Path("output") / f"{base_filename}_{source_lang}_to_{target_lang}_{timestamp}"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = create_output_dir(base_filename, source_lang, target_lang)
     
     logging.info(f"[{file_name}] 텍스트 파일 처리 시작 (엔진: {engine})")
     
@@ -224,6 +245,7 @@ def process_text_file(
         logging.error(f"[{file_name}] 파일 파싱 오류: {e}", exc_info=True)
         if progress_cb:
             progress_cb(1.0, f"❌ 파싱 오류: {e}")
+        bench.end(f"Total Process (Text): {label}")
         return {}
     
     # 번역 대상 텍스트 추출
@@ -236,7 +258,7 @@ def process_text_file(
         progress_cb(0.20, msgs["translating_start"].format(count=len(unique_texts)))
     
     # 4. 번역 실행
-    bench.start(f"Translation (Text): {file_name}")
+    bench.start(f"Translation (Text): {label}")
     t_trans_start = time.time()
     
     TRANSLATE_BASE = 0.20
@@ -247,21 +269,29 @@ def process_text_file(
             global_ratio = TRANSLATE_BASE + TRANSLATE_SPAN * local_ratio
             progress_cb(global_ratio, msgs["translating_progress"].format(msg=msg))
     
-    translator = create_translator(engine)
-    translated_results = translator.translate_batch(
-        unique_texts,
-        src=source_lang,
-        dest=target_lang,
-        max_workers=max_workers,
-        progress_cb=_translate_progress
-    )
+    # 상주 엔진을 레지스트리에서 빌려와 번역 메모리(캐시)에 없는 문장만 엔진으로 전달
+    try:
+        with get_registry().lease(engine) as translator:
+            translated_results = translate_with_memory(
+                translator,
+                engine,
+                unique_texts,
+                src=source_lang,
+                dest=target_lang,
+                max_workers=max_workers,
+                progress_cb=_translate_progress
+            )
+    except Exception:
+        bench.end(f"Translation (Text): {label}")
+        bench.end(f"Total Process (Text): {label}")
+        raise
     
     t_trans_end = time.time()
     
     # 번역 맵 생성
     translation_map = dict(zip(unique_texts, translated_results))
     
-    bench.end(f"Translation (Text): {file_name}")
+    bench.end(f"Translation (Text): {label}")
     logging.info(f"[{file_name}] 번역 완료 ({t_trans_end - t_trans_start:.2f}초)")
     
     # 5. HTML 생성
@@ -312,7 +342,7 @@ def process_text_file(
     if progress_cb:
         progress_cb(1.0, msgs["done"].format(file_name=file_name))
     
-    bench.end(f"Total Process (Text): {file_name}")
+    bench.end(f"Total Process (Text): {label}")
     logging.info(f"[{file_name}] 텍스트 파일 처리 완료: {output_dir}")
     
     return {
@@ -323,7 +353,7 @@ def process_text_file(
 
 def process_single_file(
     file_path: str,
-    converter: DocumentConverter,
+    converter: "DocumentConverter",
     source_lang: str,
     target_lang: str,
     engine: str,
@@ -336,8 +366,8 @@ def process_single_file(
     
     단계:
     1. 파일 유효성 검사 및 출력 디렉토리 준비
-    2. Docling을 사용한 문서 변환 (PDF/DOCX 등 -> DoclingDocument)
-    3. 텍스트 및 캡션 추출 (Collection)
+    2. Docling을 사용한 문서 변환 (PDF/DOCX 등 -> DoclingDocument, 변환 캐시 적중 시 생략)
+    3. 렌더링 계획 수립 및 화면에 표시되는 텍스트·캡션 추출 (Planning & Collection)
     4. 선택한 엔진을 사용한 병렬 번역 (Translation)
     5. 번역된 내용을 포함한 인터랙티브 HTML 생성 (HTML Generation)
     
@@ -354,13 +384,10 @@ def process_single_file(
     Returns:
         dict: 결과 정보를 담은 딕셔너리 (output_dir, html_path 포함). 실패 시 빈 딕셔너리.
     """
-    ensure_nltk_resources()
-    
     # UI 메시지 가져오기 (기본값 ko)
     msgs = PROGRESS_MESSAGES.get(ui_lang, PROGRESS_MESSAGES["ko"])
 
     file_name = Path(file_path).name
-    bench.start(f"Total Process: {file_name}")
 
     if progress_cb:
         progress_cb(0.02, msgs["analyzing"].format(file_name=file_name))
@@ -377,87 +404,208 @@ def process_single_file(
             progress_cb=progress_cb,
             ui_lang=ui_lang
         )
-    
+
+    job = DocumentJob(
+        file_path=file_path,
+        converter=converter,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        engine=engine,
+        max_workers=max_workers,
+        progress_cb=progress_cb,
+        msgs=msgs,
+    )
+    if convert_document_stage(job):
+        translate_document_stage(job)
+        render_document_stage(job)
+    return job.result
+
+@dataclass
+class DocumentJob:
+    """
+    문서 파일 하나의 처리 상태입니다.
+    변환(convert) → 번역(translate) → HTML 생성(render) 단계가 차례로 채워 나가며,
+    배치 스케줄러(`src.batch_scheduler`)는 단계마다 다른 워커에서 이어서 처리합니다.
+    """
+    file_path: str
+    converter: Any
+    source_lang: str
+    target_lang: str
+    engine: str
+    max_workers: int = 1
+    progress_cb: Optional[ProgressCallback] = None
+    msgs: dict = field(default_factory=lambda: PROGRESS_MESSAGES["ko"])
+    # 단계별 결과
+    output_dir: Optional[Path] = None
+    doc: Any = None
+    plan: Any = None
+    unique_sentences: List[str] = field(default_factory=list)
+    translation_map: Dict[str, str] = field(default_factory=dict)
+    # 최종 결과 (output_dir, html_path). 실패 시 빈 딕셔너리
+    result: dict = field(default_factory=dict)
+    # 벤치마크 타이머 이름 (작업별 고유)
+    label: str = ""
+    # 처리 시작 시각 (단계가 여러 워커에 걸치므로 전체 시간은 끝난 뒤 `add_manual_record`로 기록)
+    started: float = 0.0
+
+    def __post_init__(self):
+        self.label = self.label or bench_label(self.file_name)
+
+    @property
+    def file_name(self) -> str:
+        return Path(self.file_path).name
+
+    @property
+    def base_filename(self) -> str:
+        return Path(self.file_path).stem
+
+    def report(self, ratio: float, message: str):
+        if self.progress_cb:
+            self.progress_cb(ratio, message)
+
+    def record_total(self):
+        """처리 시작부터 지금까지를 `Total Process` 기록으로 남깁니다 (성공/실패 모두)."""
+        bench.add_manual_record(f"Total Process: {self.label}", self.started, time.time())
+
+def convert_document_stage(job: DocumentJob) -> bool:
+    """
+    1~3단계: 파일 검사, 출력 폴더 준비, Docling 변환 (변환 캐시/증분 변환/시간 제한 변환 포함).
+
+    Returns:
+        bool: 변환된 문서가 준비되어 다음 단계(번역)로 진행할 수 있으면 True.
+              실패했거나 스트리밍 파이프라인이 처리를 끝낸 경우 False (결과는 `job.result`)
+    """
+    # 문서 파이프라인 모듈 로드 (Docling 포함)
+    from src.parallel_convert import convert_document
+    from src.conversion_cache import load_cached_document, store_document
+    from src.incremental import is_incremental_enabled, convert_incremental
+    from src.page_budget import get_page_time_budget, convert_with_budget
+
+    file_path, file_name, msgs, label = job.file_path, job.file_name, job.msgs, job.label
+    base_filename = job.base_filename
+
+    job.started = time.time()
+
     # 1. 입력 파일 유효성 검사
     if not os.path.exists(file_path):
         logging.error(f"입력 파일을 찾을 수 없습니다: {file_path}")
-        if progress_cb:
-            progress_cb(1.0, msgs["error_search"].format(file_name=file_name))
-        return {}
+        job.report(1.0, msgs["error_search"].format(file_name=file_name))
+        job.record_total()
+        return False
+
+    # 1-1. 번역 엔진 미리 로드: 문서 변환(CPU)이 진행되는 동안 백그라운드에서 모델 다운로드/로드
+    if is_prefetch_enabled():
+        get_registry().prefetch(job.engine)
 
     # 2. 출력 경로 설정
-    # 폴더명 형식: {파일명}_{출발언어}_to_{도착언어}_{타임스탬프}
-    base_filename = Path(file_path).stem
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_dir = Path("output") / f"{base_filename}_{source_lang}_to_{target_lang}_{timestamp}"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    logging.info(f"[{file_name}] 문서 처리 시작 (엔진: {engine})")
+    # 폴더명 형식: {파일명}_{출발언어}_to_{도착언어}_{타임스탬프} (동시 작업과 겹치면 _2, _3 ...)
+    output_dir = create_output_dir(base_filename, job.source_lang, job.target_lang)
+    job.output_dir = output_dir
+    
+    logging.info(f"[{file_name}] 문서 처리 시작 (엔진: {job.engine})")
+
+    # 2-0. 변환기 프로필: CONVERTER_PROFILE=auto면 사전 스캔으로 필요한 모델만 켠 변환기 선택
+    converter = select_converter(job.converter, file_path)
+
+    # 2-1. 변환 캐시 조회: 같은 내용의 파일을 같은 변환 설정으로 변환한 적이 있으면 변환 생략
+    doc = load_cached_document(file_path, converter)
+    if doc is not None:
+        logging.info(f"[{file_name}] 변환 캐시 적중, 문서 변환을 건너뜁니다.")
+
+    # 2-2. 증분 변환: 개정본 PDF는 이전에 변환한 적 없는(바뀐) 페이지만 변환
+    if doc is None and is_incremental_enabled() and Path(file_path).suffix.lower() == ".pdf":
+        bench.start(f"Conversion (Incremental): {label}")
+        try:
+            incremental = convert_incremental(converter, file_path)
+        except Exception as e:
+            logging.warning(f"[{file_name}] 증분 변환 실패, 전체 문서를 변환합니다: {e}")
+        else:
+            doc = incremental.document
+            try:
+                incremental.write_manifest(output_dir / f"{base_filename}_pages.json")
+            except OSError as e:
+                logging.warning(f"[{file_name}] 페이지 목록 기록 실패(무시됨): {e}")
+            store_document(file_path, converter, doc)
+        bench.end(f"Conversion (Incremental): {label}")
+
+    # 2-3. 스트리밍 파이프라인: 긴 PDF는 페이지 범위 단위로 변환하면서 앞 범위를 동시에 번역
+    if doc is None and is_streaming_enabled():
+        page_count = count_pdf_pages(file_path)
+        if page_count and page_count > get_page_chunk():
+            try:
+                job.result = _process_pdf_streaming(
+                    file_path, converter, page_count, job.source_lang, job.target_lang, job.engine,
+                    job.max_workers, output_dir, base_filename, job.progress_cb, msgs, label,
+                )
+            finally:
+                job.record_total()
+            return False
 
     # 3. Docling 변환
-    bench.start(f"Conversion: {file_name}")
-    logging.info(f"[{file_name}] 문서 변환 중...")
-    try:
-        doc: DoclingDocument = converter.convert(file_path).document
-    except Exception as e:
-        logging.error(f"[{file_name}] 문서 변환 오류: {e}", exc_info=True)
-        if progress_cb:
-            progress_cb(1.0, msgs["error_convert"].format(file_name=file_name))
-        return {}
-    bench.end(f"Conversion: {file_name}")
-    logging.info(f"[{file_name}] 문서 변환 성공.")
+    if doc is None:
+        bench.start(f"Conversion: {label}")
+        logging.info(f"[{file_name}] 문서 변환 중...")
+        degraded = {}
+        try:
+            # PAGE_TIME_BUDGET > 0이면 페이지당 제한 시간을 넘긴 페이지만 빠른 설정/페이지 이미지로 대체
+            budget = get_page_time_budget()
+            if budget and Path(file_path).suffix.lower() == ".pdf":
+                try:
+                    budget_result = convert_with_budget(converter, file_path, budget)
+                    doc, degraded = budget_result.document, budget_result.degraded
+                except Exception as e:
+                    logging.warning(f"[{file_name}] 시간 제한 변환 실패, 일반 변환으로 진행합니다: {e}")
+            if doc is None:
+                # CONVERSION_WORKERS > 1이면 긴 PDF를 페이지 범위별로 여러 프로세스에서 변환 후 병합
+                doc = convert_document(converter, file_path)
+        except Exception as e:
+            logging.error(f"[{file_name}] 문서 변환 오류: {e}", exc_info=True)
+            job.report(1.0, msgs["error_convert"].format(file_name=file_name))
+            bench.end(f"Conversion: {label}")
+            job.record_total()
+            return False
+        bench.end(f"Conversion: {label}")
+        logging.info(f"[{file_name}] 문서 변환 성공.")
+        if degraded:
+            # 품질을 낮춘 페이지를 기록하고, 다음 실행에서 다시 시도하도록 캐시에는 저장하지 않음
+            try:
+                budget_result.write_manifest(output_dir / f"{base_filename}_degraded_pages.json")
+            except OSError as e:
+                logging.warning(f"[{file_name}] 품질 저하 페이지 목록 기록 실패(무시됨): {e}")
+        else:
+            store_document(file_path, converter, doc)
+
+    job.doc = doc
+    return True
+
+def translate_document_stage(job: DocumentJob):
+    """
+    4단계: 렌더링 계획 수립, 번역 대상 문장 수집 및 일괄 번역.
+    """
+    from src.render_plan import build_render_plan
 
-    if progress_cb:
-        progress_cb(0.20, msgs["extracting"].format(file_name=file_name))
+    file_name, msgs = job.file_name, job.msgs
+
+    job.report(0.20, msgs["extracting"].format(file_name=file_name))
 
     # 4. 텍스트 수집 및 번역
-    bench.start(f"Translation & Save: {file_name}")
-    logging.info(f"[{file_name}] 텍스트 수집 및 일괄 번역 준비... (Workers: {max_workers})")
+    logging.info(f"[{file_name}] 텍스트 수집 및 일괄 번역 준비... (Workers: {job.max_workers})")
 
-    # --- Phase 1: Collection (텍스트 수집) ---
-    all_sentences = []
-    doc_items = []
-    
-    # 문서를 순회하며 텍스트 아이템과 캡션을 수집합니다.
-    for item, _ in doc.iterate_items():
-        doc_items.append((item, _))
-        
-        if isinstance(item, TextItem):
-            if item.text and item.text.strip():
-                # NLTK를 사용하여 문장 단위로 분리
-                sentences = nltk.sent_tokenize(item.text)
-                all_sentences.extend(sentences)
-        elif isinstance(item, (TableItem, PictureItem)):
-            orig_caption = item.caption_text(doc)
-            if orig_caption:
-                all_sentences.append(orig_caption)
-            
-            # [NEW] 표 셀 텍스트 수집 (pandas DataFrame 활용)
-            # TableItem에서 텍스트를 추출하여 번역 대상에 포함시킵니다.
-            if isinstance(item, TableItem):
-                try:
-                    # [FIX] deprecated API 수정 (Issue #102)
-                    # export_to_dataframe()에 doc 인자 추가
-                    df = item.export_to_dataframe(doc)
-                    # 데이터프레임의 모든 셀 값을 문자열로 변환하여 수집
-                    for text in df.values.flatten():
-                        if isinstance(text, str) and text.strip():
-                            all_sentences.append(text)
-                    # 컬럼 헤더도 수집
-                    for col in df.columns:
-                        if isinstance(col, str) and col.strip():
-                            all_sentences.append(col)
-                except Exception as e:
-                    logging.warning(f"[{file_name}] 표 텍스트 추출 중 오류 발생(무시됨): {e}")
+    # --- Phase 1: Planning & Collection (렌더링 계획 수립 및 텍스트 수집) ---
+    # 아이템별로 HTML에 어떻게 표시될지 먼저 결정하고, 실제로 표시되는 텍스트만 번역 대상으로 수집합니다.
+    # (페이지 헤더/푸터, 수식, 이미지가 없는 표/그림은 번역하지 않음)
+    job.plan = build_render_plan(job.doc, file_name, job.source_lang)
+    all_sentences = job.plan.translation_texts()
 
     # 중복 문장 제거 (번역 비용 절감)
     unique_sentences = list(set(all_sentences))
+    job.unique_sentences = unique_sentences
     logging.info(f"[{file_name}] 총 {len(all_sentences)}개 문장 수집 (고유 문장: {len(unique_sentences)}개)")
 
-    if progress_cb:
-        progress_cb(0.25, msgs["translating_start"].format(count=len(unique_sentences)))
+    job.report(0.25, msgs["translating_start"].format(count=len(unique_sentences)))
 
     # --- Phase 2: Translation (번역) ---
+    bench.start(f"Translation: {job.label}")
     t_trans_start = time.time()
     
     # 진행률 계산을 위한 상수 (번역 비중 60%)
@@ -466,24 +614,32 @@ def process_single_file(
 
     # 번역 엔진의 진행률 콜백 래퍼
     def _translate_progress(local_ratio: float, msg: str):
-        if progress_cb:
-            global_ratio = TRANSLATE_BASE + TRANSLATE_SPAN * local_ratio
-            progress_cb(global_ratio, msgs["translating_progress"].format(msg=msg))
+        global_ratio = TRANSLATE_BASE + TRANSLATE_SPAN * local_ratio
+        job.report(global_ratio, msgs["translating_progress"].format(msg=msg))
 
-    # Translator 인스턴스 생성 및 일괄 번역 실행
-    translator = create_translator(engine)
-    translated_results = translator.translate_batch(
-        unique_sentences,
-        src=source_lang,
-        dest=target_lang,
-        max_workers=max_workers,
-        progress_cb=_translate_progress
-    )
+    # 레지스트리에서 상주 Translator 인스턴스를 빌려 일괄 번역 실행 (번역 메모리 캐시 경유)
+    # 로컬 모델은 파일마다 다시 로드하지 않고 프로세스 내에서 재사용됩니다.
+    try:
+        with get_registry().lease(job.engine) as translator:
+            translated_results = translate_with_memory(
+                translator,
+                job.engine,
+                unique_sentences,
+                src=job.source_lang,
+                dest=job.target_lang,
+                max_workers=job.max_workers,
+                progress_cb=_translate_progress
+            )
+    except Exception:
+        job.record_total()
+        raise
+    finally:
+        bench.end(f"Translation: {job.label}")
 
     t_trans_end = time.time()
     
     # 원문-번역문 매핑 생성
-    translation_map = dict(zip(unique_sentences, translated_results))
+    job.translation_map = dict(zip(unique_sentences, translated_results))
 
     # 벤치마크 통계 기록
     total_chars = sum(len(s) for s in unique_sentences)
@@ -496,40 +652,185 @@ def process_single_file(
     )
     logging.info(f"[{file_name}] 일괄 번역 완료 ({t_trans_end - t_trans_start:.2f}초)")
 
+def render_document_stage(job: DocumentJob):
+    """
+    5단계: 번역 결과를 포함한 인터랙티브 HTML 생성 및 저장.
+    """
+    from src.html_generator import generate_html_content
+
+    file_name, msgs, output_dir = job.file_name, job.msgs, job.output_dir
+
     # --- Phase 3: HTML Generation (HTML 생성) ---
-    if progress_cb:
-        progress_cb(0.85, msgs["saving"].format(file_name=file_name))
+    job.report(0.85, msgs["saving"].format(file_name=file_name))
 
-    path_html = output_dir / f"{base_filename}_interactive.html"
+    path_html = output_dir / f"{job.base_filename}_interactive.html"
+    bench.start(f"HTML Generation: {job.label}")
     
     # HTML 생성 시 이미지 저장 진행률 반영 (나머지 15%)
     GEN_BASE = 0.85
     GEN_SPAN = 0.15
     
     def _gen_progress(local_ratio: float, msg: str):
-        if progress_cb:
-            global_ratio = GEN_BASE + GEN_SPAN * local_ratio
-            progress_cb(global_ratio, msgs["saving_progress"].format(msg=msg))
+        global_ratio = GEN_BASE + GEN_SPAN * local_ratio
+        job.report(global_ratio, msgs["saving_progress"].format(msg=msg))
 
-    html_content = generate_html_content(
-        doc,
-        doc_items,
-        translation_map,
-        output_dir,
-        base_filename,
-        progress_cb=_gen_progress
-    )
+    try:
+        html_content = generate_html_content(
+            job.doc,
+            job.plan,
+            job.translation_map,
+            output_dir,
+            job.base_filename,
+            progress_cb=_gen_progress
+        )
 
-    with open(path_html, "w", encoding="utf-8") as f:
-        f.write(html_content)
+        with open(path_html, "w", encoding="utf-8") as f:
+            f.write(html_content)
+    finally:
+        bench.end(f"HTML Generation: {job.label}")
+        job.record_total()
     
-    if progress_cb:
-        progress_cb(1.0, msgs["done"].format(file_name=file_name))
+    job.report(1.0, msgs["done"].format(file_name=file_name))
     
-    bench.end(f"Translation & Save: {file_name}")
-    bench.end(f"Total Process: {file_name}")
     logging.info(f"[{file_name}] 파일 생성 완료: {output_dir}")
     
+    job.result = {
+        "output_dir": output_dir,
+        "html_path": path_html
+    }
+
+def _process_pdf_streaming(
+    file_path: str,
+    converter: "DocumentConverter",
+    page_count: int,
+    source_lang: str,
+    target_lang: str,
+    engine: str,
+    max_workers: int,
+    output_dir: Path,
+    base_filename: str,
+    progress_cb: Optional[ProgressCallback],
+    msgs: dict,
+    label: str,
+) -> dict:
+    """
+    PDF를 페이지 범위 단위로 스트리밍 처리합니다 (`PIPELINE_STREAMING=1`).
+
+    백그라운드 스레드가 다음 페이지 범위를 변환하는 동안, 변환이 끝난 범위의 문장을 번역하고
+    HTML 본문을 파일에 이어서 기록합니다. 결과 HTML은 일괄 처리와 같은 구조입니다.
+    """
+    from src.pipeline import split_page_ranges, iter_converted_chunks, get_queue_size
+    from src.parallel_convert import merge_documents
+    from src.conversion_cache import store_document, is_cache_enabled
+    from src.render_plan import build_render_plan
+    from src.html_generator import render_items, HtmlRenderState, HTML_HEADER, HTML_FOOTER
+    from src.page_budget import DEGRADED_FAILED, DEGRADED_MISSING, render_failed_page, write_degraded_manifest
+
+    file_name = Path(file_path).name
+    page_ranges = split_page_ranges(page_count, get_page_chunk())
+    logging.info(f"[{file_name}] 스트리밍 파이프라인 시작 ({page_count}페이지, {len(page_ranges)}개 범위)")
+
+    path_html = output_dir / f"{base_filename}_interactive.html"
+    translation_map: dict = {}
+    state = HtmlRenderState()
+    converted = 0
+    # 모든 범위가 변환되면 병합하여 변환 캐시에 저장 (다음 실행에서는 변환 없이 처리)
+    chunk_docs: list = []
+    # 변환에 실패하여 대신한 페이지 (페이지 번호 -> failed/missing)
+    degraded: Dict[int, str] = {}
+    t_trans_total = 0.0
+
+    bench.start(f"Pipeline (Stream): {label}")
+    try:
+        # 엔진은 파일 전체에 대해 한 번만 빌려옴 (범위마다 다시 로드하지 않음)
+        with get_registry().lease(engine) as translator, open(path_html, "w", encoding="utf-8") as f:
+            f.write(HTML_HEADER)
+            for chunk in iter_converted_chunks(converter, file_path, page_ranges, get_queue_size()):
+                start, end = chunk.page_range
+                if chunk.error is not None:
+                    # 재시도 후에도 실패한 범위는 페이지 이미지(안내 캡션 포함)로 대신하고 목록에 기록
+                    logging.error(f"[{file_name}] 페이지 {start}-{end} 변환 오류, 페이지 이미지로 대신합니다: {chunk.error}")
+                    page_docs = []
+                    for page_no in range(start, end + 1):
+                        try:
+                            page_docs.append(render_failed_page(file_path, page_no))
+                            degraded[page_no] = DEGRADED_FAILED
+                        except Exception as e:
+                            logging.error(f"[{file_name}] 페이지 {page_no} 이미지 생성 실패: {e}")
+                            degraded[page_no] = DEGRADED_MISSING
+                            f.write(f'<div class="page-marker">Page {page_no} (conversion failed, page omitted)</div>\n')
+                    if not page_docs:
+                        continue
+                    doc = merge_documents(page_docs)
+                else:
+                    converted += 1
+                    doc = chunk.document
+                    if is_cache_enabled():
+                        chunk_docs.append(doc)
+
+                base = 0.05 + 0.95 * chunk.index / len(page_ranges)
+                span = 0.95 / len(page_ranges)
+                if progress_cb:
+                    progress_cb(base, msgs["streaming"].format(start=start, end=end, total=page_count, file_name=file_name))
+
+                def _chunk_progress(local_ratio: float, msg: str):
+                    if progress_cb:
+                        progress_cb(base + span * 0.9 * local_ratio, msgs["translating_progress"].format(msg=msg))
+
+                # 앞 범위에서 이미 번역한 문장은 다시 보내지 않음
+                plan = build_render_plan(doc, file_name, source_lang)
+                pending = [s for s in dict.fromkeys(plan.translation_texts()) if s not in translation_map]
+
+                t_start = time.time()
+                translated = translate_with_memory(
+                    translator,
+                    engine,
+                    pending,
+                    src=source_lang,
+                    dest=target_lang,
+                    max_workers=max_workers,
+                    progress_cb=_chunk_progress
+                )
+                t_trans_total += time.time() - t_start
+                translation_map.update(zip(pending, translated))
+
+                f.write(render_items(doc, plan.items, translation_map, output_dir, base_filename, state))
+                f.flush()
+            f.write(HTML_FOOTER)
+    finally:
+        bench.end(f"Pipeline (Stream): {label}")
+
+    bench.add_stat(
+        "Translation (Sentences)",
+        t_trans_total,
+        count=len(translation_map),
+        volume=sum(len(s) for s in translation_map),
+        unit="chars",
+    )
+
+    if chunk_docs and converted == len(page_ranges):
+        try:
+            store_document(file_path, converter, merge_documents(chunk_docs))
+        except Exception as e:
+            logging.warning(f"[{file_name}] 변환 결과 병합 실패, 캐시에 저장하지 않습니다: {e}")
+
+    if degraded:
+        logging.warning(f"[{file_name}] 변환에 실패하여 대신한 페이지: {sorted(degraded.items())}")
+        try:
+            write_degraded_manifest(output_dir / f"{base_filename}_degraded_pages.json", degraded)
+        except OSError as e:
+            logging.warning(f"[{file_name}] 품질 저하 페이지 목록 기록 실패(무시됨): {e}")
+
+    if converted == 0:
+        logging.error(f"[{file_name}] 모든 페이지 범위의 변환에 실패했습니다.")
+        if progress_cb:
+            progress_cb(1.0, msgs["error_convert"].format(file_name=file_name))
+        return {}
+
+    if progress_cb:
+        progress_cb(1.0, msgs["done"].format(file_name=file_name))
+    logging.info(f"[{file_name}] 파일 생성 완료: {output_dir}")
+
     return {
         "output_dir": output_dir,
         "html_path": path_html
@@ -537,7 +838,7 @@ def process_single_file(
 
 def process_document(
     file_path: str,
-    converter: DocumentConverter,
+    converter: "DocumentConverter",
     source_lang: str = "en",
     dest_lang: str = "ko",
     engine: str = "google",
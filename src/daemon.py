@@ -0,0 +1,285 @@
+"""
+src/daemon.py
+=============
+변환기와 번역 엔진을 메모리에 상주시킨 채 작업을 받는 번역 데몬 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **상주 프로세스**: Docling 변환기(속도 모드별)와 번역 엔진(레지스트리)을 한 번만 로드하여 모든 작업에서 재사용합니다.
+    `python main.py`를 실행할 때마다 드는 인터프리터 시작, Docling 임포트, 변환기 생성, 모델 로드 시간이 사라집니다.
+2.  **로컬 HTTP API**: `127.0.0.1`에서 JSON 요청을 받습니다.
+    - `GET /health`: 상태 확인 (`{"status": "ok", "pid": ..., "jobs": ..., "concurrency": {엔진: 동시성 한도 상태}}`)
+    - `POST /jobs`: 문서 하나를 처리하고 끝나면 결과(`output_dir`, `html_path`)를 돌려줌
+3.  **작업 직렬화**: CLI 옵션은 환경 변수로 전달되므로, 작업은 하나씩 차례로 실행하고 작업마다 환경 변수를 적용한 뒤 되돌립니다.
+    (각 작업 안에서는 기존처럼 병렬 번역/변환을 사용합니다.)
+4.  **클라이언트**: `main.py`는 데몬이 실행 중이면 `submit_job()`으로 작업을 보내고, 실행 중이 아니면 직접 처리합니다.
+
+출력 폴더(`output/`)와 캐시 경로는 데몬의 작업 디렉토리를 기준으로 만들어지며, 결과 경로는 절대 경로로 돌려줍니다.
+
+환경 변수:
+- `TRANSLATION_DAEMON`: `auto`면 `main.py`가 실행 중인 데몬을 자동으로 사용, `0`이면 항상 직접 처리 (기본값: auto)
+- `DAEMON_HOST`: 데몬 주소 (기본값: 127.0.0.1)
+- `DAEMON_PORT`: 데몬 포트 (기본값: 8765)
+- `DAEMON_TOKEN`: 설정하면 같은 값을 `X-Daemon-Token` 헤더로 보낸 요청만 처리
+
+실행:
+    python -m src.daemon --engine google --engine nllb
+"""
+
+import os
+import json
+import logging
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# 작업 요청으로 바꿀 수 있는 환경 변수 (main.py의 CLI 옵션에 대응)
+JOB_ENV_KEYS = frozenset({
+    "TRANSLATOR_REPLICAS",
+    "CONVERSION_WORKERS",
+    "CONVERTER_PROFILE",
+    "PAGE_TIME_BUDGET",
+    "INCREMENTAL_CONVERSION",
+    "PIPELINE_STREAMING",
+})
+
+# 데몬 실행 여부 확인 제한 시간(초): 실행 중이 아니면 바로 직접 처리로 넘어가도록 짧게 유지
+_HEALTH_TIMEOUT = 0.5
+
+
+class DaemonError(RuntimeError):
+    """데몬이 작업을 처리하지 못했을 때 발생하는 예외입니다."""
+
+
+def is_daemon_enabled() -> bool:
+    """`main.py`가 실행 중인 데몬을 사용할지 여부 (TRANSLATION_DAEMON, 기본값: auto)"""
+    return os.getenv("TRANSLATION_DAEMON", "auto").strip().lower() not in ("0", "false", "no", "off")
+
+
+def get_daemon_address() -> str:
+    """데몬 주소 (http://DAEMON_HOST:DAEMON_PORT)"""
+    host = os.getenv("DAEMON_HOST", "127.0.0.1")
+    port = os.getenv("DAEMON_PORT", "8765")
+    return f"http://{host}:{port}"
+
+
+def _request(path: str, payload: Optional[dict] = None, timeout: Optional[float] = None) -> dict:
+    headers = {"Content-Type": "application/json"}
+    token = os.getenv("DAEMON_TOKEN")
+    if token:
+        headers["X-Daemon-Token"] = token
+
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(get_daemon_address() + path, data=data, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read().decode("utf-8")).get("error", str(e))
+        except ValueError:
+            message = str(e)
+        raise DaemonError(message) from e
+
+
+def daemon_available() -> bool:
+    """데몬이 실행 중이고 요청을 받을 수 있으면 True를 반환합니다."""
+    try:
+        return _request("/health", timeout=_HEALTH_TIMEOUT).get("status") == "ok"
+    except (OSError, ValueError, DaemonError):
+        return False
+
+
+def submit_job(
+    file_path: str,
+    source_lang: str = "en",
+    dest_lang: str = "ko",
+    engine: str = "google",
+    max_workers: int = 8,
+    speed_mode: str = "balanced",
+    env: Optional[Dict[str, str]] = None,
+) -> dict:
+    """
+    실행 중인 데몬에 문서 하나의 처리를 요청하고 끝날 때까지 기다립니다.
+
+    Args:
+        file_path (str): 처리할 파일 경로 (데몬에는 절대 경로로 전달)
+        env (Optional[Dict[str, str]]): 이 작업에만 적용할 환경 변수 (`JOB_ENV_KEYS` 중에서)
+
+    Returns:
+        dict: 처리 결과 (output_dir, html_path). 처리에 실패하면 빈 딕셔너리
+
+    Raises:
+        DaemonError: 데몬이 요청을 거부하거나 처리 중 예외가 발생한 경우
+        OSError: 데몬에 연결할 수 없는 경우
+    """
+    payload = {
+        "file_path": str(Path(file_path).resolve()),
+        "source_lang": source_lang,
+        "dest_lang": dest_lang,
+        "engine": engine,
+        "max_workers": max_workers,
+        "speed_mode": speed_mode,
+        "env": env or {},
+    }
+    return _request("/jobs", payload).get("result", {})
+
+
+class TranslationDaemon:
+    """
+    변환기와 번역 엔진을 상주시키고 작업을 차례로 처리하는 데몬 상태입니다.
+    """
+
+    def __init__(self):
+        self._converters: Dict[str, Any] = {}
+        self._job_lock = threading.Lock()
+        self.jobs_done = 0
+
+    def get_converter(self, speed_mode: str):
+        """속도 모드별 변환기를 처음 사용할 때 한 번만 생성합니다."""
+        converter = self._converters.get(speed_mode)
+        if converter is None:
+            from src.core import create_converter
+
+            converter = self._converters[speed_mode] = create_converter(speed_mode=speed_mode)
+        return converter
+
+    def warmup(self, engines, speed_modes=("balanced",), docling: bool = True):
+        """데몬 시작 시 변환기와 엔진을 미리 로드합니다."""
+        from src.warmup import warmup
+
+        converters = [self.get_converter(mode) for mode in speed_modes] if docling else None
+        warmup(engines=engines, converters=converters, docling=docling)
+
+    def run_job(self, job: dict) -> dict:
+        """작업 하나를 처리합니다. 작업 환경 변수는 처리하는 동안에만 적용됩니다."""
+        from src.core import process_document
+        from src.text_parser import is_text_file
+
+        file_path = job["file_path"]
+        env = {k: str(v) for k, v in (job.get("env") or {}).items() if k in JOB_ENV_KEYS}
+
+        with self._job_lock:
+            saved = {k: os.environ.get(k) for k in env}
+            os.environ.update(env)
+            try:
+                converter = None
+                if not is_text_file(file_path):
+                    converter = self.get_converter(job.get("speed_mode", "balanced"))
+                result = process_document(
+                    file_path=file_path,
+                    converter=converter,
+                    source_lang=job.get("source_lang", "en"),
+                    dest_lang=job.get("dest_lang", "ko"),
+                    engine=job.get("engine", "google"),
+                    max_workers=int(job.get("max_workers", 8)),
+                )
+            finally:
+                for k, v in saved.items():
+                    if v is None:
+                        os.environ.pop(k, None)
+                    else:
+                        os.environ[k] = v
+            self.jobs_done += 1
+
+        if not result:
+            return {}
+        return {
+            "output_dir": str(Path(result["output_dir"]).resolve()),
+            "html_path": str(Path(result["html_path"]).resolve()),
+        }
+
+
+def serve(daemon: TranslationDaemon, host: str, port: int):
+    """로컬 HTTP 서버를 실행합니다 (상태 확인은 작업 중에도 응답하도록 요청마다 스레드 사용)."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    token = os.getenv("DAEMON_TOKEN")
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _authorized(self) -> bool:
+            if token and self.headers.get("X-Daemon-Token") != token:
+                self._send(403, {"error": "invalid daemon token"})
+                return False
+            return True
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path != "/health":
+                self._send(404, {"error": f"not found: {self.path}"})
+                return
+            from src.translation.executor import concurrency_stats
+
+            self._send(200, {"status": "ok", "pid": os.getpid(), "jobs": daemon.jobs_done,
+                             "concurrency": concurrency_stats()})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            if self.path != "/jobs":
+                self._send(404, {"error": f"not found: {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", "0"))
+                job = json.loads(self.rfile.read(length).decode("utf-8"))
+                if not job.get("file_path"):
+                    raise ValueError("file_path is required")
+            except ValueError as e:
+                self._send(400, {"error": f"invalid job: {e}"})
+                return
+
+            try:
+                result = daemon.run_job(job)
+            except Exception as e:
+                logging.exception(f"[Daemon] 작업 실패: {job.get('file_path')}")
+                self._send(500, {"error": str(e)})
+                return
+            self._send(200, {"result": result})
+
+        def log_message(self, format, *args):
+            logging.debug("[Daemon] " + format % args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    logging.info(f"[Daemon] 요청 대기 중: http://{host}:{port} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Docling Translate 상주 데몬")
+    parser.add_argument("--host", default=os.getenv("DAEMON_HOST", "127.0.0.1"), help="바인딩 주소 (기본값: DAEMON_HOST 또는 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=int(os.getenv("DAEMON_PORT", "8765")), help="포트 (기본값: DAEMON_PORT 또는 8765)")
+    parser.add_argument("--engine", action="append", default=None, help="시작 시 미리 로드할 번역 엔진 (여러 번 지정 가능)")
+    parser.add_argument("--fast", action="store_true", help="Fast 모드 변환기도 미리 생성")
+    parser.add_argument("--no-docling", action="store_true", help="시작 시 Docling 모델을 미리 로드하지 않음")
+    args = parser.parse_args()
+
+    daemon = TranslationDaemon()
+    daemon.warmup(
+        engines=args.engine or [],
+        speed_modes=("balanced", "fast") if args.fast else ("balanced",),
+        docling=not args.no_docling,
+    )
+    serve(daemon, args.host, args.port)
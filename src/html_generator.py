@@ -5,46 +5,18 @@ src/html_generator.py
 
 이 모듈은 다음 기능을 수행합니다:
 1.  **HTML 구조 정의**: CSS 스타일, 자바스크립트(다크 모드, 뷰 모드 전환 등)가 포함된 HTML 템플릿을 정의합니다.
-2.  **컨텐츠 생성**: Docling 문서 아이템과 번역 결과를 결합하여 HTML 본문을 생성합니다.
+2.  **컨텐츠 생성**: 렌더링 계획(`src.render_plan.RenderPlan`)과 번역 결과를 결합하여 HTML 본문을 생성합니다.
+    `render_items`로 페이지 청크 단위의 본문 조각을 이어서 렌더링할 수도 있습니다 (스트리밍 파이프라인).
 3.  **인터랙티브 기능**: 원문-번역문 대조(Inspection Mode), 문장 하이라이트, 툴팁 등의 기능을 제공합니다.
 """
 
 import html
-import nltk
-import re
 from pathlib import Path
-from docling_core.types.doc import DoclingDocument, TextItem, TableItem, PictureItem, DocItemLabel, FormulaItem
+from docling_core.types.doc import DoclingDocument, DocItemLabel
+from src.render_plan import PlannedItem, RenderKind, RenderPlan
 from src.utils import save_and_get_image_path
 
 
-def is_formula_text(text: str) -> bool:
-    """
-    텍스트가 수식인지 판별합니다.
-    LaTeX 명령어 패턴이 포함되어 있으면 수식으로 판단합니다.
-    """
-    if not text:
-        return False
-    
-    # LaTeX 수식 패턴 (일반적인 수학 기호/명령어)
-    latex_patterns = [
-        r'\\[a-zA-Z]+',      # \sin, \cos, \frac, \text 등
-        r'\^{',              # ^{ (위첨자)
-        r'_{',               # _{ (아래첨자)
-        r'\\left',           # \left
-        r'\\right',          # \right
-        r'\\frac',           # \frac
-        r'\\sum',            # \sum
-        r'\\int',            # \int
-        r'\\prod',           # \prod
-        r'&=',               # 정렬 기호
-    ]
-    
-    for pattern in latex_patterns:
-        if re.search(pattern, text):
-            return True
-    return False
-
-
 def format_formula_for_mathjax(text: str) -> str:
     """
     수식 텍스트를 MathJax가 렌더링할 수 있는 형식으로 변환합니다.
@@ -487,46 +459,61 @@ HTML_FOOTER = """
 </html>
 """
 
-from typing import Optional, Callable
+from dataclasses import dataclass, field
+from typing import Optional, Callable, List
 
 # 진행률 콜백 타입 정의
 ProgressCallback = Callable[[float, str], None]
 
-def generate_html_content(
+@dataclass
+class HtmlRenderState:
+    """
+    여러 번에 나누어 렌더링할 때 이어지는 상태입니다 (스트리밍 파이프라인에서 페이지 청크마다 재사용).
+    """
+    counters: dict = field(default_factory=lambda: {"table": 0, "picture": 0})
+    current_page: int = -1
+    next_id: int = 0
+
+
+def render_items(
     doc: DoclingDocument,
-    doc_items: list,
+    items: List[PlannedItem],
     translation_map: dict,
     output_dir: Path,
     base_filename: str,
+    state: HtmlRenderState,
     progress_cb: Optional[ProgressCallback] = None
 ) -> str:
     """
-    Docling 문서 아이템과 번역 맵을 결합하여 인터랙티브 HTML 컨텐츠를 생성합니다.
-    
+    계획된 아이템들을 HTML 본문 조각으로 렌더링합니다 (헤더/푸터 제외).
+
     Args:
-        doc (DoclingDocument): 원본 문서 객체 (캡션 참조용)
-        doc_items (list): (DocItem, level) 튜플 리스트
+        doc (DoclingDocument): 아이템이 속한 문서 객체 (이미지 추출용)
+        items (List[PlannedItem]): 렌더링할 계획 아이템 (문서 순서)
         translation_map (dict): 원문 문장 -> 번역 문장 매핑
         output_dir (Path): 이미지 저장 경로
         base_filename (str): 이미지 파일명 접두사
+        state (HtmlRenderState): 페이지 마커, 이미지 번호, span id 등 이어지는 렌더링 상태
         progress_cb (Optional[ProgressCallback]): 진행률 콜백
-        
+
     Returns:
-        str: 완성된 HTML 문자열
+        str: HTML 본문 조각
     """
-    html_parts = [HTML_HEADER]
-    counters = {"table": 0, "picture": 0}
-    current_page = -1
-    
+    html_parts = []
+
     # 이미지/테이블 저장 진행률 계산용
-    total_items = len(doc_items)
+    total_items = len(items)
     processed_count = 0
 
-    for item, _ in doc_items:
+    for planned in items:
+        item = planned.item
         processed_count += 1
+        # 문장 span id (원문-번역문 연결용, 청크 단위로 나누어 렌더링해도 파일 안에서 고유)
+        uid = state.next_id
+        state.next_id += 1
         
         # 진행률 업데이트 (너무 잦은 호출 방지: 10개 단위 또는 이미지 처리 시)
-        is_image = isinstance(item, (TableItem, PictureItem))
+        is_image = planned.kind in (RenderKind.TABLE, RenderKind.PICTURE)
         if progress_cb and (is_image or processed_count % 50 == 0):
             ratio = processed_count / total_items
             if is_image:
@@ -534,45 +521,40 @@ def generate_html_content(
             else:
                 progress_cb(ratio, f"결과 생성 중... ({processed_count}/{total_items})")
 
-        # 페이지 마커 처리
-        # 페이지 마커 처리
-        item_page = -1
-        if item.prov and item.prov[0].page_no:
-            item_page = item.prov[0].page_no
-        
-        if item_page > 0 and item_page != current_page:
+        # 페이지 마커 처리 (표시하지 않는 아이템도 페이지 경계는 표시)
+        item_page = planned.page_no
+        if item_page > 0 and item_page != state.current_page:
             html_parts.append(f'<div class="page-marker">Page {item_page}</div>')
-            current_page = item_page
+            state.current_page = item_page
 
-        if isinstance(item, TextItem):
-            if not item.text or not item.text.strip():
-                continue
-            
-            # [NEW] 수식 감지 - 수식이면 번역 없이 MathJax로 렌더링
-            if is_formula_text(item.text):
-                formula_html = format_formula_for_mathjax(item.text)
-                html_parts.append(f'''
+        if planned.kind == RenderKind.SKIP:
+            continue
+
+        # 수식 - 번역 없이 MathJax로 렌더링
+        if planned.kind == RenderKind.FORMULA:
+            formula_html = format_formula_for_mathjax(item.text)
+            html_parts.append(f'''
                 <div class="formula-block">
                     {formula_html}
                 </div>
                 ''')
-                continue
-            
-            # 문장 분리 및 번역 매핑
-            sentences = nltk.sent_tokenize(item.text)
+            continue
+
+        if planned.kind in (RenderKind.HEADING, RenderKind.LIST_ITEM, RenderKind.PARAGRAPH):
+            # 번역 매핑 (수집 단계에서 분리한 문장을 그대로 사용하여 다시 분리하지 않음)
             sentence_pairs = []
-            for s in sentences:
-                trans = translation_map.get(s)
+            for sentence in planned.sentences:
+                trans = translation_map.get(sentence.text)
                 if trans is None:
                     trans = "" # 번역 실패 시 빈 문자열 처리
-                sentence_pairs.append((s, trans))
+                sentence_pairs.append((sentence.text, trans))
             
             # None 필터링 (안전장치)
             original_paragraph = " ".join([pair[0] for pair in sentence_pairs if pair[0] is not None])
             translated_paragraph = " ".join([pair[1] for pair in sentence_pairs if pair[1] is not None])
 
             # 1. 헤더 (Title, Section Header)
-            if item.label in [DocItemLabel.TITLE, DocItemLabel.SECTION_HEADER]:
+            if planned.kind == RenderKind.HEADING:
                 tag = "h1" if item.label == DocItemLabel.TITLE else "h2"
                 
                 html_parts.append('<div class="paragraph-row">')
@@ -580,19 +562,19 @@ def generate_html_content(
                 # 원문 (검수 모드용)
                 html_parts.append('<div class="src-block">')
                 safe_orig = html.escape(original_paragraph)
-                html_parts.append(f'<span class="sent" id="src-{id(item)}-0">{safe_orig}</span>')
+                html_parts.append(f'<span class="sent" id="src-{uid}-0">{safe_orig}</span>')
                 html_parts.append('</div>')
                 
                 # 번역문 (읽기 모드용)
                 html_parts.append('<div class="tgt-block doc-header">')
                 safe_trans = html.escape(translated_paragraph)
-                html_parts.append(f'<{tag}><span class="sent" id="tgt-{id(item)}-0" data-src="src-{id(item)}-0" data-src-text="{safe_orig}">{safe_trans}</span></{tag}>')
+                html_parts.append(f'<{tag}><span class="sent" id="tgt-{uid}-0" data-src="src-{uid}-0" data-src-text="{safe_orig}">{safe_trans}</span></{tag}>')
                 html_parts.append('</div>')
                 
                 html_parts.append('</div>')
             
             # 2. 리스트 아이템
-            elif item.label == DocItemLabel.LIST_ITEM:
+            elif planned.kind == RenderKind.LIST_ITEM:
                 html_parts.append('<div class="paragraph-row doc-list-item">')
                 
                 # 원문
@@ -600,7 +582,7 @@ def generate_html_content(
                 html_parts.append('<span class="doc-list-marker">•</span>')
                 for idx, (orig, _) in enumerate(sentence_pairs):
                     safe_orig = html.escape(orig)
-                    html_parts.append(f'<span class="sent" id="src-{id(item)}-{idx}">{safe_orig}</span> ')
+                    html_parts.append(f'<span class="sent" id="src-{uid}-{idx}">{safe_orig}</span> ')
                 html_parts.append('</div>')
                 
                 # 번역문
@@ -609,16 +591,12 @@ def generate_html_content(
                 for idx, (orig, trans) in enumerate(sentence_pairs):
                     safe_orig = html.escape(orig)
                     safe_trans = html.escape(trans)
-                    html_parts.append(f'<span class="sent" id="tgt-{id(item)}-{idx}" data-src="src-{id(item)}-{idx}" data-src-text="{safe_orig}">{safe_trans}</span> ')
+                    html_parts.append(f'<span class="sent" id="tgt-{uid}-{idx}" data-src="src-{uid}-{idx}" data-src-text="{safe_orig}">{safe_trans}</span> ')
                 html_parts.append('</div>')
                 
                 html_parts.append('</div>')
             
-            # 3. 페이지 헤더/푸터 (무시)
-            elif item.label in [DocItemLabel.PAGE_HEADER, DocItemLabel.PAGE_FOOTER]:
-                continue
-
-            # 4. 일반 본문
+            # 3. 일반 본문
             else:
                 html_parts.append('<div class="paragraph-row">')
                 
@@ -626,7 +604,7 @@ def generate_html_content(
                 html_parts.append('<div class="src-block">')
                 for idx, (orig, _) in enumerate(sentence_pairs):
                     safe_orig = html.escape(orig)
-                    html_parts.append(f'<span class="sent" id="src-{id(item)}-{idx}">{safe_orig}</span> ')
+                    html_parts.append(f'<span class="sent" id="src-{uid}-{idx}">{safe_orig}</span> ')
                 html_parts.append('</div>')
                 
                 # 번역문 블록
@@ -634,23 +612,23 @@ def generate_html_content(
                 for idx, (orig, trans) in enumerate(sentence_pairs):
                     safe_orig = html.escape(orig)
                     safe_trans = html.escape(trans)
-                    html_parts.append(f'<span class="sent" id="tgt-{id(item)}-{idx}" data-src="src-{id(item)}-{idx}" data-src-text="{safe_orig}">{safe_trans}</span> ')
+                    html_parts.append(f'<span class="sent" id="tgt-{uid}-{idx}" data-src="src-{uid}-{idx}" data-src-text="{safe_orig}">{safe_trans}</span> ')
                 html_parts.append('</div>')
                 
                 html_parts.append('</div>')
 
-        elif isinstance(item, (TableItem, PictureItem)):
-            image_path = save_and_get_image_path(item, doc, output_dir, base_filename, counters)
+        elif planned.kind in (RenderKind.TABLE, RenderKind.PICTURE):
+            image_path = save_and_get_image_path(item, doc, output_dir, base_filename, state.counters)
             
             if image_path:
-                alt_text = "table" if isinstance(item, TableItem) else "image"
+                alt_text = "table" if planned.kind == RenderKind.TABLE else "image"
                 
                 html_parts.append(f"""
                 <div class="full-width">
                     <img src="{image_path}" alt="{alt_text}">
                 """)
                 
-                orig_caption = item.caption_text(doc)
+                orig_caption = planned.caption
                 if orig_caption:
                     trans_caption = translation_map.get(orig_caption, "")
                     html_parts.append(f'<div class="caption">{html.escape(trans_caption)}</div>\n') 
@@ -658,10 +636,10 @@ def generate_html_content(
                 html_parts.append(f"</div>\n")
 
                 # [NEW] 번역된 표 렌더링 (HTML Table with Hover Tooltips)
-                if isinstance(item, TableItem):
+                if planned.kind == RenderKind.TABLE and planned.table_df is not None:
                     try:
-                        # [FIX] deprecated API 수정 (Issue #102)
-                        df = item.export_to_dataframe(doc)
+                        # 계획 단계에서 추출한 데이터프레임 재사용
+                        df = planned.table_df
                         
                         # --- 1. 원문 표 생성 (검수 모드용) ---
                         table_rows_orig = []
@@ -737,25 +715,32 @@ def generate_html_content(
                     except Exception as e:
                         # 표 렌더링 실패 시에도 전체 프로세스는 멈추지 않도록 함
                         pass
-        
-        # [NEW] FormulaItem 처리 (Issue #102)
-        # 수식은 번역하지 않고 원문(LaTeX) 그대로 MathJax로 렌더링합니다.
-        elif isinstance(item, FormulaItem):
-            try:
-                # FormulaItem에서 LaTeX 텍스트 추출
-                latex = item.text if hasattr(item, 'text') and item.text else ""
-                
-                if latex.strip():
-                    # 블록 수식으로 렌더링 (\[ ... \] 형식)
-                    # MathJax가 자동으로 렌더링합니다
-                    html_parts.append(f'''
-                    <div class="formula-block">
-                        \\[{html.escape(latex)}\\]
-                    </div>
-                    ''')
-            except Exception as e:
-                # 수식 렌더링 실패 시에도 전체 프로세스는 멈추지 않도록 함
-                pass
     
-    html_parts.append(HTML_FOOTER)
     return "".join(html_parts)
+
+
+def generate_html_content(
+    doc: DoclingDocument,
+    plan: RenderPlan,
+    translation_map: dict,
+    output_dir: Path,
+    base_filename: str,
+    progress_cb: Optional[ProgressCallback] = None
+) -> str:
+    """
+    렌더링 계획과 번역 맵을 결합하여 인터랙티브 HTML 컨텐츠를 생성합니다.
+    아이템별 표시 여부와 방식은 계획 단계(`build_render_plan`)에서 이미 결정되어 있습니다.
+    
+    Args:
+        doc (DoclingDocument): 원본 문서 객체 (이미지 추출용)
+        plan (RenderPlan): 아이템별 렌더링 계획
+        translation_map (dict): 원문 문장 -> 번역 문장 매핑
+        output_dir (Path): 이미지 저장 경로
+        base_filename (str): 이미지 파일명 접두사
+        progress_cb (Optional[ProgressCallback]): 진행률 콜백
+        
+    Returns:
+        str: 완성된 HTML 문자열
+    """
+    body = render_items(doc, plan.items, translation_map, output_dir, base_filename, HtmlRenderState(), progress_cb)
+    return HTML_HEADER + body + HTML_FOOTER
@@ -0,0 +1,172 @@
+"""
+src/incremental.py
+==================
+개정된 PDF에서 바뀐 페이지만 다시 변환하는 페이지 단위 증분 변환 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **페이지 지문**: pypdfium2로 각 페이지의 텍스트 레이어와 저해상도 렌더링 이미지를 해시하여 페이지 지문을 만듭니다.
+2.  **페이지 저장소**: 변환된 페이지를 (페이지 지문, 변환기 설정) 키로 한 페이지짜리 문서로 저장합니다 (`src.conversion_cache` 재사용).
+3.  **증분 변환**: 저장소에 없는 페이지만 연속 구간으로 묶어 Docling으로 변환하고, 나머지는 저장된 페이지를 사용해 페이지 순서대로 병합합니다.
+4.  **페이지 목록 기록**: 출력 폴더에 페이지별 지문과 재사용 여부(`*_pages.json`)를 남깁니다.
+
+계약서 v1, v2, v3처럼 일부 페이지만 바뀐 개정본은 바뀐 페이지만 레이아웃/표 모델을 거칩니다.
+바뀌지 않은 페이지의 문장은 번역 메모리(`src.translation.memory`)에 이미 있으므로 번역도 다시 하지 않습니다.
+
+환경 변수:
+- `INCREMENTAL_CONVERSION`: `1`이면 PDF를 페이지 단위 증분 변환 (기본값: 0)
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional
+
+from docling_core.types.doc import DoclingDocument
+
+from src.conversion_cache import ConversionCache, DEFAULT_CACHE_DIR
+from src.pipeline import PageRange
+
+# 페이지 지문용 렌더링 배율 (72 DPI 기준, 0.25 = 18 DPI). 레이아웃 변화만 감지하면 되므로 낮게 유지
+_FINGERPRINT_SCALE = 0.25
+
+_store: Optional[ConversionCache] = None
+_store_lock = threading.Lock()
+
+
+def is_incremental_enabled() -> bool:
+    """환경 변수 `INCREMENTAL_CONVERSION`으로 증분 변환 사용 여부를 읽습니다."""
+    return os.getenv("INCREMENTAL_CONVERSION", "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _get_page_store() -> ConversionCache:
+    """페이지 저장소(변환 캐시 디렉토리 아래 `pages/`)를 반환합니다."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            base = Path(os.getenv("CONVERSION_CACHE_DIR") or DEFAULT_CACHE_DIR)
+            _store = ConversionCache(cache_dir=base / "pages")
+        return _store
+
+
+def page_fingerprints(file_path: str) -> List[str]:
+    """
+    PDF 각 페이지의 지문(텍스트 레이어 + 저해상도 렌더링 이미지의 SHA-256)을 반환합니다.
+
+    Raises:
+        ImportError: pypdfium2가 없는 경우
+    """
+    import pypdfium2 as pdfium
+
+    fingerprints = []
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            digest = hashlib.sha256()
+            textpage = page.get_textpage()
+            try:
+                digest.update(textpage.get_text_range().encode("utf-8"))
+            finally:
+                textpage.close()
+            bitmap = page.render(scale=_FINGERPRINT_SCALE)
+            try:
+                digest.update(bytes(bitmap.buffer))
+            finally:
+                bitmap.close()
+            digest.update(f"{page.get_width():.1f}x{page.get_height():.1f}".encode("utf-8"))
+            page.close()
+            fingerprints.append(digest.hexdigest())
+    finally:
+        pdf.close()
+    return fingerprints
+
+
+def _missing_runs(pages: List[Optional[DoclingDocument]]) -> List[PageRange]:
+    """저장소에 없는 페이지를 연속 구간(1부터 시작, 양 끝 포함)으로 묶습니다."""
+    runs: List[PageRange] = []
+    for index, doc in enumerate(pages):
+        page_no = index + 1
+        if doc is not None:
+            continue
+        if runs and runs[-1][1] == page_no - 1:
+            runs[-1] = (runs[-1][0], page_no)
+        else:
+            runs.append((page_no, page_no))
+    return runs
+
+
+@dataclass
+class IncrementalResult:
+    """증분 변환 결과입니다."""
+    document: DoclingDocument
+    fingerprints: List[str] = field(default_factory=list)
+    # 다시 변환한 페이지 번호 (1부터 시작)
+    converted_pages: List[int] = field(default_factory=list)
+
+    def write_manifest(self, path: Path):
+        """페이지별 지문과 재사용 여부를 JSON으로 기록합니다."""
+        converted = set(self.converted_pages)
+        manifest = {
+            "pages": [
+                {"page": i + 1, "fingerprint": fp, "reused": (i + 1) not in converted}
+                for i, fp in enumerate(self.fingerprints)
+            ]
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def convert_incremental(converter: Any, file_path: str) -> IncrementalResult:
+    """
+    PDF에서 저장소에 없는(바뀐) 페이지만 변환하고, 저장된 페이지와 합쳐 전체 문서를 만듭니다.
+
+    Args:
+        converter (DocumentConverter): Docling 변환기 인스턴스
+        file_path (str): 변환할 PDF 경로
+
+    Returns:
+        IncrementalResult: 병합된 문서와 페이지 지문, 다시 변환한 페이지 목록
+
+    Raises:
+        Exception: 지문 계산 또는 변환에 실패한 경우 (호출 측에서 전체 변환으로 폴백)
+    """
+    store = _get_page_store()
+    settings = store.settings_key(converter)
+    fingerprints = page_fingerprints(file_path)
+    keys = [hashlib.sha256(f"{fp}:{settings}".encode("utf-8")).hexdigest() for fp in fingerprints]
+
+    pages: List[Optional[DoclingDocument]] = [store.load(key) for key in keys]
+    runs = _missing_runs(pages)
+    converted_pages = [p for start, end in runs for p in range(start, end + 1)]
+    logging.info(
+        f"[Incremental] {len(fingerprints)}페이지 중 {len(fingerprints) - len(converted_pages)}페이지 재사용, "
+        f"{len(converted_pages)}페이지 변환"
+    )
+
+    origin = None
+    for start, end in runs:
+        run_doc = converter.convert(file_path, page_range=(start, end)).document
+        origin = origin or run_doc.origin
+        for page_no in range(start, end + 1):
+            # 한 페이지짜리 문서로 나누어 저장 (다음 개정본에서 페이지 단위로 재사용)
+            page_doc = run_doc.filter(page_nrs={page_no})
+            if not page_doc.pages:
+                raise ValueError(f"페이지 {page_no}의 변환 결과가 없습니다.")
+            try:
+                store.store(keys[page_no - 1], page_doc)
+            except Exception as e:
+                logging.warning(f"[Incremental] 페이지 {page_no} 저장 실패(무시됨): {e}")
+            pages[page_no - 1] = page_doc
+
+    # concatenate는 앞 문서의 마지막 페이지 다음부터 번호를 이어 붙이므로, 페이지 순서대로 합치면 1..N이 됨
+    merged = DoclingDocument.concatenate(pages)
+    merged.name = Path(file_path).stem
+    # 모든 페이지를 재사용한 경우 저장된 페이지의 출처 정보를 사용
+    merged.origin = origin or pages[0].origin
+    if sorted(merged.pages) != list(range(1, len(fingerprints) + 1)):
+        raise ValueError("병합된 문서의 페이지 번호가 원본과 일치하지 않습니다.")
+    return IncrementalResult(document=merged, fingerprints=fingerprints, converted_pages=converted_pages)
@@ -0,0 +1,242 @@
+"""
+src/job_queue.py
+================
+Web UI(Streamlit)의 번역 작업을 백그라운드에서 처리하는 작업 큐 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **백그라운드 처리**: 업로드한 파일들을 배치(batch)로 제출하면 파일 단위 작업(job)으로 나누어 배치 스케줄러(`src.batch_scheduler`)에 넘깁니다.
+    스케줄러는 한 파일을 번역하는 동안 다음 파일을 변환하는 식으로 단계를 겹쳐 처리하며,
+    Streamlit 스크립트 실행은 제출 후 바로 끝나므로 처리 중에도 화면이 멈추지 않고 다른 사용자의 요청도 함께 처리됩니다.
+2.  **진행 상태 조회**: 작업마다 상태(대기/처리 중/완료/실패/취소), 진행률, 진행 메시지, 결과를 보관하며,
+    UI는 주기적으로 `get_jobs()`를 조회하여 완료된 파일의 결과부터 바로 표시합니다.
+3.  **재접속 유지**: 작업 상태는 프로세스 전역 큐에 보관되므로 스크립트 재실행이나 브라우저 재접속 후에도 배치 ID로 다시 조회할 수 있습니다.
+4.  **자원 공유**: 같은 프로세스의 모든 작업이 속도 모드별 변환기, 번역 엔진 레지스트리, 스케줄러의 CPU/네트워크 동시성 제한을 공유합니다.
+5.  **취소**: 대기 중인 작업은 바로 취소되고, 처리 중인 작업은 다음 진행률 보고 시점에 중단됩니다.
+
+업로드 파일은 작업마다 별도 디렉토리에 저장되고, 출력 폴더도 작업마다 새로 만들어지므로(`src.utils.create_output_dir`),
+여러 사용자가 같은 이름의 파일을 동시에 올려도 업로드 파일과 결과(HTML, 이미지)가 섞이지 않습니다.
+
+동시에 처리하는 파일 수는 스케줄러의 `BATCH_CPU_SLOTS`, `BATCH_NET_SLOTS`로 조절합니다.
+
+환경 변수:
+- `JOB_RETENTION`: 끝난 배치의 상태를 보관하는 시간(초) (기본값: 86400)
+- `JOB_UPLOAD_DIR`: 업로드 파일 임시 저장 디렉토리 (기본값: .cache/uploads)
+"""
+
+import os
+import time
+import uuid
+import shutil
+import logging
+import threading
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.batch_scheduler import BatchItem, BatchScheduler
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = frozenset({DONE, FAILED, CANCELLED})
+
+
+class JobCancelled(Exception):
+    """처리 중인 작업의 취소가 요청되었을 때 진행률 콜백에서 발생시키는 예외입니다."""
+
+
+@dataclass
+class Job:
+    """파일 하나의 번역 작업 상태입니다."""
+    job_id: str
+    batch_id: str
+    file_name: str
+    file_path: str
+    status: str = QUEUED
+    progress: float = 0.0
+    message: str = ""
+    result: Dict[str, str] = field(default_factory=dict)
+    error: str = ""
+    cancel_requested: bool = False
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+
+@dataclass
+class Batch:
+    """한 번에 제출한 파일 묶음과 공통 번역 옵션입니다."""
+    batch_id: str
+    job_ids: List[str]
+    options: Dict[str, Any]
+    created: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+
+class JobQueue:
+    """
+    번역 작업의 상태를 관리하고 처리를 배치 스케줄러에 맡기는 프로세스 전역 작업 큐입니다.
+    Streamlit에서는 `st.cache_resource`로 한 번만 생성하여 모든 세션이 공유합니다.
+    """
+
+    def __init__(
+        self,
+        converter_factory: Callable[[str], Any],
+        scheduler: Optional[BatchScheduler] = None,
+        upload_dir: Optional[str] = None,
+        retention: Optional[float] = None,
+    ):
+        """
+        Args:
+            converter_factory: 속도 모드("balanced", "fast")를 받아 Docling 변환기를 만드는 함수 (모드별로 한 번만 호출)
+            scheduler (Optional[BatchScheduler]): 작업을 처리할 스케줄러. None이면 converter_factory로 새로 생성
+            upload_dir (Optional[str]): 업로드 파일 저장 디렉토리. None이면 JOB_UPLOAD_DIR 또는 .cache/uploads
+            retention (Optional[float]): 끝난 배치 보관 시간(초). None이면 JOB_RETENTION 또는 86400
+        """
+        self.scheduler = scheduler or BatchScheduler(converter_factory)
+        self.upload_dir = Path(upload_dir or os.getenv("JOB_UPLOAD_DIR", ".cache/uploads"))
+        self.retention = retention if retention is not None else float(os.getenv("JOB_RETENTION", "86400"))
+
+        self._jobs: Dict[str, Job] = {}
+        self._batches: Dict[str, Batch] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 제출 / 조회 / 취소
+    # ------------------------------------------------------------------
+    def submit_batch(self, files: List[Tuple[str, bytes]], **options) -> str:
+        """
+        파일 묶음을 제출합니다.
+
+        Args:
+            files: (파일 이름, 파일 내용) 목록
+            **options: process_document 인수 (source_lang, dest_lang, engine, max_workers, ui_lang)와 speed_mode
+
+        Returns:
+            str: 배치 ID
+        """
+        self._prune()
+        batch_id = uuid.uuid4().hex[:12]
+        jobs = []
+        for file_name, data in files:
+            job_id = uuid.uuid4().hex[:12]
+            job_dir = self.upload_dir / job_id
+            job_dir.mkdir(parents=True, exist_ok=True)
+            file_path = job_dir / Path(file_name).name
+            file_path.write_bytes(data)
+            jobs.append(Job(job_id=job_id, batch_id=batch_id, file_name=file_name, file_path=str(file_path)))
+
+        with self._lock:
+            self._batches[batch_id] = Batch(batch_id=batch_id, job_ids=[j.job_id for j in jobs], options=dict(options))
+            for job in jobs:
+                self._jobs[job.job_id] = job
+        for job in jobs:
+            job_options = dict(options)
+            speed_mode = job_options.pop("speed_mode", "balanced")
+            self.scheduler.submit(
+                job.file_path,
+                speed_mode=speed_mode,
+                progress_cb=self._progress_callback(job),
+                on_done=lambda item, job=job: self._on_done(job, item),
+                **job_options,
+            )
+
+        logging.info(f"[JobQueue] 배치 제출: {batch_id} ({len(jobs)}개 파일)")
+        return batch_id
+
+    def get_batch(self, batch_id: str) -> Optional[Batch]:
+        """배치 정보를 반환합니다 (없거나 보관 기간이 지났으면 None)."""
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            return replace(batch, job_ids=list(batch.job_ids)) if batch else None
+
+    def get_jobs(self, batch_id: str) -> List[Job]:
+        """배치에 속한 작업들의 현재 상태(복사본)를 제출 순서대로 반환합니다."""
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return []
+            return [replace(self._jobs[job_id], result=dict(self._jobs[job_id].result)) for job_id in batch.job_ids]
+
+    def cancel_batch(self, batch_id: str):
+        """배치의 끝나지 않은 작업을 모두 취소합니다."""
+        cancelled = []
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return
+            for job_id in batch.job_ids:
+                job = self._jobs[job_id]
+                if job.status == QUEUED:
+                    job.status = CANCELLED
+                    cancelled.append(job)
+                elif job.status == RUNNING:
+                    job.cancel_requested = True
+            self._update_batch_locked(batch)
+        for job in cancelled:
+            shutil.rmtree(Path(job.file_path).parent, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # 내부 처리
+    # ------------------------------------------------------------------
+    def _update_batch_locked(self, batch: Batch):
+        if batch.finished_at is None and all(self._jobs[j].finished for j in batch.job_ids):
+            batch.finished_at = time.time()
+
+    def _finish(self, job: Job, status: str, **fields):
+        with self._lock:
+            job.status = status
+            for name, value in fields.items():
+                setattr(job, name, value)
+            self._update_batch_locked(self._batches[job.batch_id])
+        shutil.rmtree(Path(job.file_path).parent, ignore_errors=True)
+
+    def _progress_callback(self, job: Job) -> Callable[[float, str], None]:
+        """작업의 진행 상태를 기록하는 콜백을 만듭니다. 취소된 작업이면 JobCancelled를 발생시켜 처리를 중단합니다."""
+        def _progress(ratio: float, msg: str):
+            with self._lock:
+                cancelled = job.status == CANCELLED or job.cancel_requested
+                if not cancelled:
+                    job.status = RUNNING
+                    job.progress = min(max(ratio, 0.0), 1.0)
+                    job.message = msg
+            if cancelled:
+                raise JobCancelled()
+        return _progress
+
+    def _on_done(self, job: Job, item: BatchItem):
+        """스케줄러가 파일 처리를 끝내면 작업 상태를 확정합니다."""
+        with self._lock:
+            if job.finished:
+                # 대기 중에 취소된 작업 (이미 정리됨)
+                return
+        if isinstance(item.error, JobCancelled):
+            logging.info(f"[JobQueue] 작업 취소: {job.file_name}")
+            self._finish(job, CANCELLED)
+        elif item.error is not None:
+            self._finish(job, FAILED, error=str(item.error))
+        elif not item.result:
+            self._finish(job, FAILED, error=job.message)
+        else:
+            self._finish(job, DONE, progress=1.0, result={
+                "filename": job.file_name,
+                "output_dir": str(item.result["output_dir"]),
+                "html_path": str(item.result["html_path"]),
+            })
+
+    def _prune(self):
+        """보관 기간이 지난 끝난 배치를 정리합니다."""
+        if self.retention <= 0:
+            return
+        cutoff = time.time() - self.retention
+        with self._lock:
+            expired = [b for b in self._batches.values() if b.finished_at is not None and b.finished_at < cutoff]
+            for batch in expired:
+                for job_id in batch.job_ids:
+                    self._jobs.pop(job_id, None)
+                del self._batches[batch.batch_id]
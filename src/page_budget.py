@@ -0,0 +1,320 @@
+"""
+src/page_budget.py
+==================
+PDF 변환에 페이지당 시간 제한을 두고, 제한을 넘긴 페이지만 단계적으로 낮은 품질로 다시 처리하는 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **시간 제한 변환**: 별도 워커 프로세스에서 페이지 범위를 변환하며, (페이지 수 × 제한 시간) 안에 끝나지 않으면 워커를 종료합니다.
+    Docling 변환은 중간에 멈출 수 없으므로 워커 프로세스를 종료하고 다시 시작하는 방식으로 제한합니다.
+2.  **단계적 품질 저하**: 제한을 넘긴 범위는 페이지 단위로 다시 변환하고, 그래도 넘긴 페이지는
+    pypdfium2 백엔드 + `TableFormerMode.FAST`로, 그마저 넘기면 페이지 전체를 이미지 한 장으로 대신합니다.
+3.  **표시**: 품질을 낮춘 페이지는 출력 폴더의 `*_degraded_pages.json`에 기록되며, 이미지로 대신한 페이지에는 안내 캡션이 붙습니다.
+    스트리밍 파이프라인에서 변환에 실패한 페이지도 같은 방식(`failed`)으로 대신하고 기록합니다.
+
+그림이 매우 복잡하거나 표가 빽빽한 페이지 하나 때문에 문서 전체 변환이 수 분씩 멈추는 것을 막아 처리 시간을 예측 가능하게 유지합니다.
+
+환경 변수:
+- `PAGE_TIME_BUDGET`: 페이지당 변환 제한 시간(초). `0`이면 제한 없음 (기본값: 0)
+"""
+
+import os
+import json
+import atexit
+import logging
+import threading
+import multiprocessing as mp
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from docling_core.types.doc import DoclingDocument, DocItemLabel, ImageRef, ProvenanceItem, BoundingBox, Size
+
+from src.pipeline import PageRange, count_pdf_pages, split_page_ranges
+from src.parallel_convert import get_conversion_page_chunk, merge_documents
+
+# 품질 저하 단계
+DEGRADED_FAST = "fast"
+DEGRADED_IMAGE = "image"
+# 변환에 실패하여 페이지 이미지로 대신한 페이지 (스트리밍 파이프라인), 이미지도 만들 수 없어 빠진 페이지
+DEGRADED_FAILED = "failed"
+DEGRADED_MISSING = "missing"
+
+# 이미지로 대신한 페이지의 렌더링 배율 (기본 변환기의 images_scale과 같게 유지)
+_IMAGE_SCALE = 2.0
+
+# 이미지로 대신한 페이지에 붙는 캡션
+_IMAGE_NOTE = "[페이지 {page_no}: 변환 시간 제한({budget:.0f}초)을 넘어 페이지 이미지로 표시합니다]"
+
+# 변환에 실패한 페이지에 붙는 캡션
+_FAILED_NOTE = "[페이지 {page_no}: 변환에 실패하여 페이지 이미지로 표시합니다]"
+
+# 워커가 모델을 로드하는 시간(파이프라인 초기화 포함)은 제한에 포함하지 않되, 무한히 기다리지 않도록 하는 상한(초)
+_WORKER_START_TIMEOUT = 600
+
+
+def get_page_time_budget() -> float:
+    """환경 변수 `PAGE_TIME_BUDGET`으로 페이지당 제한 시간(초)을 읽습니다. 0이면 제한 없음."""
+    try:
+        return max(float(os.getenv("PAGE_TIME_BUDGET", "0")), 0.0)
+    except ValueError:
+        return 0.0
+
+
+def _fast_format_option(option: Any) -> Any:
+    """PDF 설정을 pypdfium2 백엔드 + `TableFormerMode.FAST`로 바꾼 복사본을 만듭니다."""
+    from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+    from docling.datamodel.pipeline_options import TableFormerMode
+    from docling.document_converter import PdfFormatOption
+
+    pipeline_options = option.pipeline_options.model_copy(deep=True)
+    pipeline_options.table_structure_options.mode = TableFormerMode.FAST
+    return PdfFormatOption(
+        pipeline_cls=option.pipeline_cls,
+        pipeline_options=pipeline_options,
+        backend=PyPdfiumDocumentBackend,
+    )
+
+
+def _worker_main(pdf_option: Any, conn):
+    """
+    워커 프로세스 본체: 변환기를 만든 뒤 (파일, 페이지 범위, 빠른 모드 여부) 요청을 차례로 처리합니다.
+
+    Docling은 레이아웃/TableFormer/수식 모델을 첫 `convert`에서 로드하므로, 기본/빠른 변환기의 파이프라인을 모두
+    초기화한 뒤에 "ready"를 보냅니다. 모델 로드 시간이 첫 페이지 범위(또는 재시작 후 다음 페이지)의 제한 시간에 포함되지 않습니다.
+    """
+    from docling.datamodel.base_models import InputFormat
+    from docling.document_converter import DocumentConverter
+
+    converter = DocumentConverter(allowed_formats=[InputFormat.PDF], format_options={InputFormat.PDF: pdf_option})
+    fast_converter = DocumentConverter(
+        allowed_formats=[InputFormat.PDF],
+        format_options={InputFormat.PDF: _fast_format_option(pdf_option)},
+    )
+    converter.initialize_pipeline(InputFormat.PDF)
+    fast_converter.initialize_pipeline(InputFormat.PDF)
+    conn.send("ready")
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        file_path, page_range, fast = request
+        try:
+            target = fast_converter if fast else converter
+            conn.send((target.convert(file_path, page_range=page_range).document, None))
+        except Exception as e:
+            # 예외 객체는 피클링되지 않을 수 있으므로 메시지만 전달
+            conn.send((None, f"{type(e).__name__}: {e}"))
+
+
+class _BudgetWorker:
+    """시간 제한을 넘기면 종료하고 다시 시작할 수 있는 변환 워커 프로세스입니다."""
+
+    def __init__(self, pdf_option: Any):
+        self._pdf_option = pdf_option
+        self._process = None
+        self._conn = None
+
+    def _start(self):
+        # 모델 추론 라이브러리와 fork는 안전하지 않으므로 spawn 사용
+        ctx = mp.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_worker_main, args=(self._pdf_option, child_conn), name="page-budget-converter", daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        if not self._conn.poll(_WORKER_START_TIMEOUT) or self._conn.recv() != "ready":
+            self.close()
+            raise RuntimeError("변환 워커를 시작하지 못했습니다.")
+
+    def convert(self, file_path: str, page_range: PageRange, fast: bool, timeout: float) -> DoclingDocument:
+        """
+        페이지 범위를 변환합니다.
+
+        Raises:
+            TimeoutError: 제한 시간 안에 끝나지 않은 경우 (워커는 종료되고 다음 요청 때 다시 시작됨)
+            RuntimeError: 변환 중 오류가 발생한 경우
+        """
+        if self._process is None or not self._process.is_alive():
+            self._start()
+        self._conn.send((file_path, page_range, fast))
+        try:
+            ready = self._conn.poll(timeout)
+            result = self._conn.recv() if ready else None
+        except (EOFError, OSError):
+            self.close()
+            raise RuntimeError("변환 워커가 비정상 종료되었습니다.")
+        if not ready:
+            self.close()
+            raise TimeoutError(f"페이지 {page_range[0]}-{page_range[1]} 변환이 {timeout:.0f}초를 넘었습니다.")
+        doc, error = result
+        if error:
+            raise RuntimeError(error)
+        return doc
+
+    def close(self):
+        """워커 프로세스를 종료합니다."""
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process.join(timeout=5)
+        if self._conn is not None:
+            self._conn.close()
+        self._process, self._conn = None, None
+
+
+# (변환기 id) -> 워커 (파일마다 모델을 다시 로드하지 않도록 재사용)
+_worker: Optional[_BudgetWorker] = None
+_worker_key: Optional[int] = None
+_worker_lock = threading.Lock()
+
+
+def _get_worker(converter: Any) -> _BudgetWorker:
+    global _worker, _worker_key
+    if _worker is not None and _worker_key == id(converter):
+        return _worker
+    shutdown_worker()
+
+    from docling.datamodel.base_models import InputFormat
+
+    _worker = _BudgetWorker(converter.format_to_options[InputFormat.PDF])
+    _worker_key = id(converter)
+    return _worker
+
+
+def shutdown_worker():
+    """시간 제한 변환 워커를 종료합니다."""
+    global _worker, _worker_key
+    if _worker is not None:
+        _worker.close()
+    _worker, _worker_key = None, None
+
+
+atexit.register(shutdown_worker)
+
+
+def render_page_document(file_path: str, page_no: int, note: str) -> DoclingDocument:
+    """
+    페이지 전체를 이미지 한 장(그림 아이템)으로 담은 한 페이지짜리 문서를 만듭니다.
+    `note`는 그림의 캡션으로 붙어 HTML에 표시됩니다.
+    """
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        page = pdf[page_no - 1]
+        width, height = page.get_width(), page.get_height()
+        bitmap = page.render(scale=_IMAGE_SCALE)
+        image = bitmap.to_pil()
+        bitmap.close()
+        page.close()
+    finally:
+        pdf.close()
+
+    doc = DoclingDocument(name=Path(file_path).stem)
+    doc.add_page(page_no=page_no, size=Size(width=width, height=height),
+                 image=ImageRef.from_pil(image, dpi=int(72 * _IMAGE_SCALE)))
+    bbox = BoundingBox(l=0, t=0, r=width, b=height)
+    picture = doc.add_picture(prov=ProvenanceItem(page_no=page_no, bbox=bbox, charspan=(0, 0)))
+    caption = doc.add_text(
+        label=DocItemLabel.CAPTION, text=note, parent=picture,
+        prov=ProvenanceItem(page_no=page_no, bbox=bbox, charspan=(0, len(note))),
+    )
+    picture.captions.append(caption.get_ref())
+    return doc
+
+
+def render_failed_page(file_path: str, page_no: int) -> DoclingDocument:
+    """변환에 실패한 페이지를 안내 캡션이 붙은 페이지 이미지로 대신합니다."""
+    return render_page_document(file_path, page_no, _FAILED_NOTE.format(page_no=page_no))
+
+
+def write_degraded_manifest(path: Path, degraded: Dict[int, str]):
+    """품질을 낮추거나 대신한 페이지 목록(페이지 번호 -> 단계)을 JSON으로 기록합니다."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"pages": [{"page": p, "mode": mode} for p, mode in sorted(degraded.items())]},
+            f, ensure_ascii=False, indent=2,
+        )
+
+
+@dataclass
+class BudgetResult:
+    """시간 제한 변환 결과입니다. degraded는 품질을 낮춘 페이지 번호 -> 단계(`fast`/`image`)입니다."""
+    document: DoclingDocument
+    degraded: Dict[int, str] = field(default_factory=dict)
+
+    def write_manifest(self, path: Path):
+        """품질을 낮춘 페이지 목록을 JSON으로 기록합니다."""
+        write_degraded_manifest(path, self.degraded)
+
+
+def _convert_page(worker: _BudgetWorker, file_path: str, page_no: int, budget: float,
+                  degraded: Dict[int, str], skip_default: bool = False) -> DoclingDocument:
+    """
+    페이지 하나를 기본 설정 → 빠른 설정 → 페이지 이미지 순서로 제한 시간 안에 변환합니다.
+    `skip_default`면 기본 설정은 이미 시도한 것으로 보고 빠른 설정부터 시작합니다.
+    """
+    for fast in ((True,) if skip_default else (False, True)):
+        try:
+            doc = worker.convert(file_path, (page_no, page_no), fast=fast, timeout=budget)
+        except TimeoutError as e:
+            logging.warning(f"[PageBudget] {e}")
+            continue
+        if fast:
+            degraded[page_no] = DEGRADED_FAST
+        return doc
+
+    degraded[page_no] = DEGRADED_IMAGE
+    return render_page_document(file_path, page_no, _IMAGE_NOTE.format(page_no=page_no, budget=budget))
+
+
+def convert_with_budget(converter: Any, file_path: str, budget: float) -> BudgetResult:
+    """
+    PDF를 페이지당 제한 시간 안에서 변환합니다.
+
+    Args:
+        converter (DocumentConverter): Docling 변환기 인스턴스 (워커도 같은 PDF 설정 사용)
+        file_path (str): 변환할 PDF 경로
+        budget (float): 페이지당 제한 시간(초)
+
+    Returns:
+        BudgetResult: 병합된 문서와 품질을 낮춘 페이지 목록
+
+    Raises:
+        Exception: 페이지 수를 알 수 없거나 변환 중 오류가 발생한 경우 (호출 측에서 기존 변환으로 폴백)
+    """
+    page_count = count_pdf_pages(file_path)
+    if not page_count:
+        raise ValueError("PDF 페이지 수를 확인할 수 없습니다.")
+
+    file_path = os.path.abspath(file_path)
+    degraded: Dict[int, str] = {}
+    docs: List[DoclingDocument] = []
+    with _worker_lock:
+        worker = _get_worker(converter)
+        for start, end in split_page_ranges(page_count, get_conversion_page_chunk()):
+            pages = end - start + 1
+            try:
+                docs.append(worker.convert(file_path, (start, end), fast=False, timeout=budget * pages))
+                continue
+            except TimeoutError as e:
+                logging.warning(f"[PageBudget] {e} 페이지 단위로 다시 변환합니다.")
+            # 범위가 제한을 넘으면 어느 페이지가 느린지 모르므로 페이지마다 따로 제한
+            for page_no in range(start, end + 1):
+                docs.append(_convert_page(worker, file_path, page_no, budget, degraded, skip_default=(pages == 1)))
+
+    for doc in docs:
+        if not doc.pages:
+            raise ValueError("페이지가 없는 변환 결과가 있습니다.")
+    if degraded:
+        logging.warning(f"[PageBudget] {Path(file_path).name}: 품질을 낮춘 페이지 {sorted(degraded.items())}")
+    merged = merge_documents(docs)
+    merged.name = Path(file_path).stem
+    # 첫 페이지가 이미지로 대신한 페이지면 출처 정보가 없으므로 변환된 범위에서 가져옴
+    merged.origin = next((doc.origin for doc in docs if doc.origin is not None), None)
+    return BudgetResult(document=merged, degraded=degraded)
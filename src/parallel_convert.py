@@ -0,0 +1,215 @@
+"""
+src/parallel_convert.py
+=======================
+긴 PDF를 페이지 범위로 나누어 여러 프로세스에서 동시에 변환하는 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **변환 워커 풀**: 워커 프로세스마다 같은 설정의 `DocumentConverter`를 한 번 생성하고, 서로 겹치지 않는 CPU 코어에 고정합니다.
+2.  **페이지 범위 변환**: PDF를 `CONVERSION_PAGE_CHUNK` 페이지씩 나누어 워커에 분배합니다.
+3.  **문서 병합**: 변환된 `DoclingDocument`들을 페이지 순서대로 하나로 합칩니다.
+    페이지 범위가 연속되어 있으므로 페이지 번호(provenance)는 원본 PDF와 같게 유지됩니다.
+4.  **폴백**: 범위 하나라도 변환에 실패하면 기존처럼 현재 프로세스에서 전체 문서를 변환합니다.
+
+긴 PDF에서는 레이아웃 분석과 TableFormer 추론이 대부분의 시간을 차지하므로,
+변환기 하나의 내부 병렬성에 머무르지 않고 코어 수에 비례해 변환 속도를 높일 수 있습니다.
+
+환경 변수:
+- `CONVERSION_WORKERS`: PDF 변환 워커 프로세스 수. `1`이면 현재 프로세스에서 변환 (기본값: 1)
+- `CONVERSION_PAGE_CHUNK`: 워커 하나가 한 번에 변환할 페이지 수 (기본값: 16)
+"""
+
+import os
+import atexit
+import logging
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional, Tuple
+
+from docling_core.types.doc import DoclingDocument
+
+from src.pipeline import PageRange, count_pdf_pages, split_page_ranges
+
+# 워커 프로세스 안에서 생성한 변환기
+_worker_converter: Any = None
+
+# (PDF 변환 설정, 워커 수) -> 워커 풀 (파일마다 모델을 다시 로드하지 않도록 재사용)
+# 배치 스케줄러의 여러 변환 워커 스레드가 함께 사용하므로 잠금으로 보호
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_key: Optional[Tuple[str, int]] = None
+_pool_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, str(default))), 1)
+    except ValueError:
+        return default
+
+
+def get_conversion_workers() -> int:
+    """환경 변수 `CONVERSION_WORKERS`로 변환 워커 수를 읽습니다."""
+    return _env_int("CONVERSION_WORKERS", 1)
+
+
+def get_conversion_page_chunk() -> int:
+    """환경 변수 `CONVERSION_PAGE_CHUNK`로 워커당 페이지 범위 크기를 읽습니다."""
+    return _env_int("CONVERSION_PAGE_CHUNK", 16)
+
+
+def _init_worker(format_options: dict, cpu_queue):
+    """
+    워커 프로세스 초기화: 할당된 코어에 고정하고 스레드 수를 맞춘 뒤 변환기를 생성합니다.
+    """
+    global _worker_converter
+    try:
+        cpus, num_threads = cpu_queue.get_nowait()
+    except Exception:
+        cpus, num_threads = None, None
+
+    if cpus and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError as e:
+            logging.warning(f"[ParallelConvert] CPU 고정 실패(무시됨): {e}")
+    if num_threads:
+        for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "TORCH_NUM_THREADS"):
+            os.environ[name] = str(num_threads)
+        try:
+            import torch
+            torch.set_num_threads(num_threads)
+        except Exception:
+            pass
+
+    from docling.document_converter import DocumentConverter
+
+    # 부모 프로세스 변환기와 같은 PDF 파이프라인 설정 사용
+    _worker_converter = DocumentConverter(
+        allowed_formats=list(format_options),
+        format_options=format_options,
+    )
+
+
+def _convert_range(file_path: str, page_range: PageRange) -> DoclingDocument:
+    """워커 프로세스에서 페이지 범위 하나를 변환합니다."""
+    return _worker_converter.convert(file_path, page_range=page_range).document
+
+
+def _pdf_options_key(option: Any) -> str:
+    """PDF 포맷 옵션(파이프라인/백엔드/파이프라인 옵션)을 비교 가능한 문자열로 요약합니다."""
+    pipeline_options = getattr(option, "pipeline_options", None)
+    options_json = (pipeline_options.model_dump_json() if hasattr(pipeline_options, "model_dump_json")
+                    else repr(pipeline_options))
+    return (f"{getattr(getattr(option, 'pipeline_cls', None), '__name__', '')}"
+            f"|{getattr(getattr(option, 'backend', None), '__name__', '')}|{options_json}")
+
+
+def _get_pool(converter: Any, workers: int) -> ProcessPoolExecutor:
+    """
+    변환기의 PDF 설정에 맞는 워커 풀을 반환합니다.
+    PDF 설정과 워커 수가 같으면 변환기 인스턴스가 달라도 재사용합니다.
+    """
+    from docling.datamodel.base_models import InputFormat
+
+    # PDF 설정만 워커로 전달 (범위 변환은 PDF에만 사용)
+    pdf_option = converter.format_to_options[InputFormat.PDF]
+    key = (_pdf_options_key(pdf_option), workers)
+    with _pool_lock:
+        if _pool is not None and _pool_key == key:
+            return _pool
+        # 설정이 바뀌면 새 풀로 교체 (이전 풀에서 진행 중인 변환은 끝까지 실행)
+        _shutdown_locked(cancel_futures=False)
+        return _start_pool_locked({InputFormat.PDF: pdf_option}, workers, key)
+
+
+def _start_pool_locked(format_options: dict, workers: int, key: Tuple[str, int]) -> ProcessPoolExecutor:
+    """새 워커 풀을 시작합니다 (`_pool_lock`을 잡은 상태에서 호출)."""
+    global _pool, _pool_key
+    from src.translation.process_pool import partition_cores
+
+    # 모델 추론 라이브러리와 fork는 안전하지 않으므로 spawn 사용
+    ctx = mp.get_context("spawn")
+    partitions = partition_cores(workers)
+    cpu_queue = ctx.Queue()
+    for partition in partitions:
+        cpu_queue.put(partition)
+
+    _pool = ProcessPoolExecutor(
+        max_workers=len(partitions),
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(format_options, cpu_queue),
+    )
+    _pool_key = key
+    logging.info(f"[ParallelConvert] 변환 워커 {len(partitions)}개 시작")
+    return _pool
+
+
+def _shutdown_locked(cancel_futures: bool):
+    """현재 워커 풀을 종료합니다 (`_pool_lock`을 잡은 상태에서 호출)."""
+    global _pool, _pool_key
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=cancel_futures)
+    _pool, _pool_key = None, None
+
+
+def shutdown_pool():
+    """변환 워커 풀을 종료합니다 (대기 중인 변환은 취소)."""
+    with _pool_lock:
+        _shutdown_locked(cancel_futures=True)
+
+
+atexit.register(shutdown_pool)
+
+
+def merge_documents(docs: list) -> DoclingDocument:
+    """
+    연속된 페이지 범위의 문서들을 페이지 순서대로 병합합니다.
+    `DoclingDocument.concatenate`는 앞 문서의 마지막 페이지 다음부터 페이지 번호를 이어 붙이므로,
+    범위가 연속되어 있으면 원본 페이지 번호가 그대로 유지됩니다.
+    """
+    merged = DoclingDocument.concatenate(docs)
+    merged.name = docs[0].name
+    merged.origin = docs[0].origin
+    return merged
+
+
+def convert_pdf_parallel(converter: Any, file_path: str, page_count: int, workers: int) -> DoclingDocument:
+    """
+    PDF를 페이지 범위로 나누어 워커 풀에서 변환하고 하나의 문서로 병합합니다.
+
+    Raises:
+        Exception: 범위 하나라도 변환에 실패한 경우 (페이지 번호가 어긋나지 않도록 부분 병합하지 않음)
+    """
+    page_ranges = split_page_ranges(page_count, get_conversion_page_chunk())
+    pool = _get_pool(converter, workers)
+    futures = [pool.submit(_convert_range, os.path.abspath(file_path), r) for r in page_ranges]
+    docs = [future.result() for future in futures]
+    for doc, (start, _) in zip(docs, page_ranges):
+        # 병합 시 페이지 번호는 각 문서의 첫 페이지를 기준으로 이어 붙이므로 범위 시작과 일치해야 함
+        if not doc.pages or min(doc.pages) != start:
+            raise ValueError(f"페이지 범위 {start}부터 시작하는 변환 결과의 페이지 번호가 맞지 않습니다.")
+    return merge_documents(docs)
+
+
+def convert_document(converter: Any, file_path: str) -> DoclingDocument:
+    """
+    문서를 변환합니다. `CONVERSION_WORKERS > 1`이고 범위 하나보다 긴 PDF면 여러 프로세스에서 병렬 변환합니다.
+
+    Args:
+        converter (DocumentConverter): Docling 변환기 인스턴스 (워커도 같은 PDF 설정 사용)
+        file_path (str): 변환할 파일 경로
+
+    Returns:
+        DoclingDocument: 변환된 문서
+    """
+    workers = get_conversion_workers()
+    if workers > 1:
+        page_count = count_pdf_pages(file_path)
+        if page_count and page_count > get_conversion_page_chunk():
+            try:
+                return convert_pdf_parallel(converter, file_path, page_count, workers)
+            except Exception as e:
+                logging.warning(f"[ParallelConvert] 병렬 변환 실패, 단일 프로세스로 변환합니다: {e}")
+                shutdown_pool()
+    return converter.convert(file_path).document
@@ -0,0 +1,156 @@
+"""
+src/pipeline.py
+===============
+문서 변환과 번역을 겹쳐 실행하는 스트리밍 파이프라인 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **페이지 범위 분할**: PDF를 일정한 페이지 수의 범위로 나눕니다.
+2.  **백그라운드 변환**: 별도 스레드에서 페이지 범위를 차례로 변환하여 크기가 제한된 큐에 넣습니다.
+    번역이 변환보다 느리면 큐가 가득 차 변환이 잠시 멈추므로 메모리 사용량이 제한됩니다.
+    변환에 실패한 범위는 한 번 더 시도하고, 그래도 실패하면 오류를 담아 넘깁니다
+    (`src.core`가 해당 페이지를 페이지 이미지로 대신하고 `*_degraded_pages.json`에 기록).
+3.  **순차 소비**: 호출 측은 변환이 끝난 페이지 범위부터 문서 순서대로 받아 번역과 HTML 작성을 진행합니다.
+
+CPU 위주의 레이아웃 분석과 네트워크 위주의 번역이 동시에 진행되므로,
+전체 시간이 (변환 + 번역)에서 두 단계 중 긴 쪽에 가깝게 줄어듭니다.
+
+환경 변수:
+- `PIPELINE_STREAMING`: `1`이면 PDF를 페이지 범위 단위로 스트리밍 처리 (기본값: 0)
+- `PIPELINE_PAGE_CHUNK`: 한 번에 변환할 페이지 수 (기본값: 8)
+- `PIPELINE_QUEUE_SIZE`: 번역을 기다리며 메모리에 보관할 변환 결과(페이지 범위)의 최대 개수 (기본값: 2)
+"""
+
+import os
+import queue
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple
+
+# 페이지 범위 (1부터 시작, 양 끝 포함)
+PageRange = Tuple[int, int]
+
+# 큐 대기 중 중단 여부를 확인하는 주기(초)
+_POLL_INTERVAL = 0.5
+
+# 페이지 범위 하나의 변환 시도 횟수 (일시적인 오류는 한 번 더 시도)
+_CONVERT_ATTEMPTS = 2
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, str(default))), 1)
+    except ValueError:
+        return default
+
+
+def is_streaming_enabled() -> bool:
+    """환경 변수 `PIPELINE_STREAMING`으로 스트리밍 파이프라인 사용 여부를 읽습니다."""
+    return os.getenv("PIPELINE_STREAMING", "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_page_chunk() -> int:
+    """환경 변수 `PIPELINE_PAGE_CHUNK`로 페이지 범위 크기를 읽습니다."""
+    return _env_int("PIPELINE_PAGE_CHUNK", 8)
+
+
+def get_queue_size() -> int:
+    """환경 변수 `PIPELINE_QUEUE_SIZE`로 변환 결과 큐 크기를 읽습니다."""
+    return _env_int("PIPELINE_QUEUE_SIZE", 2)
+
+
+def count_pdf_pages(file_path: str) -> Optional[int]:
+    """
+    PDF의 페이지 수를 반환합니다. PDF가 아니거나 읽을 수 없으면 None을 반환합니다.
+    (pypdfium2는 Docling의 의존성이므로 별도 설치가 필요하지 않습니다.)
+    """
+    if Path(file_path).suffix.lower() != ".pdf":
+        return None
+    try:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    except Exception as e:
+        logging.warning(f"PDF 페이지 수 확인 실패 ({file_path}): {e}")
+        return None
+
+
+def split_page_ranges(page_count: int, chunk_pages: int) -> List[PageRange]:
+    """전체 페이지를 chunk_pages 크기의 범위로 나눕니다. 예: (20, 8) -> [(1, 8), (9, 16), (17, 20)]"""
+    chunk_pages = max(chunk_pages, 1)
+    return [(start, min(start + chunk_pages - 1, page_count)) for start in range(1, page_count + 1, chunk_pages)]
+
+
+@dataclass
+class ConvertedChunk:
+    """변환이 끝난 페이지 범위 하나입니다. 변환에 실패하면 document는 None이고 error에 예외가 담깁니다."""
+    index: int
+    page_range: PageRange
+    document: Any = None
+    error: Optional[Exception] = None
+
+
+def iter_converted_chunks(
+    converter: Any,
+    file_path: str,
+    page_ranges: List[PageRange],
+    queue_size: int = 2,
+) -> Iterator[ConvertedChunk]:
+    """
+    페이지 범위를 백그라운드 스레드에서 차례로 변환하며, 변환이 끝나는 대로 문서 순서대로 반환합니다.
+    호출 측이 반복을 중단하면(예외, break) 변환 스레드도 다음 범위로 넘어가지 않고 종료됩니다.
+
+    Args:
+        converter (DocumentConverter): Docling 변환기 인스턴스
+        file_path (str): 변환할 PDF 경로
+        page_ranges (List[PageRange]): 변환할 페이지 범위 목록
+        queue_size (int): 소비되지 않은 변환 결과의 최대 보관 개수
+
+    Yields:
+        ConvertedChunk: 페이지 범위별 변환 결과
+    """
+    results: "queue.Queue[Optional[ConvertedChunk]]" = queue.Queue(maxsize=max(queue_size, 1))
+    stop = threading.Event()
+
+    def _put(chunk: Optional[ConvertedChunk]) -> bool:
+        # 큐가 가득 차면 대기하되, 소비 측이 중단되면 포기
+        while not stop.is_set():
+            try:
+                results.put(chunk, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        for index, page_range in enumerate(page_ranges):
+            if stop.is_set():
+                return
+            for attempt in range(_CONVERT_ATTEMPTS):
+                try:
+                    document = converter.convert(file_path, page_range=page_range).document
+                    chunk = ConvertedChunk(index=index, page_range=page_range, document=document)
+                    break
+                except Exception as e:
+                    chunk = ConvertedChunk(index=index, page_range=page_range, error=e)
+                    if attempt + 1 < _CONVERT_ATTEMPTS:
+                        logging.warning(f"[Pipeline] 페이지 {page_range[0]}-{page_range[1]} 변환 오류, 다시 시도합니다: {e}")
+            if not _put(chunk):
+                return
+        _put(None)
+
+    producer = threading.Thread(target=_produce, name="pipeline-converter", daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk = results.get()
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        stop.set()
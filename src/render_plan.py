@@ -0,0 +1,205 @@
+"""
+src/render_plan.py
+==================
+문서 아이템별 렌더링 방식과 문장 분리 결과를 담는 중간 문서 모델(Render Plan) 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **렌더링 계획 수립**: Docling 문서의 각 아이템이 HTML에 어떻게 표시될지(본문, 제목, 리스트, 수식, 표, 그림, 생략)를 한 번만 결정합니다.
+2.  **단일 문장 분리**: 표시되는 텍스트 아이템을 수집 단계에서 원본 언어에 맞는 분리기(`src.segmenter`)로 한 번만 분리하고,
+    원문 내 위치(span)와 함께 저장합니다.
+3.  **번역 대상 수집**: 실제로 화면에 표시되는 텍스트만 번역 대상으로 모읍니다.
+    페이지 헤더/푸터, 수식, 이미지가 없어 표시되지 않는 표·그림의 캡션은 번역하지 않습니다.
+4.  **HTML 생성 연동**: 같은 계획을 `generate_html_content`에 전달하여, 렌더링 단계는 문장을 다시 분리하지 않고
+    수집 단계에서 만든 문장 그대로 번역을 조회합니다.
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, List, Optional
+
+from docling_core.types.doc import DoclingDocument, TextItem, TableItem, PictureItem, DocItemLabel
+
+from src.segmenter import Segmenter, get_segmenter
+
+
+def is_formula_text(text: str) -> bool:
+    """
+    텍스트가 수식인지 판별합니다.
+    LaTeX 명령어 패턴이 포함되어 있으면 수식으로 판단합니다.
+    """
+    if not text:
+        return False
+
+    # LaTeX 수식 패턴 (일반적인 수학 기호/명령어)
+    latex_patterns = [
+        r'\\[a-zA-Z]+',      # \sin, \cos, \frac, \text 등
+        r'\^{',              # ^{ (위첨자)
+        r'_{',               # _{ (아래첨자)
+        r'\\left',           # \left
+        r'\\right',          # \right
+        r'\\frac',           # \frac
+        r'\\sum',            # \sum
+        r'\\int',            # \int
+        r'\\prod',           # \prod
+        r'&=',               # 정렬 기호
+    ]
+
+    for pattern in latex_patterns:
+        if re.search(pattern, text):
+            return True
+    return False
+
+
+class RenderKind(str, Enum):
+    """아이템의 렌더링 방식입니다."""
+    SKIP = "skip"            # 표시하지 않음 (빈 텍스트, 페이지 헤더/푸터, 이미지 없는 표/그림)
+    FORMULA = "formula"      # 번역 없이 MathJax 수식으로 표시
+    HEADING = "heading"      # 제목 (Title, Section Header)
+    LIST_ITEM = "list_item"  # 리스트 아이템
+    PARAGRAPH = "paragraph"  # 일반 본문
+    TABLE = "table"          # 표 이미지 + 번역 표
+    PICTURE = "picture"      # 그림 이미지 + 캡션
+
+
+@dataclass(frozen=True)
+class SentenceSpan:
+    """텍스트 아이템 안의 문장 하나입니다. `text`는 번역 맵의 키로 사용됩니다."""
+    start: int
+    end: int
+    text: str
+
+
+@dataclass
+class PlannedItem:
+    """렌더링 계획에 포함된 문서 아이템 하나입니다."""
+    item: Any
+    kind: RenderKind
+    # Docling 아이템 참조 (예: "#/texts/12")
+    ref: str = ""
+    label: Optional[DocItemLabel] = None
+    page_no: int = -1
+    # 텍스트 아이템의 문장 분리 결과 (수집 단계에서 한 번만 계산)
+    sentences: List[SentenceSpan] = field(default_factory=list)
+    # 표/그림 캡션 원문 (없으면 None)
+    caption: Optional[str] = None
+    # 표 데이터프레임 (번역 표 렌더링용, 추출 실패 시 None)
+    table_df: Any = None
+    # 표 셀/헤더 중 번역이 필요한 텍스트
+    table_texts: List[str] = field(default_factory=list)
+
+    @property
+    def texts(self) -> List[str]:
+        """이 아이템에서 번역이 필요한 텍스트 (문장 → 캡션 → 표 셀 순서)."""
+        texts = [s.text for s in self.sentences]
+        if self.caption:
+            texts.append(self.caption)
+        texts.extend(self.table_texts)
+        return texts
+
+
+@dataclass
+class RenderPlan:
+    """문서 전체의 렌더링 계획입니다."""
+    items: List[PlannedItem] = field(default_factory=list)
+
+    def translation_texts(self) -> List[str]:
+        """화면에 표시되어 번역이 필요한 모든 텍스트를 문서 순서대로 반환합니다 (중복 포함)."""
+        return [text for planned in self.items for text in planned.texts]
+
+
+def split_sentences(text: str, segmenter: Segmenter) -> List[SentenceSpan]:
+    """텍스트를 문장으로 분리하고 각 문장의 원문 내 위치를 함께 반환합니다."""
+    return [SentenceSpan(start=start, end=end, text=text[start:end]) for start, end in segmenter.spans(text)]
+
+
+def has_renderable_image(item: Any, doc: DoclingDocument) -> bool:
+    """
+    표/그림 아이템의 이미지를 얻을 수 있는지 확인합니다.
+    `item.get_image(doc)`와 같은 조건을 이미지를 잘라내지 않고 검사합니다.
+    """
+    if getattr(item, "image", None) is not None:
+        return True
+    if not item.prov:
+        return False
+    page = doc.pages.get(item.prov[0].page_no)
+    return page is not None and page.size is not None and page.image is not None
+
+
+def _plan_text_item(item: TextItem, segmenter: Segmenter) -> PlannedItem:
+    """텍스트 아이템의 렌더링 방식을 결정합니다 (`generate_html_content`의 분기 순서와 동일)."""
+    if not item.text or not item.text.strip():
+        return PlannedItem(item=item, kind=RenderKind.SKIP)
+    if is_formula_text(item.text):
+        return PlannedItem(item=item, kind=RenderKind.FORMULA)
+    if item.label in [DocItemLabel.TITLE, DocItemLabel.SECTION_HEADER]:
+        kind = RenderKind.HEADING
+    elif item.label == DocItemLabel.LIST_ITEM:
+        kind = RenderKind.LIST_ITEM
+    elif item.label in [DocItemLabel.PAGE_HEADER, DocItemLabel.PAGE_FOOTER]:
+        return PlannedItem(item=item, kind=RenderKind.SKIP)
+    else:
+        kind = RenderKind.PARAGRAPH
+    # 문장 단위로 분리 (HTML 생성 단계에서 그대로 재사용)
+    return PlannedItem(item=item, kind=kind, sentences=split_sentences(item.text, segmenter))
+
+
+def _plan_floating_item(item: Any, doc: DoclingDocument, file_name: str) -> PlannedItem:
+    """표/그림 아이템의 렌더링 방식을 결정하고 캡션과 표 셀 텍스트를 수집합니다."""
+    is_table = isinstance(item, TableItem)
+    if not has_renderable_image(item, doc):
+        # 이미지가 없으면 HTML에 표시되지 않으므로 캡션/셀도 번역하지 않음
+        return PlannedItem(item=item, kind=RenderKind.SKIP)
+
+    planned = PlannedItem(item=item, kind=RenderKind.TABLE if is_table else RenderKind.PICTURE)
+    planned.caption = item.caption_text(doc) or None
+
+    # 표 셀 텍스트 수집 (pandas DataFrame 활용)
+    if is_table:
+        try:
+            # [FIX] deprecated API 수정 (Issue #102)
+            # export_to_dataframe()에 doc 인자 추가
+            df = item.export_to_dataframe(doc)
+            planned.table_df = df
+            # 데이터프레임의 모든 셀 값을 문자열로 변환하여 수집
+            for text in df.values.flatten():
+                if isinstance(text, str) and text.strip():
+                    planned.table_texts.append(text)
+            # 컬럼 헤더도 수집
+            for col in df.columns:
+                if isinstance(col, str) and col.strip():
+                    planned.table_texts.append(col)
+        except Exception as e:
+            logging.warning(f"[{file_name}] 표 텍스트 추출 중 오류 발생(무시됨): {e}")
+    return planned
+
+
+def build_render_plan(doc: DoclingDocument, file_name: str = "", source_lang: str = "en") -> RenderPlan:
+    """
+    문서를 순회하며 아이템별 렌더링 계획을 수립합니다.
+
+    Args:
+        doc (DoclingDocument): 변환된 문서
+        file_name (str): 로그 출력용 파일 이름
+        source_lang (str): 원본 언어 코드 (문장 분리기 선택에 사용)
+
+    Returns:
+        RenderPlan: 아이템별 렌더링 방식과 번역 대상 텍스트
+    """
+    plan = RenderPlan()
+    segmenter = get_segmenter(source_lang)
+    for item, _ in doc.iterate_items():
+        if isinstance(item, TextItem):
+            planned = _plan_text_item(item, segmenter)
+        elif isinstance(item, (TableItem, PictureItem)):
+            planned = _plan_floating_item(item, doc, file_name)
+        else:
+            planned = PlannedItem(item=item, kind=RenderKind.SKIP)
+
+        planned.ref = getattr(item, "self_ref", "")
+        planned.label = getattr(item, "label", None)
+        if item.prov and item.prov[0].page_no:
+            planned.page_no = item.prov[0].page_no
+        plan.items.append(planned)
+    return plan
@@ -0,0 +1,237 @@
+"""
+src/segmenter.py
+================
+번역 단위를 만들기 위한 문장 분리기(Sentence Segmenter) 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **분리기 인터페이스**: 텍스트를 문장 위치(start, end) 목록으로 나누는 `Segmenter`를 정의하고, 이름으로 구현을 교체할 수 있습니다.
+2.  **언어별 Punkt 모델**: 원본 언어에 맞는 NLTK Punkt 모델을 사용하며, 언어별 분리기는 한 번만 생성하여 재사용합니다.
+3.  **CJK 규칙 기반 분리**: Punkt 모델이 없는 한국어/일본어/중국어는 종결 부호 규칙으로 가볍게 분리합니다.
+4.  **빠른 경로**: 문장 경계 후보(종결 부호 + 공백)가 없는 짧은 텍스트(표 셀, 캡션, 리스트 아이템 등)는 분리 과정을 건너뜁니다.
+
+환경 변수:
+- `SENTENCE_SEGMENTER`: `auto`(언어별 자동 선택), `punkt`, `rule` 중 하나 (기본값: auto)
+
+마이크로벤치마크:
+    python -m src.segmenter samples/
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import nltk
+
+from src.utils import ensure_nltk_resources
+
+# 문장 위치: 원문 내 [start, end) 구간
+Span = Tuple[int, int]
+
+# 언어 코드 → NLTK Punkt 모델 이름
+PUNKT_LANGUAGES: Dict[str, str] = {
+    "en": "english",
+    "de": "german",
+    "fr": "french",
+    "es": "spanish",
+    "it": "italian",
+    "pt": "portuguese",
+    "nl": "dutch",
+    "ru": "russian",
+    "pl": "polish",
+    "cs": "czech",
+    "da": "danish",
+    "sv": "swedish",
+    "no": "norwegian",
+    "fi": "finnish",
+    "et": "estonian",
+    "el": "greek",
+    "sl": "slovene",
+    "tr": "turkish",
+}
+
+# 규칙 기반 분리기를 사용하는 언어 (Punkt 모델 없음)
+CJK_LANGUAGES = frozenset({"ko", "ja", "zh"})
+
+# Punkt가 문장 경계로 판단할 수 있는 위치: 종결 부호 뒤에 공백+토큰 또는 특정 문장부호가 오는 경우
+# (Punkt의 period_context 정규식과 같은 조건이므로, 매칭이 없으면 분리 결과는 항상 텍스트 전체 1개)
+_BOUNDARY_CANDIDATE = re.compile(r"[.?!](?:[?!)\";}\]*:@'({\[]|\s+\S)")
+
+# CJK 종결 부호: 전각 부호는 공백 없이도 경계, 반각 부호는 CJK 문자 뒤 + 공백일 때만 경계 ("Fig. 1", "3.5" 등 보호)
+_CJK_SENTENCE_END = re.compile(
+    r"(?:(?P<full>[。！？]+)|(?<=[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7a3])[.!?]+)"
+    r"(?P<close>[」』）)\]\"'”’]*)"
+)
+
+
+class Segmenter(ABC):
+    """
+    문장 분리기의 기본 클래스입니다.
+    하위 클래스는 `_spans`를 구현하며, 반환 구간의 문자열은 번역 단위(번역 맵의 키)로 사용됩니다.
+    """
+
+    name: str = "base"
+
+    def spans(self, text: str) -> List[Span]:
+        """텍스트를 문장 구간 목록으로 분리합니다. 경계 후보가 없으면 분리 없이 텍스트 전체를 반환합니다."""
+        stripped = text.rstrip()
+        if not stripped:
+            return []
+        if not _BOUNDARY_CANDIDATE.search(stripped):
+            return [(0, len(stripped))]
+        return self._spans(text)
+
+    def split(self, text: str) -> List[str]:
+        """텍스트를 문장 문자열 목록으로 분리합니다."""
+        return [text[start:end] for start, end in self.spans(text)]
+
+    @abstractmethod
+    def _spans(self, text: str) -> List[Span]:
+        """텍스트를 문장 구간 목록으로 분리합니다 (경계 후보가 있는 텍스트만 전달됨)."""
+        pass
+
+
+class PunktSegmenter(Segmenter):
+    """NLTK Punkt 모델로 문장을 분리합니다. 결과는 `nltk.sent_tokenize(text, language)`와 같습니다."""
+
+    name = "punkt"
+
+    def __init__(self, language: str = "english"):
+        # NLTK 리소스 확인은 프로세스당 한 번만 수행됨
+        ensure_nltk_resources()
+        self.language = language
+        self._tokenizer = nltk.tokenize.PunktTokenizer(language)
+
+    def _spans(self, text: str) -> List[Span]:
+        return list(self._tokenizer.span_tokenize(text))
+
+
+class RuleSegmenter(Segmenter):
+    """
+    종결 부호 규칙으로 문장을 분리하는 가벼운 분리기입니다 (한국어/일본어/중국어용).
+    NLTK 모델을 로드하지 않습니다.
+    """
+
+    name = "rule"
+
+    def spans(self, text: str) -> List[Span]:
+        # 전각 종결 부호는 뒤에 공백이 없어도 경계이므로 Punkt용 빠른 경로 조건을 쓰지 않음
+        stripped = text.rstrip()
+        if not stripped:
+            return []
+        return self._spans(stripped)
+
+    def _spans(self, text: str) -> List[Span]:
+        spans: List[Span] = []
+        start = 0
+        for match in _CJK_SENTENCE_END.finditer(text):
+            end = match.end()
+            if end < len(text) and not text[end].isspace():
+                # 반각 부호는 공백이 있어야 경계, 닫는 따옴표 뒤에 조사 등이 이어지면 인용문 안의 종결 부호
+                if not match.group("full") or (match.group("close") and text[end] not in "「『（("):
+                    continue
+            spans.append((start, end))
+            start = end
+            while start < len(text) and text[start].isspace():
+                start += 1
+        if start < len(text):
+            spans.append((start, len(text)))
+        return [(s, e) for s, e in spans if e > s]
+
+
+# 분리기 이름 → 생성 함수 (언어 코드를 인자로 받음)
+SEGMENTERS: Dict[str, Callable[[str], Segmenter]] = {
+    "punkt": lambda lang: PunktSegmenter(PUNKT_LANGUAGES.get(lang, "english")),
+    "rule": lambda lang: RuleSegmenter(),
+}
+
+
+def register_segmenter(name: str, factory: Callable[[str], Segmenter]):
+    """새로운 분리기를 등록합니다. `SENTENCE_SEGMENTER=<name>`으로 선택할 수 있습니다."""
+    SEGMENTERS[name] = factory
+    _build_segmenter.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _build_segmenter(mode: str, lang: str) -> Segmenter:
+    """(모드, 언어)별 분리기를 생성합니다. 같은 조합은 캐시된 인스턴스를 재사용합니다."""
+    if mode == "auto":
+        mode = "rule" if lang in CJK_LANGUAGES else "punkt"
+    factory = SEGMENTERS.get(mode)
+    if factory is None:
+        logging.warning(f"알 수 없는 문장 분리기 '{mode}', punkt를 사용합니다.")
+        factory = SEGMENTERS["punkt"]
+    return factory(lang)
+
+
+def get_segmenter(lang: str = "en") -> Segmenter:
+    """
+    원본 언어에 맞는 문장 분리기를 반환합니다.
+
+    Args:
+        lang (str): 원본 언어 코드 (예: 'en', 'ko')
+
+    Returns:
+        Segmenter: 언어별로 캐시된 분리기 인스턴스
+    """
+    mode = os.getenv("SENTENCE_SEGMENTER", "auto").strip().lower() or "auto"
+    return _build_segmenter(mode, (lang or "en").lower())
+
+
+def _collect_texts(path: Path) -> List[str]:
+    """벤치마크용으로 문서의 텍스트 아이템을 모읍니다 (텍스트 파일은 줄 단위)."""
+    if path.suffix.lower() in {".txt", ".md"}:
+        return [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    from docling_core.types.doc import TextItem
+    from src.core import create_converter
+
+    doc = create_converter("fast").convert(str(path)).document
+    return [item.text for item, _ in doc.iterate_items() if isinstance(item, TextItem) and item.text.strip()]
+
+
+def _run_benchmark(paths: List[Path], lang: str, repeat: int = 5):
+    """문서의 텍스트 아이템에 대해 분리기별 소요 시간과 기준(nltk.sent_tokenize) 대비 차이를 출력합니다."""
+    texts: List[str] = []
+    for path in paths:
+        texts.extend(_collect_texts(path))
+    print(f"텍스트 아이템 {len(texts)}개, 총 {sum(len(t) for t in texts)}자 (언어: {lang}, 반복: {repeat})")
+
+    ensure_nltk_resources()
+    language = PUNKT_LANGUAGES.get(lang, "english")
+    baseline = [nltk.sent_tokenize(t, language) for t in texts]
+    candidates: Dict[str, Callable[[str], List[str]]] = {
+        "nltk.sent_tokenize": lambda t: nltk.sent_tokenize(t, language),
+        "punkt": SEGMENTERS["punkt"](lang).split,
+        "rule": SEGMENTERS["rule"](lang).split,
+    }
+
+    print(f"{'segmenter':<20} {'time(ms)':>10} {'sentences':>10} {'diff items':>10}")
+    for name, split in candidates.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results = [split(t) for t in texts]
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        diff = sum(1 for a, b in zip(results, baseline) if a != b)
+        print(f"{name:<20} {elapsed:>10.2f} {sum(len(r) for r in results):>10} {diff:>10}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="문장 분리기 마이크로벤치마크")
+    parser.add_argument("input", help="문서 파일 또는 디렉토리 (예: samples/)")
+    parser.add_argument("--lang", default="en", help="원본 언어 코드 (기본값: en)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (기본값: 5)")
+    args = parser.parse_args()
+
+    target = Path(args.input)
+    files = sorted(p for p in target.iterdir() if p.is_file()) if target.is_dir() else [target]
+    if not files:
+        sys.exit(f"입력 파일이 없습니다: {target}")
+    _run_benchmark(files, args.lang, args.repeat)
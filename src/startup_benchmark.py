@@ -0,0 +1,111 @@
+"""
+src/startup_benchmark.py
+========================
+CLI 시작 시간과 텍스트 파일 처리 시 로드되는 무거운 라이브러리를 측정하는 벤치마크 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **`--help` 시작 시간**: 새 프로세스에서 `python main.py --help`를 반복 실행한 시간(중앙값/최소)을 측정합니다.
+2.  **텍스트 파일 처리**: 새 프로세스에서 텍스트 파일 하나를 번역(네트워크 없이 원문을 그대로 돌려주는 엔진 사용)하는 전체 시간을 측정합니다.
+3.  **무거운 모듈 확인**: 각 실행이 끝난 시점에 Docling, PyTorch, NLTK, 엔진 라이브러리 등이 로드되었는지 출력합니다.
+    텍스트 파일 번역과 `--help`에서는 이 모듈들이 하나도 로드되지 않아야 합니다.
+
+실행:
+    python -m src.startup_benchmark README.md --repeat 5
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 시작 시간에 큰 영향을 주는 모듈 (텍스트 파일 처리와 `--help`에서는 로드되지 않아야 함)
+HEAVY_MODULES = (
+    "docling", "docling_core", "torch", "transformers", "ctranslate2", "llama_cpp",
+    "openai", "google.genai", "deepl", "nltk", "pandas",
+)
+
+# `--help` 실행 후 로드된 모듈 확인: main.py를 모듈로 불러와 argparse의 종료(SystemExit)를 잡음
+_HELP_SNIPPET = """
+import sys, json, runpy
+sys.argv = ["main.py", "--help"]
+try:
+    runpy.run_path("main.py", run_name="__main__")
+except SystemExit:
+    pass
+sys.stderr.write(json.dumps([m for m in {heavy!r} if m in sys.modules]) + "\\n")
+"""
+
+# 텍스트 파일 처리: 네트워크 없이 원문을 돌려주는 엔진을 등록하여 번역 API 지연을 제외
+_TEXT_SNIPPET = """
+import sys, json, logging
+logging.disable(logging.CRITICAL)
+from src.translation import register_engine
+from src.translation.base import BaseTranslator
+
+class EchoTranslator(BaseTranslator):
+    model_id = "echo"
+    def translate(self, text, src, dest):
+        return text
+
+register_engine("echo", EchoTranslator)
+from src.core import process_document
+result = process_document({path!r}, converter=None, source_lang="en", dest_lang="ko", engine="echo", max_workers=1)
+print(json.dumps({{"output_dir": str(result.get("output_dir", "")),
+                   "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _run(args: List[str], env: dict) -> Tuple[float, str, str]:
+    start = time.perf_counter()
+    proc = subprocess.run(args, cwd=ROOT, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"실행 실패 ({' '.join(args[:3])}): {proc.stderr.strip()[-500:]}")
+    return elapsed, proc.stdout, proc.stderr
+
+
+def _report(name: str, times: List[float], heavy: List[str]):
+    print(f"{name:<24} {statistics.median(times) * 1000:>10.0f} {min(times) * 1000:>10.0f}   "
+          f"{', '.join(heavy) if heavy else '-'}")
+
+
+def run_benchmark(text_file: str, repeat: int = 5):
+    """`--help`와 텍스트 파일 처리를 각각 repeat번 새 프로세스에서 실행하여 결과를 출력합니다."""
+    env = dict(os.environ, TRANSLATION_MEMORY="0")
+    python = sys.executable
+
+    print(f"{'scenario':<24} {'median(ms)':>10} {'min(ms)':>10}   heavy modules loaded")
+
+    times, heavy = [], []
+    for _ in range(repeat):
+        elapsed, _, stderr = _run([python, "-c", _HELP_SNIPPET.format(heavy=HEAVY_MODULES)], env)
+        times.append(elapsed)
+        heavy = json.loads(stderr.strip().splitlines()[-1])
+    _report("main.py --help", times, heavy)
+
+    times, heavy = [], []
+    path = str(Path(text_file).resolve())
+    for _ in range(repeat):
+        elapsed, stdout, _ = _run([python, "-c", _TEXT_SNIPPET.format(path=path, heavy=HEAVY_MODULES)], env)
+        times.append(elapsed)
+        result = json.loads(stdout.strip().splitlines()[-1])
+        heavy = result["heavy"]
+        if result["output_dir"]:
+            shutil.rmtree(ROOT / result["output_dir"], ignore_errors=True)
+    _report(f"text: {Path(text_file).name}", times, heavy)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CLI 시작 시간 벤치마크")
+    parser.add_argument("text_file", nargs="?", default="README.md", help="처리할 텍스트 파일 (기본값: README.md)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (기본값: 5)")
+    args = parser.parse_args()
+    run_benchmark(args.text_file, max(args.repeat, 1))
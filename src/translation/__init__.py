@@ -5,50 +5,74 @@ src/translation/__init__.py
 
 이 모듈은 다음 기능을 수행합니다:
 1.  **팩토리 함수 제공**: 엔진 이름(문자열)을 입력받아 해당 번역 엔진 인스턴스를 생성하는 `create_translator` 함수를 제공합니다.
-2.  **엔진 등록**: 지원되는 번역 엔진 클래스들을 매핑하여 관리합니다.
+2.  **엔진 등록**: 엔진 이름을 엔진 클래스의 위치("모듈:클래스")로 매핑하여 관리하며, `register_engine`으로 새 엔진을 추가할 수 있습니다.
+    엔진 모듈은 해당 엔진을 처음 사용할 때 임포트되므로, 사용하지 않는 엔진의 라이브러리
+    (`openai`, `google.genai`, `deepl`, `ctranslate2`, `transformers`, `llama_cpp` 등)는 로드되지 않습니다.
+3.  **로컬 엔진 구분**: 프로세스 풀로 복제할 수 있는 로컬 모델 엔진 목록(`LOCAL_ENGINES`)을 제공합니다.
 """
 
+import importlib
+from typing import Dict, Type, Union
+
 from .base import BaseTranslator
-from .engines.google import GoogleTranslator
-from .engines.deepl import DeepLTranslator
-from .engines.gemini import GeminiTranslator
-from .engines.openai import OpenAITranslator
-from .engines.qwen import QwenTranslator
-from .engines.lfm2 import LFM2Translator
-from .engines.lfm2_koen import LFM2KOENTranslator
-from .engines.nllb import NLLBTranslator
-from .engines.nllb_koen import NLLBKOENTranslator
-from .engines.yanolja import YanoljaTranslator
+
+# 엔진 이름 → 엔진 클래스 위치 ("모듈:클래스", 모듈은 이 패키지 기준 상대 경로도 가능) 또는 클래스
+ENGINES: Dict[str, Union[str, Type[BaseTranslator]]] = {
+    "google": ".engines.google:GoogleTranslator",
+    "deepl": ".engines.deepl:DeepLTranslator",
+    "gemini": ".engines.gemini:GeminiTranslator",
+    "openai": ".engines.openai:OpenAITranslator",
+    "qwen": ".engines.qwen:QwenTranslator",
+    "qwen-0.6b": ".engines.qwen:QwenTranslator",
+    "lfm2": ".engines.lfm2:LFM2Translator",
+    "lfm2-koen-mt": ".engines.lfm2_koen:LFM2KOENTranslator",
+    "nllb": ".engines.nllb:NLLBTranslator",
+    "nllb-koen": ".engines.nllb_koen:NLLBKOENTranslator",
+    "yanolja": ".engines.yanolja:YanoljaTranslator",
+}
+
+# 로컬 CPU에서 모델을 실행하는 엔진 (프로세스 풀 복제 대상)
+LOCAL_ENGINES = frozenset({"qwen", "qwen-0.6b", "lfm2", "lfm2-koen-mt", "nllb", "nllb-koen", "yanolja"})
+
+def register_engine(engine_name: str, target: Union[str, Type[BaseTranslator]]):
+    """
+    번역 엔진을 등록합니다.
+
+    Args:
+        engine_name (str): 엔진 이름
+        target: 엔진 클래스 또는 "모듈:클래스" 형식의 위치 (처음 사용할 때 임포트)
+    """
+    ENGINES[engine_name.lower()] = target
+
+def get_translator_class(engine_name: str) -> Type[BaseTranslator]:
+    """
+    엔진 이름에 해당하는 번역 엔진 클래스를 반환합니다 (인스턴스를 생성하지 않음).
+    엔진 모듈이 아직 로드되지 않았으면 이때 임포트합니다.
+
+    Raises:
+        ValueError: 지원하지 않는 엔진 이름일 경우 발생
+    """
+    key = engine_name.lower()
+    target = ENGINES.get(key)
+    if not target:
+        raise ValueError(f"Unsupported engine: {engine_name}")
+    if isinstance(target, str):
+        module_name, _, class_name = target.partition(":")
+        module = importlib.import_module(module_name, package=__name__)
+        target = ENGINES[key] = getattr(module, class_name)
+    return target
 
 def create_translator(engine_name: str) -> BaseTranslator:
     """
     지정된 이름의 번역 엔진 인스턴스를 생성하여 반환합니다.
-    
+
     Args:
         engine_name (str): 번역 엔진 이름 ('google', 'deepl', 'gemini', 'openai', 'qwen', 'yanolja')
-        
+
     Returns:
         BaseTranslator: 생성된 번역 엔진 인스턴스
-        
+
     Raises:
         ValueError: 지원하지 않는 엔진 이름일 경우 발생
     """
-    engines = {
-        "google": GoogleTranslator,
-        "deepl": DeepLTranslator,
-        "gemini": GeminiTranslator,
-        "openai": OpenAITranslator,
-        "qwen": QwenTranslator,
-        "qwen-0.6b": QwenTranslator,
-        "lfm2": LFM2Translator,
-        "lfm2-koen-mt": LFM2KOENTranslator,
-        "nllb": NLLBTranslator,
-        "nllb-koen": NLLBKOENTranslator,
-        "yanolja": YanoljaTranslator,
-    }
-    
-    engine_class = engines.get(engine_name.lower())
-    if not engine_class:
-        raise ValueError(f"Unsupported engine: {engine_name}")
-    
-    return engine_class()
+    return get_translator_class(engine_name)()
@@ -5,21 +5,71 @@ src/translation/base.py
 
 이 모듈은 다음 기능을 수행합니다:
 1.  **인터페이스 정의**: 모든 번역 엔진이 구현해야 할 `translate` 메서드를 정의합니다.
-2.  **일괄 번역**: `translate_batch` 메서드를 통해 다중 스레드(ThreadPoolExecutor) 기반의 병렬 번역을 기본 제공합니다.
+2.  **일괄 번역**: `translate_batch` 메서드를 통해 공유 스레드 풀(`executor.parallel_map`) 기반의 병렬 번역을 기본 제공합니다.
+3.  **폴백 기록**: 엔진이 자체 번역 대신 폴백(Google 번역, 원문 반환 등)을 사용한 문장을 `record_fallback`으로 기록하면,
+    번역 메모리는 그 문장을 이 엔진의 결과로 저장하지 않습니다 (다음 실행에서 다시 이 엔진으로 번역).
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Callable
-import concurrent.futures
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, List, Optional, Callable, Set
+
+from .executor import parallel_map
 
 # 진행률 콜백 타입: (비율 0.0~1.0, 메시지)
 ProgressCallback = Callable[[float, str], None]
 
+# 현재 번역 호출에서 폴백으로 처리된 원문 집합 (parallel_map이 풀 스레드에 컨텍스트를 전달)
+_fallbacks: ContextVar[Optional[Set[str]]] = ContextVar("translation_fallbacks", default=None)
+
+
+def record_fallback(*texts: str):
+    """엔진 자체 번역이 아닌 폴백 결과를 돌려준 원문을 기록합니다 (`track_fallbacks` 블록 밖이면 무시)."""
+    fallbacks = _fallbacks.get()
+    if fallbacks is not None:
+        fallbacks.update(texts)
+
+
+@contextmanager
+def track_fallbacks() -> Iterator[Set[str]]:
+    """블록 안의 번역 호출에서 `record_fallback`으로 기록된 원문 집합을 제공합니다."""
+    fallbacks: Set[str] = set()
+    token = _fallbacks.set(fallbacks)
+    try:
+        yield fallbacks
+    finally:
+        _fallbacks.reset(token)
+
 class BaseTranslator(ABC):
     """
     모든 번역 엔진이 상속받아야 하는 추상 기본 클래스입니다.
     """
 
+    # 번역 메모리 캐시 키에 사용되는 모델 식별자 (모델이 바뀌면 캐시가 분리됨)
+    model_id: str = ""
+
+    # 하나의 인스턴스를 여러 작업(스레드)이 동시에 사용해도 안전한지 여부
+    # llama.cpp 등 스레드 안전하지 않은 로컬 모델은 False로 설정하여 레지스트리에서 직렬화합니다.
+    thread_safe: bool = True
+
+    def memory_footprint(self) -> int:
+        """
+        엔진이 상주할 때 차지하는 대략적인 메모리(바이트)를 반환합니다.
+        로컬 모델은 `model_path`(파일 또는 디렉토리)의 크기로 추정하며, API 엔진은 0을 반환합니다.
+        """
+        model_path = getattr(self, "model_path", None)
+        if not model_path:
+            return 0
+        path = Path(model_path)
+        try:
+            if path.is_dir():
+                return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+            return path.stat().st_size
+        except OSError:
+            return 0
+
     @abstractmethod
     def translate(self, text: str, src: str, dest: str) -> str:
         """
@@ -44,7 +94,7 @@ class BaseTranslator(ABC):
         progress_cb: Optional[ProgressCallback] = None
     ) -> List[str]:
         """
-        여러 문장을 일괄 번역합니다. 기본적으로 ThreadPoolExecutor를 사용하여 병렬 처리합니다.
+        여러 문장을 일괄 번역합니다. 기본적으로 공유 스레드 풀에서 max_workers개씩 병렬 처리합니다.
 
         Args:
             sentences (List[str]): 번역할 문장 리스트
@@ -64,25 +114,20 @@ class BaseTranslator(ABC):
             # 병렬 처리 (as_completed 사용으로 실시간 진행률 업데이트)
             results_map = {} # {index: translated_text}
             
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Future 객체와 원본 인덱스 매핑
-                future_to_idx = {
-                    executor.submit(self.translate, s, src, dest): i 
-                    for i, s in enumerate(sentences)
-                }
+            completed_count = 0
+            for idx, future in parallel_map(
+                lambda s: self.translate(s, src, dest), sentences, max_workers, rate_key=type(self).__name__
+            ):
+                try:
+                    translated_text = future.result()
+                    results_map[idx] = translated_text if translated_text is not None else ""
+                except Exception as e:
+                    results_map[idx] = "" # 에러 시 빈 문자열
+                    record_fallback(sentences[idx])
                 
-                completed_count = 0
-                for future in concurrent.futures.as_completed(future_to_idx):
-                    idx = future_to_idx[future]
-                    try:
-                        translated_text = future.result()
-                        results_map[idx] = translated_text if translated_text is not None else ""
-                    except Exception as e:
-                        results_map[idx] = "" # 에러 시 빈 문자열
-                    
-                    completed_count += 1
-                    if progress_cb:
-                        progress_cb(completed_count / total, f"({completed_count}/{total})")
+                completed_count += 1
+                if progress_cb:
+                    progress_cb(completed_count / total, f"({completed_count}/{total})")
             
             # 인덱스 순서대로 결과 리스트 재구성
             return [results_map[i] for i in range(total)]
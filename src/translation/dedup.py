@@ -0,0 +1,129 @@
+"""
+src/translation/dedup.py
+========================
+여러 파일을 처리하는 배치에서 같은 문장을 한 번만 번역하도록 하는 파일 간 문장 중복 제거 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **완료 결과 공유**: 배치 안에서 이미 번역한 문장은 다른 파일에서 다시 요청하지 않습니다 (번역 메모리가 꺼져 있어도 적용).
+2.  **진행 중 요청 공유**: 다른 파일이 번역 중인 문장은 새로 요청하지 않고 그 결과를 기다립니다.
+    각 호출은 자신이 맡은 문장을 모두 번역한 뒤에만 다른 호출의 결과를 기다리므로 서로 기다리며 멈추지 않습니다.
+3.  **배치 범위**: `batch_dedup()` 블록 안에서만 동작하며, 블록이 끝나면 보관한 번역 결과를 해제합니다.
+
+키는 (엔진, 모델 ID, 원본 언어, 대상 언어, 원문)입니다.
+"""
+
+import logging
+import threading
+import concurrent.futures
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.benchmark import global_benchmark as bench
+
+_Key = Tuple[str, str, str, str, str]
+
+_active: Optional["SentenceDeduplicator"] = None
+_active_lock = threading.Lock()
+
+
+class SentenceDeduplicator:
+    """배치 안의 모든 파일이 공유하는 문장 번역 결과/진행 중 요청 표입니다."""
+
+    def __init__(self):
+        self._entries: Dict[_Key, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def translate(
+        self,
+        key_prefix: Tuple[str, str, str, str],
+        sentences: List[str],
+        translate_fn: Callable[[List[str]], List[str]],
+    ) -> List[str]:
+        """
+        다른 파일이 이미 번역했거나 번역 중인 문장을 제외하고 translate_fn으로 번역합니다.
+
+        Args:
+            key_prefix: (엔진, 모델 ID, 원본 언어, 대상 언어)
+            sentences: 번역할 문장 목록
+            translate_fn: 문장 목록을 받아 같은 순서의 번역 목록을 반환하는 함수
+
+        Returns:
+            List[str]: sentences와 같은 순서의 번역 결과
+        """
+        owned: Dict[str, concurrent.futures.Future] = {}
+        waiting: Dict[str, concurrent.futures.Future] = {}
+        with self._lock:
+            for text in dict.fromkeys(sentences):
+                key = key_prefix + (text,)
+                future = self._entries.get(key)
+                if future is None:
+                    future = self._entries[key] = concurrent.futures.Future()
+                    owned[text] = future
+                else:
+                    waiting[text] = future
+            self.hits += len(waiting)
+
+        if waiting:
+            bench.add_stat("Batch Dedup Hits", 0.0, count=len(waiting))
+
+        # 1. 이 호출이 맡은 문장 번역 (실패하면 기다리던 다른 호출이 직접 번역하도록 항목 제거)
+        results: Dict[str, str] = {}
+        owned_texts = list(owned)
+        try:
+            translated = translate_fn(owned_texts) if owned_texts else []
+        except BaseException as e:
+            with self._lock:
+                for text, future in owned.items():
+                    self._entries.pop(key_prefix + (text,), None)
+                    future.set_exception(e)
+            raise
+        for text, value in zip(owned_texts, translated):
+            results[text] = value
+            owned[text].set_result(value)
+        missing = [text for text in owned_texts if text not in results]
+        if missing:
+            with self._lock:
+                for text in missing:
+                    self._entries.pop(key_prefix + (text,), None)
+                    owned[text].set_exception(RuntimeError("translation result missing"))
+            results.update(zip(missing, [""] * len(missing)))
+
+        # 2. 다른 호출이 맡은 문장의 결과 대기 (그쪽이 실패했으면 직접 번역)
+        retry = []
+        for text, future in waiting.items():
+            try:
+                results[text] = future.result()
+            except Exception:
+                retry.append(text)
+        if retry:
+            logging.warning(f"[Dedup] 다른 파일의 번역 실패로 {len(retry)}개 문장을 직접 번역합니다.")
+            results.update(zip(retry, translate_fn(retry)))
+
+        return [results[text] for text in sentences]
+
+
+def get_active_dedup() -> Optional[SentenceDeduplicator]:
+    """`batch_dedup()` 블록 안이면 현재 배치의 중복 제거기를, 아니면 None을 반환합니다."""
+    return _active
+
+
+@contextmanager
+def batch_dedup() -> Iterator[SentenceDeduplicator]:
+    """
+    블록 안에서 실행되는 모든 번역(`translate_with_memory`)이 문장 결과를 공유하도록 합니다.
+
+    사용 예시:
+        with batch_dedup() as dedup:
+            scheduler.run(files, ...)
+        print(dedup.hits)
+    """
+    global _active
+    with _active_lock:
+        previous = _active
+        dedup = _active = SentenceDeduplicator()
+    try:
+        yield dedup
+    finally:
+        with _active_lock:
+            _active = previous
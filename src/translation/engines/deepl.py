@@ -6,19 +6,33 @@ DeepL 번역 엔진(공식 API) 구현체입니다.
 이 모듈은 다음 기능을 수행합니다:
 1.  **DeepL 번역**: `deepl` 공식 라이브러리를 사용하여 고품질 번역을 수행합니다.
 2.  **API 키 관리**: `DEEPL_API_KEY` 환경 변수를 사용하여 인증합니다.
+3.  **리스트 일괄 번역**: 요청당 텍스트 개수/크기 제한에 맞춰 여러 문장을 하나의 요청으로 묶어 전송합니다.
 """
 
 import os
+import time
 import logging
+from typing import List, Optional
 import deepl
-from ..base import BaseTranslator
+from ..base import BaseTranslator, ProgressCallback, record_fallback
+from ..executor import parallel_map, report_throttle, retry_after_from_error
 from ..utils import to_deepl_lang
 
+# DeepL API 요청 제한: 요청당 최대 50개 텍스트, 요청 본문 최대 128KiB
+# (인코딩 오버헤드를 고려하여 원문 UTF-8 기준으로 여유 있게 설정)
+MAX_TEXTS_PER_REQUEST = 50
+MAX_REQUEST_BYTES = 64 * 1024
+
+# 요청 제한(429)을 받은 청크의 최대 시도 횟수 (청크 전체를 Retry-After만큼 기다렸다가 다시 요청)
+MAX_THROTTLE_ATTEMPTS = 3
+
 class DeepLTranslator(BaseTranslator):
     """
     DeepL 공식 API를 사용하는 번역 엔진 구현체입니다.
     DEEPL_API_KEY 환경 변수가 필요합니다.
     """
+
+    model_id = "deepl-api"
     
     def __init__(self):
         """
@@ -41,6 +55,7 @@ class DeepLTranslator(BaseTranslator):
         
         if not self.client:
             logging.error("DeepL API Key missing or client init failed.")
+            record_fallback(text)
             return text
 
         try:
@@ -56,4 +71,99 @@ class DeepLTranslator(BaseTranslator):
             return result.text
         except Exception as e:
             logging.error(f"DeepL Translation Error: {e}")
+            record_fallback(text)
             return text
+
+    def _chunk_indices(self, texts: List[str]) -> List[List[int]]:
+        """
+        요청당 텍스트 개수(MAX_TEXTS_PER_REQUEST)와 크기(MAX_REQUEST_BYTES) 제한에 맞춰 인덱스를 묶습니다.
+        """
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        current_bytes = 0
+        for idx, text in enumerate(texts):
+            size = len(text.encode("utf-8"))
+            if current and (len(current) >= MAX_TEXTS_PER_REQUEST or current_bytes + size > MAX_REQUEST_BYTES):
+                chunks.append(current)
+                current, current_bytes = [], 0
+            current.append(idx)
+            current_bytes += size
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def translate_batch(
+        self,
+        sentences: List[str],
+        src: str,
+        dest: str,
+        max_workers: int = 1,
+        progress_cb: Optional[ProgressCallback] = None
+    ) -> List[str]:
+        """
+        DeepL 클라이언트의 리스트 입력을 사용하여 여러 문장을 요청 하나로 번역합니다.
+        청크(요청)들은 max_workers 개에서 시작하는 적응형 동시성 한도 안에서 동시에 전송되며, 결과는 입력 순서대로 반환됩니다.
+        요청 제한(429)을 받은 청크는 Retry-After만큼 기다렸다가 청크 전체를 최대 MAX_THROTTLE_ATTEMPTS회까지 다시 요청하고,
+        그래도 실패하면 원문으로 폴백합니다. 그 밖의 오류로 실패한 청크는 문장 단위 번역(translate)으로 재시도합니다.
+        """
+        total = len(sentences)
+        if total == 0:
+            return []
+
+        if not self.client:
+            logging.error("DeepL API Key missing or client init failed.")
+            record_fallback(*sentences)
+            return [s if s and s.strip() else "" for s in sentences]
+
+        source_lang = to_deepl_lang(src)
+        target_lang = to_deepl_lang(dest) or "EN-US" # 기본값 영어(미국)
+
+        # 빈 문장은 요청하지 않음 (translate와 동일하게 빈 문자열 반환)
+        results = [""] * total
+        targets = [i for i, s in enumerate(sentences) if s and s.strip()]
+        chunks = [[targets[j] for j in chunk] for chunk in self._chunk_indices([sentences[i] for i in targets])]
+
+        def _translate_chunk(indices: List[int]) -> List[str]:
+            texts = [sentences[i] for i in indices]
+            for attempt in range(MAX_THROTTLE_ATTEMPTS):
+                try:
+                    translated = self.client.translate_text(
+                        texts,
+                        source_lang=source_lang,
+                        target_lang=target_lang,
+                    )
+                    return [r.text for r in translated]
+                except deepl.TooManyRequestsException as e:
+                    # 라이브러리의 자체 재시도 후에도 요청 제한: 동시 요청 수를 줄이고, 문장 단위로 쪼개지 않고 청크 전체를 다시 요청
+                    retry_after = retry_after_from_error(e)
+                    report_throttle(type(self).__name__, retry_after)
+                    if attempt < MAX_THROTTLE_ATTEMPTS - 1:
+                        logging.warning(f"DeepL rate limited (Attempt {attempt+1}/{MAX_THROTTLE_ATTEMPTS}): {e}")
+                        time.sleep(min(max(2 ** attempt, retry_after or 0), 30)) # 지수 백오프 (최대 30초)
+                        continue
+                    logging.error(f"DeepL Batch Translation Error (Rate limited, Fallback to source): {e}")
+                    record_fallback(*texts)
+                    return texts
+                except Exception as e:
+                    # 특정 문장(크기 초과 등) 때문에 실패했을 수 있으므로 문장 단위로 재시도
+                    logging.error(f"DeepL Batch Translation Error (Retry per sentence): {e}")
+                    return [self.translate(t, src, dest) for t in texts]
+
+        completed = total - len(targets)
+        for chunk_idx, future in parallel_map(
+            _translate_chunk, chunks, max_workers, rate_key=type(self).__name__, adaptive=True
+        ):
+            chunk = chunks[chunk_idx]
+            try:
+                for idx, text in zip(chunk, future.result()):
+                    results[idx] = text
+            except Exception as e:
+                logging.error(f"DeepL Batch Translation Error: {e}")
+                for idx in chunk:
+                    results[idx] = sentences[idx]
+                record_fallback(*(sentences[idx] for idx in chunk))
+            completed += len(chunk)
+            if progress_cb:
+                progress_cb(completed / total, f"({completed}/{total})")
+
+        return results
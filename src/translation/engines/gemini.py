@@ -7,26 +7,37 @@ Google Gemini 번역 엔진 구현체입니다.
 1.  **Gemini 번역**: `google-genai` 라이브러리를 사용하여 LLM 기반 번역을 수행합니다.
 2.  **프롬프트 엔지니어링**: 번역 품질을 높이고 형식을 유지하기 위한 프롬프트를 구성합니다.
 3.  **재시도 및 폴백**: API 호출 실패 시 재시도하거나 Google 번역(무료)으로 폴백합니다.
+4.  **묶음 번역**: 여러 문장을 JSON 객체 하나로 묶어 요청 수를 줄입니다.
 """
 
 import os
-import time
 import logging
-from ..base import BaseTranslator
+from typing import List, Optional
+from ..base import BaseTranslator, ProgressCallback, record_fallback
 from .google import GoogleTranslator
 from ..utils import LANGUAGE_NAMES
+from ..packing import translate_packed, build_packed_prompt, complete_with_retry
 
 try:
     from google import genai
 except ImportError:
     genai = None
 
+# 재시도 가능한 API 오류 (요청 제한, 과부하)
+_RETRY_MARKERS = ("503", "429", "overloaded", "RESOURCE_EXHAUSTED")
+
 class GeminiTranslator(BaseTranslator):
     """
     Google Gemini API를 사용하는 번역 엔진 구현체입니다.
     GEMINI_API_KEY 또는 GOOGLE_API_KEY 환경 변수가 필요합니다.
     실패 시 GoogleTranslator(무료)로 폴백합니다.
     """
+
+    model_id = "gemini-2.5-flash"
+
+    # 묶음 번역(packing) 설정: 요청 하나에 담을 원문 추정 토큰 수와 최대 문장 수
+    pack_max_tokens = 1500
+    pack_max_items = 50
     
     def __init__(self):
         """
@@ -42,6 +53,26 @@ class GeminiTranslator(BaseTranslator):
         
         self.fallback_engine = GoogleTranslator()
 
+    def _complete(self, prompt: str, json_mode: bool = False) -> str:
+        """
+        Gemini 모델(gemini-2.5-flash)에 프롬프트를 보내고 응답 텍스트를 반환합니다.
+        429/503 등 재시도 가능한 에러는 `complete_with_retry`가 재시도하며, 최종 실패 시 예외를 발생시킵니다.
+        """
+        kwargs = {}
+        if json_mode:
+            # JSON 모드: 묶음 번역 응답이 항상 JSON 객체가 되도록 강제
+            kwargs["config"] = {"response_mime_type": "application/json"}
+
+        def _request():
+            resp = self.client.models.generate_content(
+                model=self.model_id,
+                contents=prompt,
+                **kwargs
+            )
+            return getattr(resp, "text", None)
+
+        return complete_with_retry(_request, "Gemini", type(self).__name__, _RETRY_MARKERS)
+
     def translate(self, text: str, src: str, dest: str) -> str:
         """
         Gemini 모델(gemini-2.5-flash)을 사용하여 번역을 수행합니다.
@@ -51,46 +82,60 @@ class GeminiTranslator(BaseTranslator):
             return ""
 
         if not self.client:
+            record_fallback(text)
             return self.fallback_engine.translate(text, src, dest)
 
         src_name = LANGUAGE_NAMES.get(src, src)
         dest_name = LANGUAGE_NAMES.get(dest, dest)
 
-        # 최대 3회 재시도
-        for attempt in range(3):
-            try:
-                prompt = (
-                    f"Translate the text from {src_name} to {dest_name}.\n"
-                    f"Maintain technical terms and formatting.\n"
-                    f"Do not include the XML tags in your response.\n"
-                    f"Return only the translation.\n\n"
-                    f"<text>\n{text}\n</text>"
-                )
-
-                resp = self.client.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=prompt,
-                )
-
-                if hasattr(resp, "text") and resp.text:
-                    result = resp.text.strip()
-                    # XML 태그 제거 (프롬프트 지시사항 보완)
-                    result = result.replace("<text>", "").replace("</text>", "").strip()
-                    return result
-                
-                raise RuntimeError("Empty response from Gemini")
+        prompt = (
+            f"Translate the text from {src_name} to {dest_name}.\n"
+            f"Maintain technical terms and formatting.\n"
+            f"Do not include the XML tags in your response.\n"
+            f"Return only the translation.\n\n"
+            f"<text>\n{text}\n</text>"
+        )
 
-            except Exception as e:
-                msg = str(e)
-                # 재시도 가능한 에러인지 확인
-                retriable = "503" in msg or "429" in msg or "overloaded" in msg.lower() or "RESOURCE_EXHAUSTED" in msg
-                
-                if retriable and attempt < 2:
-                    time.sleep(2 ** attempt) # 지수 백오프
-                    continue
-                
-                logging.error(f"Gemini Error (Fallback to Google): {e}")
-                break
+        try:
+            result = self._complete(prompt)
+            # XML 태그 제거 (프롬프트 지시사항 보완)
+            return result.replace("<text>", "").replace("</text>", "").strip()
+        except Exception as e:
+            logging.error(f"Gemini Error (Fallback to Google): {e}")
         
         # 모든 시도 실패 시 폴백 엔진 사용
+        record_fallback(text)
         return self.fallback_engine.translate(text, src, dest)
+
+    def translate_batch(
+        self,
+        sentences: List[str],
+        src: str,
+        dest: str,
+        max_workers: int = 1,
+        progress_cb: Optional[ProgressCallback] = None
+    ) -> List[str]:
+        """
+        여러 문장을 토큰 예산 안에서 하나의 요청으로 묶어 번역합니다.
+        응답에서 누락된 문장만 다시 나누어 재요청하며, API 요청이 실패한 묶음은 Google 번역으로 폴백합니다.
+        """
+        if not self.client:
+            record_fallback(*sentences)
+            return self.fallback_engine.translate_batch(sentences, src, dest, max_workers, progress_cb)
+
+        src_name = LANGUAGE_NAMES.get(src, src)
+        dest_name = LANGUAGE_NAMES.get(dest, dest)
+
+        return translate_packed(
+            sentences,
+            build_prompt=lambda texts: build_packed_prompt(texts, src_name, dest_name),
+            complete_fn=lambda prompt: self._complete(prompt, json_mode=True),
+            fallback_fn=lambda text: self.fallback_engine.translate(text, src, dest),
+            single_fn=lambda text: self.translate(text, src, dest),
+            max_workers=max_workers,
+            progress_cb=progress_cb,
+            max_tokens=self.pack_max_tokens,
+            max_items=self.pack_max_items,
+            rate_key=type(self).__name__,
+            adaptive=True,
+        )
@@ -6,17 +6,54 @@ Google 번역 엔진(무료 API) 구현체입니다.
 이 모듈은 다음 기능을 수행합니다:
 1.  **Google 번역**: `deep-translator` 라이브러리를 사용하여 텍스트를 번역합니다.
 2.  **폴백**: 다른 유료 엔진(Gemini, OpenAI 등)의 폴백(Fallback) 엔진으로도 사용됩니다.
+3.  **묶음 번역**: 표 셀, 캡션처럼 짧은 문장들을 구분자로 이어 붙여 한 번의 요청으로 번역합니다.
 """
 
+import re
+import logging
+import threading
+from typing import List, Optional
+
 from deep_translator import GoogleTranslator as DeepGoogleTranslator
-from ..base import BaseTranslator
+from ..base import BaseTranslator, ProgressCallback, record_fallback
+from ..executor import parallel_map
+
+# 묶음 번역 설정
+# - Google 무료 API의 요청당 최대 글자 수는 5000자이므로 구분자를 포함해 여유 있게 제한
+# - 긴 문장은 묶지 않고 단독으로 요청 (번역 품질 및 구분자 유실 위험 고려)
+PACK_MAX_CHARS = 4500
+PACK_ITEM_MAX_CHARS = 300
+PACK_DELIMITER = "\n|||\n"
+_PACK_SPLIT_PATTERN = re.compile(r"\s*\|\s*\|\s*\|\s*")
+
 
 class GoogleTranslator(BaseTranslator):
     """
     deep-translator 라이브러리를 사용한 Google 번역 엔진 구현체입니다.
     무료 API를 사용하므로 사용량 제한이 있을 수 있습니다.
     """
-    
+
+    model_id = "google-web"
+
+    def __init__(self):
+        """
+        스레드별 deep-translator 클라이언트 캐시를 초기화합니다.
+        """
+        self._local = threading.local()
+
+    def _get_client(self, src: str, dest: str) -> DeepGoogleTranslator:
+        """
+        현재 스레드에서 재사용할 deep-translator 클라이언트를 반환합니다.
+        문장마다 클라이언트를 새로 만들고 언어 코드를 검증하는 비용을 없앱니다.
+        """
+        clients = getattr(self._local, "clients", None)
+        if clients is None:
+            clients = self._local.clients = {}
+        client = clients.get((src, dest))
+        if client is None:
+            client = clients[(src, dest)] = DeepGoogleTranslator(source=src, target=dest)
+        return client
+
     def translate(self, text: str, src: str, dest: str) -> str:
         """
         Google 번역 API를 호출하여 텍스트를 번역합니다.
@@ -24,8 +61,92 @@ class GoogleTranslator(BaseTranslator):
         if not text or not text.strip():
             return ""
         try:
-            return DeepGoogleTranslator(source=src, target=dest).translate(text)
+            return self._get_client(src, dest).translate(text)
         except Exception:
             # 실패 시 원문 반환 (또는 로깅 후 빈 문자열)
-            # 여기서는 사용자 경험을 위해 원문을 반환하는 정책을 따름
+            # 여기서는 사용자 경험을 위해 원문을 반환하는 정책을 따름 (번역 메모리에는 저장하지 않음)
+            record_fallback(text)
             return text
+
+    def _build_units(self, sentences: List[str]) -> List[List[int]]:
+        """
+        번역 요청 단위를 구성합니다.
+        짧은 문장은 PACK_MAX_CHARS 이내로 묶고, 긴 문장이나 구분자와 충돌할 수 있는 문장은 단독 요청으로 둡니다.
+        """
+        units: List[List[int]] = []
+        current: List[int] = []
+        current_chars = 0
+        for idx, text in enumerate(sentences):
+            if not text or not text.strip():
+                continue
+            packable = len(text) <= PACK_ITEM_MAX_CHARS and "\n" not in text and "|" not in text
+            if not packable:
+                units.append([idx])
+                continue
+            size = len(text) + len(PACK_DELIMITER)
+            if current and current_chars + size > PACK_MAX_CHARS:
+                units.append(current)
+                current, current_chars = [], 0
+            current.append(idx)
+            current_chars += size
+        if current:
+            units.append(current)
+        return units
+
+    def _translate_unit(self, texts: List[str], src: str, dest: str) -> List[str]:
+        """
+        요청 단위 하나를 번역합니다.
+        묶음 결과의 구분자가 유실되어 문장 수가 맞지 않으면 문장 단위 번역으로 폴백합니다.
+        """
+        if len(texts) == 1:
+            return [self.translate(texts[0], src, dest)]
+        try:
+            joined = self._get_client(src, dest).translate(PACK_DELIMITER.join(texts))
+            parts = [p.strip() for p in _PACK_SPLIT_PATTERN.split(joined or "")]
+            if len(parts) == len(texts) and all(parts):
+                return parts
+            logging.warning(
+                f"Google packed translation delimiter mismatch ({len(parts)}/{len(texts)}). "
+                f"Falling back to per-sentence requests."
+            )
+        except Exception as e:
+            logging.warning(f"Google packed translation failed (Fallback per sentence): {e}")
+        return [self.translate(t, src, dest) for t in texts]
+
+    def translate_batch(
+        self,
+        sentences: List[str],
+        src: str,
+        dest: str,
+        max_workers: int = 1,
+        progress_cb: Optional[ProgressCallback] = None
+    ) -> List[str]:
+        """
+        짧은 문장들을 묶어서 요청 수를 줄인 일괄 번역을 수행합니다.
+        요청 단위들은 max_workers 개의 스레드에서 병렬로 처리되며, 각 스레드는 클라이언트를 재사용합니다.
+        """
+        total = len(sentences)
+        if total == 0:
+            return []
+
+        results = [""] * total
+        units = self._build_units(sentences)
+        completed = total - sum(len(u) for u in units)
+
+        for unit_idx, future in parallel_map(
+            lambda unit: self._translate_unit([sentences[i] for i in unit], src, dest),
+            units, max_workers, rate_key=type(self).__name__,
+        ):
+            unit = units[unit_idx]
+            try:
+                for idx, text in zip(unit, future.result()):
+                    results[idx] = text if text is not None else ""
+            except Exception:
+                for idx in unit:
+                    results[idx] = sentences[idx]
+                record_fallback(*(sentences[idx] for idx in unit))
+            completed += len(unit)
+            if progress_cb:
+                progress_cb(completed / total, f"({completed}/{total})")
+
+        return results
@@ -6,19 +6,25 @@ src/translation/engines/lfm2_koen.py
 이 모듈은 다음 기능을 수행합니다:
 1.  **모델 로드**: `huggingface_hub`를 통해 GGUF 모델을 다운로드하고 `llama_cpp`로 로드합니다.
 2.  **번역 수행**: 한국어 ↔ 영어 양방향 번역을 위한 간소화된 프롬프트를 사용합니다.
+3.  **접두사 캐시**: 시스템 프롬프트의 KV 상태를 대상 언어별로 저장해 두고 문장마다 복원합니다.
+4.  **연속 배치 번역**: `LlamaCppTranslator.translate_batch`를 통해 여러 문장을 하나의 컨텍스트에서 동시에 디코딩합니다.
 
 사용 모델: gyung/lfm2-1.2b-koen-mt-v8-rl-10k-merged-GGUF (Q5_K_M, 843MB)
 """
 
+from typing import Tuple
+
 try:
     from llama_cpp import Llama
 except ImportError:
     Llama = None
 
-from ..base import BaseTranslator
+from ..llama_base import LlamaCppTranslator
+from ..llama_cache import PromptPrefixCache
+from ..utils import get_num_threads, download_model_file
 
 
-class LFM2KOENTranslator(BaseTranslator):
+class LFM2KOENTranslator(LlamaCppTranslator):
     """
     한국어-영어 전용 번역기입니다.
     gyung/lfm2-1.2b-koen-mt-v8-rl-10k-merged-GGUF 모델을 사용합니다.
@@ -28,6 +34,17 @@ class LFM2KOENTranslator(BaseTranslator):
     - 영어 (en) → 한국어 (ko)
     """
 
+    model_id = "gyung/lfm2-1.2b-koen-mt-v8-rl-10k-merged-GGUF:Q5_K_M"
+
+    # 생성 파라미터
+    generation_params = {
+        "max_tokens": 512,
+        "stop": ["<|im_end|>"],  # 턴 종료 시 중단
+        "temperature": 0.3,  # 약간의 창의성 허용
+        "min_p": 0.15,  # Top-p 대신 min_p 사용 (모델 권장)
+        "repeat_penalty": 1.05,  # 반복 생성 방지
+    }
+
     # 지원 언어 (한국어/영어만)
     SUPPORTED_LANGUAGES = {'ko', 'en'}
 
@@ -43,7 +60,7 @@ class LFM2KOENTranslator(BaseTranslator):
             )
         
         try:
-            from huggingface_hub import hf_hub_download
+            import huggingface_hub  # noqa: F401 (설치 확인)
         except ImportError:
             raise ImportError(
                 "huggingface_hub가 설치되지 않았습니다. "
@@ -55,14 +72,13 @@ class LFM2KOENTranslator(BaseTranslator):
         # 모델 다운로드 (캐시된 경우 다운로드 생략)
         # repo_id: gyung/lfm2-1.2b-koen-mt-v8-rl-10k-merged-GGUF
         # filename: lfm2-1.2b-koen-mt-v8-rl-10k-merged-Q5_K_M.gguf
-        self.model_path = hf_hub_download(
+        self.model_path = download_model_file(
             repo_id="gyung/lfm2-1.2b-koen-mt-v8-rl-10k-merged-GGUF",
             filename="lfm2-1.2b-koen-mt-v8-rl-10k-merged-Q5_K_M.gguf"
         )
         
-        # CPU 물리 코어 수 계산 (하이퍼스레딩 제외 시 최적 성능)
-        import os
-        physical_cores = os.cpu_count() // 2 if os.cpu_count() else 4
+        # CPU 물리 코어 수 계산 (하이퍼스레딩 제외 시 최적 성능, 프로세스 풀 복제본은 할당된 코어 수)
+        physical_cores = get_num_threads()
         
         # Llama 인스턴스 생성
         # n_ctx: 4096 (문맥 유지를 위해 확장)
@@ -73,36 +89,13 @@ class LFM2KOENTranslator(BaseTranslator):
             n_threads=physical_cores,
             verbose=False 
         )
+        # 시스템 프롬프트 접두사 상태 캐시 (문장마다 접두사를 다시 평가하지 않음)
+        self.prefix_cache = PromptPrefixCache(self.llm)
         print(f"LFM2-1.2B-KOEN-MT 모델 로드 완료 (CPU Mode, {physical_cores} threads).")
 
-    def translate_batch(self, sentences, src, dest, max_workers=1, progress_cb=None):
-        """
-        LFM2 모델의 안정성을 위해 ThreadPoolExecutor를 사용하지 않고
-        단순 반복문으로 순차 처리를 수행합니다.
-        """
-        results = []
-        total = len(sentences)
-        
-        print(f"LFM2-KOEN-MT: Starting serial translation of {total} items...")
-        
-        for i, text in enumerate(sentences):
-            try:
-                # 개별 번역 수행
-                translated = self.translate(text, src, dest)
-                results.append(translated)
-            except Exception as e:
-                print(f"Batch processing error at index {i}: {e}")
-                results.append(text)  # 에러 시 원문 반환
-            
-            # 진행상황 콜백 호출
-            if progress_cb:
-                progress_cb((i + 1) / total, f"({i + 1}/{total})")
-                
-        return results
-
-    def translate(self, text: str, src: str, dest: str) -> str:
+    def _build_prompt(self, text: str, src: str, dest: str) -> Tuple[str, str]:
         """
-        한국어-영어 전용 번역을 수행합니다.
+        한국어-영어 전용 간소화 프롬프트를 (접두사, 본문)으로 구성합니다.
 
         Args:
             text (str): 번역할 텍스트
@@ -110,47 +103,27 @@ class LFM2KOENTranslator(BaseTranslator):
             dest (str): 대상 언어 코드 ('ko' 또는 'en')
 
         Returns:
-            str: 번역된 텍스트
+            Tuple[str, str]: (시스템 프롬프트 ~ user 턴 시작, 텍스트 ~ assistant 턴 시작)
         """
-        # 컨텍스트 초기화 (필수: 이전 번역 상태가 남으면 decode 에러 발생)
-        if hasattr(self.llm, "reset"):
-            self.llm.reset()
-        
         # 대상 언어에 따른 간소화된 프롬프트 선택
         if dest == "ko":
             system = "Translate the following text to Korean."
         else:
             system = "Translate the following text to English."
 
-        # ChatML 포맷 프롬프트
-        prompt = f"""<|im_start|>system
+        # ChatML 포맷 프롬프트 (접두사는 대상 언어별로 동일하므로 분리하여 캐시)
+        prefix = f"""<|im_start|>system
 {system}<|im_end|>
 <|im_start|>user
-{text}<|im_end|>
+"""
+        suffix = f"""{text}<|im_end|>
 <|im_start|>assistant
 """
-        
-        try:
-            # 생성 요청
-            output = self.llm(
-                prompt,
-                max_tokens=512, 
-                stop=["<|im_end|>"],  # 턴 종료 시 중단
-                temperature=0.3,  # 약간의 창의성 허용
-                min_p=0.15,  # Top-p 대신 min_p 사용 (모델 권장)
-                repeat_penalty=1.05,  # 반복 생성 방지
-                echo=False
-            )
-            
-            # 결과 추출
-            translated_text = output['choices'][0]['text'].strip()
-            
-            # 후처리: 불필요한 따옴표 제거
-            if translated_text.startswith('"') and translated_text.endswith('"'):
-                translated_text = translated_text[1:-1]
-                
-            return translated_text.strip()
-            
-        except Exception as e:
-            print(f"Error during translation: {e}")
-            return text
+        return prefix, suffix
+
+    def _postprocess(self, text: str) -> str:
+        """불필요한 따옴표를 제거합니다."""
+        translated_text = text.strip()
+        if translated_text.startswith('"') and translated_text.endswith('"'):
+            translated_text = translated_text[1:-1]
+        return translated_text.strip()
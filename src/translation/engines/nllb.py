@@ -12,8 +12,11 @@ Meta NLLB-200 다국어 번역 엔진 모듈입니다.
 속도 최적화:
 - CTranslate2 양자화 모델 (int8) 사용
 - 빠른 다운로드 및 추론
+- 토큰 길이별 정렬 및 토큰 예산 기반 배치 구성 (패딩 낭비 최소화)
 """
 
+from typing import List, Optional, Tuple
+
 try:
     import ctranslate2
     from transformers import AutoTokenizer
@@ -21,7 +24,8 @@ except ImportError:
     ctranslate2 = None
     AutoTokenizer = None
 
-from ..base import BaseTranslator
+from ..base import BaseTranslator, ProgressCallback
+from ..utils import get_num_threads, download_model_snapshot, load_tokenizer
 
 # ISO 639-1 코드를 NLLB 언어 코드로 매핑
 NLLB_LANG_CODES = {
@@ -66,6 +70,15 @@ class NLLBTranslator(BaseTranslator):
     지원 언어: 200개 언어 (한국어, 영어, 일본어, 중국어 등)
     """
 
+    model_id = "JustFrederik/nllb-200-distilled-600M-ct2-int8"
+    thread_safe = False
+
+    # 로그 출력용 엔진 이름
+    display_name = "NLLB"
+
+    # 배치 하나에 담을 최대 토큰 수 (패딩 포함, CTranslate2 batch_type="tokens")
+    max_batch_tokens = 2048
+
     def __init__(self):
         """
         NLLBTranslator를 초기화합니다.
@@ -84,13 +97,12 @@ class NLLBTranslator(BaseTranslator):
         self.tokenizer_id = "facebook/nllb-200-distilled-600M"
         
         # 토크나이저 로드 (작은 파일들만 받으므로 빠름)
-        self.tokenizer = AutoTokenizer.from_pretrained(self.tokenizer_id)
+        self.tokenizer = load_tokenizer(self.tokenizer_id)
         
         # CTranslate2 모델 다운로드 및 로드
         try:
-            from huggingface_hub import snapshot_download
-            model_path = snapshot_download(repo_id=self.ct2_model_id)
-            self.translator = ctranslate2.Translator(model_path, device="auto")
+            self.model_path = download_model_snapshot(self.ct2_model_id)
+            self.translator = ctranslate2.Translator(self.model_path, device="auto", intra_threads=get_num_threads())
         except Exception as e:
             raise RuntimeError(f"NLLB 모델 로드 실패: {e}")
         
@@ -100,9 +112,78 @@ class NLLBTranslator(BaseTranslator):
         """ISO 639-1 언어 코드를 NLLB 언어 코드로 변환합니다."""
         return NLLB_LANG_CODES.get(lang_code, "eng_Latn")
 
-    def translate_batch(self, sentences, src, dest, max_workers=1, progress_cb=None, chunk_size=16):
+    def _get_lang_pair(self, src: str, dest: str) -> Tuple[str, str]:
+        """(원본, 대상) 언어 코드를 NLLB 언어 코드 쌍으로 변환합니다."""
+        return self._get_nllb_code(src), self._get_nllb_code(dest)
+
+    def _tokenize(self, texts: List[str]) -> List[List[str]]:
+        """
+        여러 문장을 한 번의 토크나이저 호출로 토큰화합니다.
+        CTranslate2는 토큰 문자열 리스트를 입력으로 받으므로 torch 텐서를 만들지 않습니다.
+        """
+        encoded = self.tokenizer(texts, truncation=True, max_length=512)["input_ids"]
+        return [self.tokenizer.convert_ids_to_tokens(ids) for ids in encoded]
+
+    def _translate_tokens(self, token_batch: List[List[str]], tgt_lang: str) -> List[str]:
+        """
+        토큰화된 문장 배치를 CTranslate2로 번역하고 디코딩합니다.
+        """
+        batch_results = self.translator.translate_batch(
+            token_batch,
+            target_prefix=[[tgt_lang]] * len(token_batch),
+            beam_size=4,
+            max_decoding_length=512,
+            repetition_penalty=1.2,  # 반복 토큰 생성 억제
+            max_batch_size=self.max_batch_tokens,
+            batch_type="tokens",
+        )
+
+        output_ids = []
+        for result in batch_results:
+            output_tokens = result.hypotheses[0]
+            # 타겟 언어 토큰 제거
+            if output_tokens and output_tokens[0] == tgt_lang:
+                output_tokens = output_tokens[1:]
+            output_ids.append(self.tokenizer.convert_tokens_to_ids(output_tokens))
+
+        decoded = self.tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+        return [text.strip() for text in decoded]
+
+    def _build_length_buckets(self, token_lists: List[List[str]]) -> List[List[int]]:
+        """
+        토큰 길이 순으로 정렬한 뒤, 패딩을 포함한 토큰 수(문장 수 × 최대 길이)가
+        max_batch_tokens를 넘지 않도록 배치를 구성합니다.
+        짧은 표 셀이 긴 문단과 같은 배치에서 패딩되는 낭비를 줄입니다.
+
+        Returns:
+            List[List[int]]: 배치별 입력 인덱스 리스트
+        """
+        order = sorted(range(len(token_lists)), key=lambda k: len(token_lists[k]))
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_max = 0
+        for k in order:
+            length = max(len(token_lists[k]), 1)
+            longest = max(current_max, length)
+            if current and longest * (len(current) + 1) > self.max_batch_tokens:
+                batches.append(current)
+                current, longest = [], length
+            current.append(k)
+            current_max = longest
+        if current:
+            batches.append(current)
+        return batches
+
+    def translate_batch(
+        self,
+        sentences: List[str],
+        src: str,
+        dest: str,
+        max_workers: int = 1,
+        progress_cb: Optional[ProgressCallback] = None
+    ) -> List[str]:
         """
-        CTranslate2의 진정한 배치 처리를 활용하여 여러 문장을 효율적으로 번역합니다.
+        문장을 토큰 길이별로 묶어 CTranslate2 배치 번역을 수행합니다.
         
         Args:
             sentences: 번역할 문장 리스트
@@ -110,90 +191,45 @@ class NLLBTranslator(BaseTranslator):
             dest: 대상 언어 코드
             max_workers: (미사용) 호환성을 위해 유지
             progress_cb: 진행률 콜백 함수
-            chunk_size: 한 번에 배치 처리할 문장 수 (기본값: 16, NLLB는 더 큰 배치 가능)
         
         Returns:
             번역된 문장 리스트 (입력과 동일한 순서 보장)
         """
-        results = []
         total = len(sentences)
-        
-        src_lang = self._get_nllb_code(src)
-        tgt_lang = self._get_nllb_code(dest)
+        if total == 0:
+            return []
+
+        src_lang, tgt_lang = self._get_lang_pair(src, dest)
         self.tokenizer.src_lang = src_lang
-        
-        # 청크 단위로 분할
-        chunks = [sentences[i:i + chunk_size] for i in range(0, total, chunk_size)]
-        
-        print(f"NLLB: CTranslate2 배치 번역 시작 ({total}개 문장 → {len(chunks)}개 청크, 청크 크기: {chunk_size})")
-        
-        processed_count = 0
-        for i, chunk in enumerate(chunks):
+
+        # 빈 문장은 원문 유지
+        results = list(sentences)
+        targets = [i for i, text in enumerate(sentences) if text and text.strip()]
+        if not targets:
+            return results
+
+        token_lists = self._tokenize([sentences[i] for i in targets])
+        batches = self._build_length_buckets(token_lists)
+
+        print(
+            f"{self.display_name}: CTranslate2 배치 번역 시작 "
+            f"({total}개 문장 → {len(batches)}개 배치, 배치당 최대 {self.max_batch_tokens} 토큰)"
+        )
+
+        processed_count = total - len(targets)
+        for i, batch in enumerate(batches):
             try:
-                # 배치 토큰화
-                all_input_tokens = []
-                for text in chunk:
-                    if not text or not text.strip():
-                        all_input_tokens.append([])  # 빈 문장 처리
-                    else:
-                        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-                        tokens = self.tokenizer.convert_ids_to_tokens(inputs["input_ids"][0])
-                        all_input_tokens.append(tokens)
-                
-                # 빈 문장 필터링 및 결과 위치 추적
-                non_empty_indices = [j for j, tokens in enumerate(all_input_tokens) if tokens]
-                non_empty_tokens = [all_input_tokens[j] for j in non_empty_indices]
-                
-                if non_empty_tokens:
-                    # CTranslate2 배치 번역 (진정한 배치 처리)
-                    batch_results = self.translator.translate_batch(
-                        non_empty_tokens,
-                        target_prefix=[[tgt_lang]] * len(non_empty_tokens),
-                        beam_size=4,
-                        max_decoding_length=512,
-                        repetition_penalty=1.2  # 반복 토큰 생성 억제
-                    )
-                    
-                    # 결과 디코딩
-                    translated_texts = []
-                    for result in batch_results:
-                        output_tokens = result.hypotheses[0]
-                        # 타겟 언어 토큰 제거
-                        if output_tokens and output_tokens[0] == tgt_lang:
-                            output_tokens = output_tokens[1:]
-                        
-                        translated_text = self.tokenizer.decode(
-                            self.tokenizer.convert_tokens_to_ids(output_tokens),
-                            skip_special_tokens=True
-                        )
-                        translated_texts.append(translated_text.strip())
-                else:
-                    translated_texts = []
-                
-                # 원래 순서대로 결과 재조합 (빈 문장은 원문 유지)
-                chunk_results = []
-                translated_idx = 0
-                for j in range(len(chunk)):
-                    if j in non_empty_indices:
-                        chunk_results.append(translated_texts[translated_idx])
-                        translated_idx += 1
-                    else:
-                        chunk_results.append(chunk[j])  # 빈 문장은 원문 유지
-                
-                results.extend(chunk_results)
-                
+                translated_texts = self._translate_tokens([token_lists[k] for k in batch], tgt_lang)
+                for k, text in zip(batch, translated_texts):
+                    results[targets[k]] = text
             except Exception as e:
                 # Fallback: 개별 번역
-                print(f"NLLB 배치 처리 오류 (청크 {i+1}): {e}")
-                for text in chunk:
-                    try:
-                        results.append(self.translate(text, src, dest))
-                    except Exception as inner_e:
-                        print(f"개별 번역 실패: {inner_e}")
-                        results.append(text)
-            
+                print(f"{self.display_name} 배치 처리 오류 (배치 {i+1}): {e}")
+                for k in batch:
+                    results[targets[k]] = self.translate(sentences[targets[k]], src, dest)
+
             # 진행률 업데이트
-            processed_count += len(chunk)
+            processed_count += len(batch)
             if progress_cb:
                 progress_cb(processed_count / total, f"({processed_count}/{total})")
         
@@ -206,39 +242,13 @@ class NLLBTranslator(BaseTranslator):
         if not text or not text.strip():
             return text
         
-        src_lang = self._get_nllb_code(src)
-        tgt_lang = self._get_nllb_code(dest)
+        src_lang, tgt_lang = self._get_lang_pair(src, dest)
         
         try:
             # 소스 언어 설정
             self.tokenizer.src_lang = src_lang
-            
-            # 토큰화
-            inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-            input_tokens = self.tokenizer.convert_ids_to_tokens(inputs["input_ids"][0])
-            
-            # CTranslate2로 번역
-            results = self.translator.translate_batch(
-                [input_tokens],
-                target_prefix=[[tgt_lang]],
-                beam_size=4,
-                max_decoding_length=512,
-                repetition_penalty=1.2  # 반복 토큰 생성 억제
-            )
-            
-            # 결과 디코딩
-            output_tokens = results[0].hypotheses[0]
-            # 타겟 언어 토큰 제거
-            if output_tokens and output_tokens[0] == tgt_lang:
-                output_tokens = output_tokens[1:]
-            
-            translated_text = self.tokenizer.decode(
-                self.tokenizer.convert_tokens_to_ids(output_tokens),
-                skip_special_tokens=True
-            )
-            
-            return translated_text.strip()
+            return self._translate_tokens(self._tokenize([text]), tgt_lang)[0]
             
         except Exception as e:
-            print(f"NLLB translation error: {e}")
+            print(f"{self.display_name} translation error: {e}")
             return text
@@ -6,23 +6,35 @@ YanoljaNEXT-Rosetta-4B-2511-GGUF 모델을 사용하는 번역 엔진 모듈입
 이 모듈은 다음 기능을 수행합니다:
 1.  **모델 로드**: `huggingface_hub`를 통해 GGUF 모델을 다운로드하고 `llama_cpp`로 로드합니다.
 2.  **번역 수행**: 모델 고유의 프롬프트 형식을 사용하여 텍스트를 번역합니다.
+3.  **접두사 캐시**: 지시문 프롬프트의 KV 상태를 언어 쌍별로 저장해 두고 문장마다 복원합니다.
+4.  **연속 배치 번역**: `LlamaCppTranslator.translate_batch`를 통해 여러 문장을 하나의 컨텍스트에서 동시에 디코딩합니다.
 """
 
-import os
-from typing import Optional
+from typing import Optional, Tuple
 try:
     from llama_cpp import Llama
 except ImportError:
     Llama = None
 
-from ..base import BaseTranslator
-from ..utils import LANGUAGE_NAMES
+from ..llama_base import LlamaCppTranslator
+from ..llama_cache import PromptPrefixCache
+from ..utils import LANGUAGE_NAMES, get_num_threads, download_model_file
 
-class YanoljaTranslator(BaseTranslator):
+class YanoljaTranslator(LlamaCppTranslator):
     """
     YanoljaNEXT-Rosetta-4B-2511-GGUF 모델을 사용하는 번역기입니다.
     """
 
+    model_id = "yanolja/YanoljaNEXT-Rosetta-4B-2511-GGUF:Q5_K_M"
+
+    # 생성 파라미터
+    generation_params = {
+        "max_tokens": 4096,  # 출력 최대 토큰 수
+        "stop": ["<end_of_turn>"],  # 생성을 멈출 토큰
+        "temperature": 0.7,
+        "top_p": 0.9,
+    }
+
     def __init__(self):
         """
         YanoljaTranslator를 초기화합니다.
@@ -35,7 +47,7 @@ class YanoljaTranslator(BaseTranslator):
             )
         
         try:
-            from huggingface_hub import hf_hub_download
+            import huggingface_hub  # noqa: F401 (설치 확인)
         except ImportError:
              raise ImportError(
                 "huggingface_hub가 설치되지 않았습니다. "
@@ -47,13 +59,13 @@ class YanoljaTranslator(BaseTranslator):
         # 모델 다운로드 (캐시된 경우 다운로드 생략)
         # repo_id: yanolja/YanoljaNEXT-Rosetta-4B-2511-GGUF
         # filename: Q5_K_M/YanoljaNEXT-Rosetta-4B-2511-bf16-q5_k_m.gguf (Q5_K_M 권장)
-        self.model_path = hf_hub_download(
+        self.model_path = download_model_file(
             repo_id="yanolja/YanoljaNEXT-Rosetta-4B-2511-GGUF",
             filename="Q5_K_M/YanoljaNEXT-Rosetta-4B-2511-bf16-q5_k_m.gguf"
         )
         
-        # CPU 물리 코어 수 계산 (하이퍼스레딩 제외 시 최적 성능)
-        physical_cores = os.cpu_count() // 2 if os.cpu_count() else 4
+        # CPU 물리 코어 수 계산 (하이퍼스레딩 제외 시 최적 성능, 프로세스 풀 복제본은 할당된 코어 수)
+        physical_cores = get_num_threads()
         
         # Llama 인스턴스 생성
         # n_ctx: 4096 (모델 스펙 및 일반적인 문서 청크 크기 고려)
@@ -64,11 +76,13 @@ class YanoljaTranslator(BaseTranslator):
             n_threads=physical_cores,
             verbose=False # 로그 출력 끄기
         )
+        # 지시문 접두사 상태 캐시 (문장마다 접두사를 다시 평가하지 않음)
+        self.prefix_cache = PromptPrefixCache(self.llm)
         print(f"YanoljaNEXT-Rosetta-4B-2511-GGUF 모델 로드 완료 ({physical_cores} threads).")
 
-    def translate(self, text: str, src: str, dest: str) -> str:
+    def _build_prompt(self, text: str, src: str, dest: str) -> Tuple[str, str]:
         """
-        Yanolja 모델을 사용하여 텍스트를 번역합니다.
+        Yanolja Rosetta 프롬프트를 (접두사, 본문)으로 구성합니다.
 
         Args:
             text (str): 번역할 텍스트
@@ -76,7 +90,7 @@ class YanoljaTranslator(BaseTranslator):
             dest (str): 대상 언어 코드
 
         Returns:
-            str: 번역된 텍스트
+            Tuple[str, str]: (instruction 턴 ~ source 턴 시작, 텍스트 ~ translation 턴 시작)
         """
         # 언어 코드를 전체 이름으로 변환 (예: 'en' -> 'English')
         src_name = LANGUAGE_NAMES.get(src, src)
@@ -86,28 +100,15 @@ class YanoljaTranslator(BaseTranslator):
         # <start_of_turn>instruction ... <end_of_turn>
         # <start_of_turn>source ... <end_of_turn>
         # <start_of_turn>translation
-        
-        prompt = f"""<start_of_turn>instruction
+        # 접두사(instruction 턴 ~ source 턴 시작)는 언어 쌍별로 동일하므로 분리하여 캐시
+        prefix = f"""<start_of_turn>instruction
 Translate the following text from {src_name} to {dest_name}.
 Provide the final translation immediately without any other text.
 <end_of_turn>
 <start_of_turn>source
-{text}
+"""
+        suffix = f"""{text}
 <end_of_turn>
 <start_of_turn>translation
 """
-
-        # 생성 요청
-        output = self.llm(
-            prompt,
-            max_tokens=4096, # 출력 최대 토큰 수
-            stop=["<end_of_turn>"], # 생성을 멈출 토큰
-            echo=False, # 프롬프트 포함 여부
-            temperature=0.7, 
-            top_p=0.9,
-        )
-
-        # 결과 추출
-        translated_text = output['choices'][0]['text'].strip()
-        
-        return translated_text
+        return prefix, suffix
@@ -0,0 +1,314 @@
+"""
+src/translation/executor.py
+===========================
+모든 번역 요청이 함께 사용하는 스레드 풀과 요청 속도 제한 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **공유 스레드 풀**: `translate_batch` 호출마다 `ThreadPoolExecutor`를 새로 만들지 않고,
+    프로세스 전역 스레드 풀 하나에서 모든 파일의 번역 요청을 실행합니다.
+    여러 파일을 동시에 처리해도 전체 동시 요청 수는 `TRANSLATION_THREADS`를 넘지 않으며, 스레드와 HTTP 커넥션이 재사용됩니다.
+2.  **호출별 동시성**: 각 호출은 여전히 `max_workers`개까지만 요청을 동시에 실행합니다 (슬라이딩 윈도우).
+3.  **속도 제한**: `TRANSLATION_RATE_LIMIT`이 설정되면 엔진별 토큰 버킷으로 초당 요청 수를 제한합니다 (모든 파일 공통).
+4.  **적응형 동시성 (AIMD)**: API 엔진(OpenAI, Gemini, DeepL)은 고정된 `max_workers` 대신 엔진별 동시 요청 한도를 스스로 조절합니다.
+    응답 시간이 평소 수준이고 오류가 없으면 한도를 조금씩(가산) 늘리고, 429/503 응답을 받으면 절반으로(승산) 줄이며,
+    `Retry-After`가 있으면 그 시간 동안 새 요청을 보내지 않습니다. 최근 응답 시간이 장기 평균의 두 배를 넘으면 한도를 약간 줄입니다.
+    `max_workers`는 시작 한도로 사용되며, 현재 한도는 `concurrency_stats()`로 확인할 수 있습니다.
+
+환경 변수:
+- `TRANSLATION_THREADS`: 공유 스레드 풀 크기 (기본값: 32)
+- `TRANSLATION_RATE_LIMIT`: 엔진별 초당 최대 요청 수. `0`이면 제한 없음 (기본값: 0)
+- `ADAPTIVE_CONCURRENCY`: `0`이면 적응형 동시성을 끄고 `max_workers`를 고정 한도로 사용 (기본값: 1)
+- `ADAPTIVE_MIN_CONCURRENCY` / `ADAPTIVE_MAX_CONCURRENCY`: 엔진별 동시 요청 한도의 범위 (기본값: 1 / 32)
+"""
+
+import os
+import time
+import logging
+import threading
+import contextvars
+import concurrent.futures
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_limiters: Dict[str, "RateLimiter"] = {}
+_concurrency: Dict[str, "AdaptiveConcurrency"] = {}
+_lock = threading.Lock()
+
+# 최근 응답 시간이 기준(장기 평균 응답 시간)의 몇 배를 넘으면 혼잡으로 보고 한도를 줄일지
+_LATENCY_TOLERANCE = 2.0
+# 적응형 모드에서 다른 호출이 반납한 자리나 늘어난 한도를 확인하는 간격(초)
+_POLL_INTERVAL = 0.1
+
+# 공유 풀의 스레드에서 실행 중인지 표시 (풀 안에서 다시 풀을 기다리면 교착될 수 있으므로 그 자리에서 실행)
+_local = threading.local()
+
+
+class RateLimiter:
+    """초당 요청 수를 제한하는 토큰 버킷입니다 (스레드 안전)."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 기다립니다."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """
+    엔진별 동시 요청 한도를 AIMD(가산 증가, 승산 감소)로 조절하는 제한기입니다 (스레드 안전).
+    같은 엔진을 사용하는 모든 파일과 호출이 하나의 한도를 공유합니다.
+    """
+
+    def __init__(self, initial: int, min_limit: int = 1, max_limit: int = 32):
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self.throttles = 0
+        self._baseline: Optional[float] = None  # 기준 응답 시간 (느린 지수 이동 평균)
+        self._latency: Optional[float] = None   # 최근 응답 시간 (빠른 지수 이동 평균)
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def _capacity(self) -> int:
+        return max(int(self.limit), self.min_limit)
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """요청 자리를 하나 얻습니다. blocking=False면 바로 얻을 수 없을 때 False를 반환합니다."""
+        with self._cond:
+            while True:
+                wait = self._blocked_until - time.monotonic()
+                if wait <= 0 and self.in_flight < self._capacity():
+                    self.in_flight += 1
+                    return True
+                if not blocking:
+                    return False
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, latency: float, ok: bool = True):
+        """요청이 끝나면 자리를 반납하고, 응답 시간과 성공 여부로 한도를 조절합니다."""
+        with self._cond:
+            saturated = self.in_flight >= self._capacity()
+            self.in_flight -= 1
+            if ok:
+                # 기준은 느린 이동 평균, 현재 값은 빠른 이동 평균 (묶음 크기에 따른 응답 시간 차이를 평균으로 흡수)
+                self._baseline = latency if self._baseline is None else self._baseline * 0.95 + latency * 0.05
+                self._latency = latency if self._latency is None else self._latency * 0.7 + latency * 0.3
+
+                if self._latency > self._baseline * _LATENCY_TOLERANCE:
+                    self._decrease(0.9, "응답 지연")
+                elif saturated:
+                    # 한도를 모두 쓰고 있을 때만 증가 (한도 하나만큼 응답이 오면 약 +1)
+                    self.limit = min(self.limit + 1.0 / self.limit, float(self.max_limit))
+            self._cond.notify_all()
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """429/503 응답을 받았을 때 한도를 절반으로 줄이고, Retry-After 동안 새 요청을 멈춥니다."""
+        with self._cond:
+            self.throttles += 1
+            self._decrease(0.5, "요청 제한")
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            self._cond.notify_all()
+
+    def _decrease(self, factor: float, reason: str):
+        # 이미 보낸 요청들의 응답이 돌아오기 전에 한도를 연달아 줄이지 않도록, 응답 시간 한 번에 한 번만 감소
+        now = time.monotonic()
+        if now - self._last_decrease < (self._latency or 0.0):
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(self.limit * factor, float(self.min_limit))
+        if int(self.limit) < int(previous):
+            logging.info(f"[Concurrency] {reason}: 동시 요청 한도 {int(previous)} -> {int(self.limit)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 한도, 진행 중인 요청 수, 요청 제한 횟수, 응답 시간(평균/기준)을 반환합니다."""
+        with self._cond:
+            return {
+                "limit": self._capacity(),
+                "in_flight": self.in_flight,
+                "throttles": self.throttles,
+                "latency": round(self._latency, 3) if self._latency is not None else None,
+                "baseline_latency": round(self._baseline, 3) if self._baseline is not None else None,
+            }
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, str(default))), 1)
+    except ValueError:
+        return default
+
+
+def is_adaptive_enabled() -> bool:
+    """적응형 동시성 사용 여부 (ADAPTIVE_CONCURRENCY, 기본값: 1)"""
+    return os.getenv("ADAPTIVE_CONCURRENCY", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """프로세스 전역 번역 스레드 풀을 반환합니다."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            threads = _env_int("TRANSLATION_THREADS", 32)
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads, thread_name_prefix="translate")
+        return _executor
+
+
+def get_rate_limiter(key: str) -> Optional[RateLimiter]:
+    """엔진별 속도 제한기를 반환합니다 (TRANSLATION_RATE_LIMIT이 0이면 None)."""
+    try:
+        rate = float(os.getenv("TRANSLATION_RATE_LIMIT", "0"))
+    except ValueError:
+        rate = 0.0
+    if rate <= 0:
+        return None
+    with _lock:
+        limiter = _limiters.get(key)
+        if limiter is None or limiter.rate != rate:
+            limiter = _limiters[key] = RateLimiter(rate)
+        return limiter
+
+
+def get_concurrency_limiter(key: str, initial: int) -> AdaptiveConcurrency:
+    """엔진별 적응형 동시성 제한기를 반환합니다. 처음 만들 때만 initial을 시작 한도로 사용합니다."""
+    with _lock:
+        limiter = _concurrency.get(key)
+        if limiter is None:
+            limiter = _concurrency[key] = AdaptiveConcurrency(
+                initial,
+                min_limit=_env_int("ADAPTIVE_MIN_CONCURRENCY", 1),
+                max_limit=_env_int("ADAPTIVE_MAX_CONCURRENCY", 32),
+            )
+        return limiter
+
+
+def report_throttle(key: str, retry_after: Optional[float] = None):
+    """
+    엔진이 429/503(요청 제한, 과부하) 응답을 받았음을 알립니다. 적응형 동시성 제한기가 있으면 한도를 줄입니다.
+
+    Args:
+        key: 엔진 키 (parallel_map의 rate_key, 보통 엔진 클래스 이름)
+        retry_after: 응답의 Retry-After(초). 이 시간 동안 새 요청을 보내지 않음
+    """
+    with _lock:
+        limiter = _concurrency.get(key)
+    if limiter is not None:
+        limiter.on_throttle(retry_after)
+
+
+def retry_after_from_error(error: BaseException) -> Optional[float]:
+    """API 예외에 담긴 HTTP 응답 헤더에서 Retry-After(초)를 읽습니다. 없으면 None을 반환합니다."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after-ms") or headers.get("Retry-After-Ms")
+        if value:
+            return max(float(value) / 1000.0, 0.0)
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            # HTTP 날짜 형식
+            return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def concurrency_stats() -> Dict[str, Dict[str, Any]]:
+    """엔진별 적응형 동시성 상태를 반환합니다 (예: `{"OpenAITranslator": {"limit": 12, ...}}`)."""
+    with _lock:
+        limiters = dict(_concurrency)
+    return {key: limiter.stats() for key, limiter in limiters.items()}
+
+
+def parallel_map(
+    fn: Callable[[T], object],
+    items: Sequence[T],
+    max_workers: int = 1,
+    rate_key: Optional[str] = None,
+    adaptive: bool = False,
+) -> Iterator[Tuple[int, concurrent.futures.Future]]:
+    """
+    items의 각 항목에 fn을 공유 스레드 풀에서 최대 max_workers개씩 동시에 실행하고,
+    끝난 순서대로 (항목 인덱스, Future)를 돌려줍니다. 예외는 Future에 담겨 전달됩니다.
+
+    Args:
+        fn: 항목 하나를 처리하는 함수 (번역 요청 1회)
+        items: 처리할 항목 목록
+        max_workers (int): 이 호출에서 동시에 실행할 최대 요청 수 (adaptive면 시작 한도)
+        rate_key (Optional[str]): 속도 제한과 동시성 한도를 공유할 키 (보통 엔진 클래스 이름)
+        adaptive (bool): True면 rate_key별 적응형 동시성 한도 사용 (API 엔진, ADAPTIVE_CONCURRENCY=0이면 무시)
+    """
+    limiter = get_rate_limiter(rate_key) if rate_key else None
+    inline = max_workers <= 1 or getattr(_local, "in_pool", False)
+    concurrency = (get_concurrency_limiter(rate_key, max_workers)
+                   if adaptive and rate_key and not inline and is_adaptive_enabled() else None)
+
+    def _call(item):
+        if limiter is not None:
+            limiter.acquire()
+        nested = getattr(_local, "in_pool", False)
+        _local.in_pool = True
+        t_start = time.monotonic()
+        ok = False
+        try:
+            result = fn(item)
+            ok = True
+            return result
+        finally:
+            _local.in_pool = nested
+            if concurrency is not None:
+                concurrency.release(time.monotonic() - t_start, ok)
+
+    # 순차 실행 또는 공유 풀 안에서의 호출: 현재 스레드에서 차례로 실행
+    if inline:
+        for idx, item in enumerate(items):
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            try:
+                future.set_result(_call(item))
+            except Exception as e:
+                future.set_exception(e)
+            yield idx, future
+        return
+
+    executor = get_executor()
+    window = concurrency.max_limit if concurrency is not None else max_workers
+    pending: Dict[concurrent.futures.Future, int] = {}
+    next_idx = 0
+    while next_idx < len(items) or pending:
+        while next_idx < len(items) and len(pending) < window:
+            # 적응형: 엔진 한도에 자리가 있을 때만 제출 (진행 중인 요청이 없으면 자리가 날 때까지 대기)
+            if concurrency is not None and not concurrency.acquire(blocking=not pending):
+                break
+            # 호출 스레드의 컨텍스트(폴백 기록 등)를 풀 스레드에서도 사용하도록 복사하여 실행
+            pending[executor.submit(contextvars.copy_context().run, _call, items[next_idx])] = next_idx
+            next_idx += 1
+        timeout = _POLL_INTERVAL if concurrency is not None and next_idx < len(items) else None
+        done, _ = concurrent.futures.wait(pending, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future
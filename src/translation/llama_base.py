@@ -0,0 +1,148 @@
+"""
+src/translation/llama_base.py
+=============================
+llama.cpp(GGUF) 기반 로컬 번역 엔진의 공통 기본 클래스를 정의하는 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **공통 번역 흐름**: 엔진별 프롬프트(접두사/본문)와 생성 파라미터만 정의하면 `translate`가 동작합니다.
+2.  **접두사 캐시**: 단일 문장 번역 시 `PromptPrefixCache`로 지시문 접두사의 KV 상태를 재사용합니다.
+3.  **연속 배치 번역**: `translate_batch`는 `BatchedGenerator`로 여러 문장을 하나의 컨텍스트에서 동시에 디코딩하며,
+    `LLAMA_PARALLEL=1`이거나 배치 디코딩에 실패하면 순차 처리로 폴백합니다.
+
+LFM2, LFM2-KOEN, Qwen, Yanolja 엔진이 이 클래스를 상속합니다.
+"""
+
+import logging
+from abc import abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import BaseTranslator, ProgressCallback
+from .llama_batch import BatchedGenerator, get_parallel_width
+
+
+class LlamaCppTranslator(BaseTranslator):
+    """
+    llama.cpp 기반 번역 엔진의 기본 클래스입니다.
+    하위 클래스는 `__init__`에서 `self.llm`과 `self.prefix_cache`를 설정하고 `_build_prompt`를 구현해야 합니다.
+    """
+
+    # llama.cpp 컨텍스트는 스레드 안전하지 않으므로 레지스트리에서 직렬화
+    thread_safe = False
+
+    # `Llama.__call__`에 전달할 생성 파라미터 (max_tokens, stop, temperature 등)
+    generation_params: Dict[str, Any] = {}
+
+    # 배치 디코딩 시 시퀀스(문장) 하나가 사용할 최대 토큰 수 (접두사 + 문장 + 생성 결과)
+    batch_ctx_per_seq: int = 2048
+
+    _batched_generator: Optional[BatchedGenerator] = None
+
+    @abstractmethod
+    def _build_prompt(self, text: str, src: str, dest: str) -> Tuple[str, str]:
+        """
+        프롬프트를 (접두사, 본문)으로 나누어 반환합니다.
+        접두사는 같은 (src, dest) 쌍에서 항상 동일해야 하며, 본문에 번역할 텍스트가 들어갑니다.
+        """
+        pass
+
+    def _postprocess(self, text: str) -> str:
+        """모델 출력에서 번역문만 남기는 후처리를 수행합니다."""
+        return text.strip()
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        """
+        접두사 캐시를 사용하여 텍스트 하나를 번역합니다.
+
+        Args:
+            text (str): 번역할 텍스트
+            src (str): 원본 언어 코드
+            dest (str): 대상 언어 코드
+
+        Returns:
+            str: 번역된 텍스트 (실패 시 원문)
+        """
+        prefix, suffix = self._build_prompt(text, src, dest)
+        try:
+            # 컨텍스트 준비 (필수: 이전 번역 상태가 남으면 decode 에러 발생)
+            # 초기화 대신 저장해 둔 접두사 상태를 복원하여 사용자 텍스트만 평가
+            prompt_tokens = self.prefix_cache.prepare(prefix, suffix)
+            output = self.llm(prompt_tokens, echo=False, **self.generation_params)
+            return self._postprocess(output['choices'][0]['text'])
+        except Exception as e:
+            print(f"Error during translation: {e}")
+            return text
+
+    def _translate_serial(self, sentences: List[str], src: str, dest: str,
+                          progress_cb: Optional[ProgressCallback] = None) -> List[str]:
+        """모델 안정성을 위해 단순 반복문으로 한 문장씩 순차 번역합니다."""
+        results = []
+        total = len(sentences)
+        for i, text in enumerate(sentences):
+            try:
+                results.append(self.translate(text, src, dest))
+            except Exception as e:
+                print(f"Batch processing error at index {i}: {e}")
+                results.append(text)  # 에러 시 원문 반환
+            if progress_cb:
+                progress_cb((i + 1) / total, f"({i + 1}/{total})")
+        return results
+
+    def _get_batched_generator(self, n_parallel: int) -> BatchedGenerator:
+        """배치 폭에 맞는 다중 시퀀스 생성기를 반환합니다 (폭이 바뀌면 다시 생성)."""
+        generator = self._batched_generator
+        if generator is None or generator.n_parallel != n_parallel:
+            if generator is not None:
+                generator.close()
+            generator = self._batched_generator = BatchedGenerator(self.llm, n_parallel, self.batch_ctx_per_seq)
+        return generator
+
+    def translate_batch(
+        self,
+        sentences: List[str],
+        src: str,
+        dest: str,
+        max_workers: int = 1,
+        progress_cb: Optional[ProgressCallback] = None
+    ) -> List[str]:
+        """
+        여러 문장을 하나의 모델 컨텍스트에서 동시에 디코딩(연속 배치)합니다.
+        배치 폭은 환경 변수 `LLAMA_PARALLEL`로 설정하며, max_workers는 사용하지 않습니다.
+        """
+        total = len(sentences)
+        if total == 0:
+            return []
+
+        n_parallel = min(get_parallel_width(), total)
+        if n_parallel <= 1:
+            return self._translate_serial(sentences, src, dest, progress_cb)
+
+        results = [""] * total
+        targets = [i for i, s in enumerate(sentences) if s and s.strip()]
+        if not targets:
+            return results
+
+        # 배치 하나에는 같은 (src, dest) 쌍만 들어오므로 접두사는 모두 동일
+        prefix = self._build_prompt("", src, dest)[0]
+        suffixes = [self._build_prompt(sentences[i], src, dest)[1] for i in targets]
+        skipped = total - len(targets)
+
+        def _on_complete(done: int, count: int):
+            if progress_cb:
+                progress_cb((skipped + done) / total, f"({skipped + done}/{total})")
+
+        try:
+            generator = self._get_batched_generator(n_parallel)
+            outputs = generator.generate(prefix, suffixes, self.generation_params, on_complete=_on_complete)
+        except Exception as e:
+            logging.warning(f"Batched decoding failed (Fallback to serial translation): {e}")
+            if self._batched_generator is not None:
+                self._batched_generator.close()
+                self._batched_generator = None
+            return self._translate_serial(sentences, src, dest, progress_cb)
+
+        for idx, output in zip(targets, outputs):
+            # 컨텍스트 예산을 넘어 배치에서 제외된 긴 문장은 단일 번역으로 처리
+            results[idx] = self._postprocess(output) if output is not None else self.translate(sentences[idx], src, dest)
+        if progress_cb:
+            progress_cb(1.0, f"({total}/{total})")
+        return results
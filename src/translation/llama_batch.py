@@ -0,0 +1,342 @@
+"""
+src/translation/llama_batch.py
+==============================
+llama.cpp 기반 로컬 엔진을 위한 연속 배치(continuous batching) 디코딩 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **다중 시퀀스 디코딩**: 하나의 모델 컨텍스트에서 여러 문장을 서로 다른 시퀀스 ID로 동시에 디코딩합니다.
+2.  **연속 배치**: 문장 하나가 끝나면 비어 있는 슬롯을 대기열의 다음 문장으로 즉시 채웁니다.
+3.  **접두사 공유**: 지시문(시스템 프롬프트) 접두사를 시퀀스 0에 한 번만 평가하고, 각 슬롯으로 KV 캐시를 복사합니다.
+4.  **API 확인**: llama-cpp-python의 비공개 API(`_internals`, `Llama._model`, KV 캐시 시퀀스 조작, `kv_unified`)를 사용하므로,
+    설치된 버전에 필요한 API가 없으면 배치 디코딩을 사용하지 않고 순차 처리합니다.
+
+CPU 행렬 연산은 배치 크기가 1보다 클 때 처리량이 크게 높아지므로,
+문장을 하나씩 디코딩할 때 놀고 있던 코어를 활용할 수 있습니다.
+비공개 API에 의존하므로 기본값은 순차 처리이며, `LLAMA_PARALLEL`을 2 이상으로 설정해야 사용됩니다.
+
+환경 변수:
+- `LLAMA_PARALLEL`: 동시에 디코딩할 문장 수(배치 폭). `1`이면 기존처럼 순차 처리 (기본값: 1)
+"""
+
+import os
+import codecs
+import random
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import llama_cpp
+    from llama_cpp import _internals as llama_internals
+except ImportError:
+    llama_cpp = None
+    llama_internals = None
+
+# 진행률 콜백 타입: (완료 개수, 전체 개수)
+CompletionCallback = Callable[[int, int], None]
+
+
+# 배치 디코딩에 필요한 llama-cpp-python 비공개 API (버전에 따라 이름이 바뀌거나 사라질 수 있음)
+_REQUIRED_INTERNALS = ("LlamaContext", "LlamaBatch", "LlamaSampler")
+_REQUIRED_CONTEXT_METHODS = ("kv_cache_seq_cp", "kv_cache_seq_rm", "kv_cache_clear", "decode")
+
+_support_checked: Optional[bool] = None
+
+
+def _missing_batch_apis() -> List[str]:
+    """설치된 llama-cpp-python에 없는, 배치 디코딩에 필요한 API 이름 목록을 반환합니다."""
+    if llama_cpp is None or llama_internals is None:
+        return ["llama_cpp._internals"]
+    missing = [f"_internals.{name}" for name in _REQUIRED_INTERNALS if not hasattr(llama_internals, name)]
+    context_cls = getattr(llama_internals, "LlamaContext", None)
+    if context_cls is not None:
+        missing += [f"LlamaContext.{name}" for name in _REQUIRED_CONTEXT_METHODS if not hasattr(context_cls, name)]
+    params_cls = getattr(llama_cpp, "llama_context_params", None)
+    if params_cls is None or "kv_unified" not in {f[0] for f in getattr(params_cls, "_fields_", [])}:
+        missing.append("llama_context_params.kv_unified")
+    if not hasattr(llama_cpp, "llama_vocab_is_eog"):
+        missing.append("llama_vocab_is_eog")
+    return missing
+
+
+def is_batching_supported() -> bool:
+    """설치된 llama-cpp-python이 배치 디코딩에 필요한 비공개 API를 모두 제공하는지 확인합니다 (결과는 캐시)."""
+    global _support_checked
+    if _support_checked is None:
+        missing = _missing_batch_apis()
+        if missing:
+            logging.warning(f"[LlamaBatch] 설치된 llama-cpp-python에 필요한 API가 없어 순차 처리합니다: {', '.join(missing)}")
+        _support_checked = not missing
+    return _support_checked
+
+
+def get_parallel_width() -> int:
+    """
+    환경 변수 `LLAMA_PARALLEL`로 배치 폭을 읽습니다 (기본값: 1, 순차 처리).
+    2 이상이어도 설치된 llama-cpp-python이 필요한 API를 제공하지 않으면 1을 반환합니다.
+    """
+    try:
+        width = max(int(os.getenv("LLAMA_PARALLEL", "1")), 1)
+    except ValueError:
+        width = 1
+    if width > 1 and not is_batching_supported():
+        return 1
+    return width
+
+
+@dataclass
+class _Slot:
+    """디코딩 슬롯 하나(시퀀스 ID 하나)의 상태입니다."""
+    seq_id: int
+    index: Optional[int] = None
+    pending: List[int] = field(default_factory=list)
+    pos: int = 0
+    max_new: int = 0
+    output: List[int] = field(default_factory=list)
+    # 중단 문자열 검사용으로 생성 토큰을 하나씩 이어 붙인 텍스트 (최종 결과는 `output`을 한 번에 변환)
+    text: str = ""
+    decoder: Any = None
+    last_token: Optional[int] = None
+    sampler: Any = None
+    i_batch: int = -1
+
+    @property
+    def active(self) -> bool:
+        return self.index is not None
+
+
+class BatchedGenerator:
+    """
+    `Llama` 인스턴스의 모델 가중치를 공유하는 별도의 다중 시퀀스 컨텍스트로 여러 프롬프트를 동시에 생성합니다.
+    시퀀스 0은 공통 접두사 전용이며, 시퀀스 1..N이 디코딩 슬롯입니다.
+    """
+
+    def __init__(self, llm: Any, n_parallel: int, n_ctx_per_seq: int):
+        """
+        Args:
+            llm (Llama): llama_cpp.Llama 인스턴스 (모델 가중치와 컨텍스트 설정을 공유)
+            n_parallel (int): 동시에 디코딩할 문장 수
+            n_ctx_per_seq (int): 시퀀스 하나가 사용할 수 있는 최대 토큰 수 (접두사 + 문장 + 생성)
+        """
+        if llama_cpp is None:
+            raise ImportError("llama-cpp-python이 설치되지 않았습니다.")
+        self.llm = llm
+        self.n_parallel = max(n_parallel, 1)
+        self.n_ctx_per_seq = n_ctx_per_seq
+        self._ctx = None
+        self._batch = None
+        self._n_batch = 0
+        self._prefix_tokens: Optional[List[int]] = None
+
+    def _ensure_context(self):
+        """다중 시퀀스 컨텍스트를 생성합니다 (최초 1회)."""
+        if self._ctx is not None:
+            return
+        if not is_batching_supported():
+            raise RuntimeError("installed llama-cpp-python does not provide the APIs needed for batched decoding")
+        if getattr(self.llm, "_model", None) is None:
+            raise RuntimeError("Llama instance does not expose its model handle (Llama._model)")
+        params = llama_cpp.llama_context_params.from_buffer_copy(self.llm.context_params)
+        params.n_seq_max = self.n_parallel + 1
+        params.n_ctx = self.n_ctx_per_seq * (self.n_parallel + 1)
+        params.n_batch = max(min(params.n_batch, params.n_ctx), self.n_parallel)
+        params.n_ubatch = min(params.n_ubatch, params.n_batch)
+        # 모든 슬롯이 같은 접두사를 공유하므로 통합 KV 버퍼를 사용 (시퀀스 간 복사가 셀 공유로 처리됨)
+        params.kv_unified = True
+        self._ctx = llama_internals.LlamaContext(model=self.llm._model, params=params, verbose=self.llm.verbose)
+        self._n_batch = params.n_batch
+        self._batch = llama_internals.LlamaBatch(n_tokens=self._n_batch, embd=0, n_seq_max=1, verbose=self.llm.verbose)
+
+    def close(self):
+        """컨텍스트와 배치 버퍼를 해제합니다."""
+        if self._batch is not None:
+            self._batch.close()
+            self._batch = None
+        if self._ctx is not None:
+            self._ctx.close()
+            self._ctx = None
+        self._prefix_tokens = None
+
+    def _batch_add(self, token: int, pos: int, seq_id: int, logits: bool) -> int:
+        """배치에 토큰 하나를 추가하고 배치 내 인덱스를 반환합니다."""
+        batch = self._batch.batch
+        i = batch.n_tokens
+        batch.token[i] = token
+        batch.pos[i] = pos
+        batch.seq_id[i][0] = seq_id
+        batch.n_seq_id[i] = 1
+        batch.logits[i] = logits
+        batch.n_tokens = i + 1
+        return i
+
+    def _load_prefix(self, prefix_tokens: List[int]):
+        """접두사를 시퀀스 0에 평가합니다. 직전 호출과 같은 접두사면 재사용합니다."""
+        if prefix_tokens == self._prefix_tokens:
+            for seq_id in range(1, self.n_parallel + 1):
+                self._ctx.kv_cache_seq_rm(seq_id, -1, -1)
+            return
+        self._ctx.kv_cache_clear()
+        self._prefix_tokens = None
+        for start in range(0, len(prefix_tokens), self._n_batch):
+            self._batch.reset()
+            chunk = prefix_tokens[start:start + self._n_batch]
+            for offset, token in enumerate(chunk):
+                is_last = start + offset == len(prefix_tokens) - 1
+                self._batch_add(token, start + offset, 0, is_last)
+            self._ctx.decode(self._batch)
+        self._prefix_tokens = list(prefix_tokens)
+
+    def _make_sampler(self, params: Dict[str, Any]):
+        """`Llama.create_completion`과 같은 순서의 샘플러 체인을 생성합니다."""
+        sampler = llama_internals.LlamaSampler()
+        sampler.add_penalties(
+            n_vocab=self.llm.n_vocab(),
+            penalty_last_n=self.llm.last_n_tokens_size,
+            penalty_repeat=params.get("repeat_penalty", 1.0),
+            penalty_freq=params.get("frequency_penalty", 0.0),
+            penalty_present=params.get("presence_penalty", 0.0),
+        )
+        temperature = params.get("temperature", 0.8)
+        if temperature == 0.0:
+            sampler.add_greedy()
+        else:
+            sampler.add_top_k(params.get("top_k", 40))
+            sampler.add_typical(params.get("typical_p", 1.0), 1)
+            sampler.add_top_p(params.get("top_p", 0.95), 1)
+            sampler.add_min_p(params.get("min_p", 0.05), 1)
+            sampler.add_temp(temperature)
+            sampler.add_dist(random.randint(0, 2 ** 31 - 1))
+        return sampler
+
+    def _decode_text(self, tokens: List[int], stop: List[str]) -> str:
+        """생성 토큰을 문자열로 변환하고, 중단 문자열이 있으면 그 앞까지 자릅니다."""
+        text = self.llm.detokenize(tokens).decode("utf-8", errors="ignore")
+        for s in stop:
+            pos = text.find(s)
+            if pos >= 0:
+                text = text[:pos]
+        return text
+
+    def _append_token(self, slot: "_Slot", token: int, stop: List[str], stop_len: int) -> bool:
+        """
+        새 토큰만 문자열로 변환해 슬롯 텍스트에 이어 붙이고, 중단 문자열이 나타났는지 확인합니다.
+        새 조각에 걸칠 수 있는 끝부분(가장 긴 중단 문자열 길이만큼)만 검사하므로 토큰마다 일정한 비용이 듭니다.
+        """
+        # 여러 토큰에 걸친 UTF-8 문자는 점진 디코더가 완성될 때까지 보관
+        piece = slot.decoder.decode(self.llm.detokenize([token]))
+        if not piece:
+            return False
+        tail_start = max(len(slot.text) - stop_len + 1, 0)
+        slot.text += piece
+        tail = slot.text[tail_start:]
+        return any(s in tail for s in stop)
+
+    def generate(
+        self,
+        prefix: str,
+        suffixes: List[str],
+        params: Dict[str, Any],
+        on_complete: Optional[CompletionCallback] = None,
+    ) -> List[Optional[str]]:
+        """
+        공통 접두사 뒤에 각 suffix를 이어 붙인 프롬프트들을 동시에 생성합니다.
+
+        Args:
+            prefix (str): 모든 프롬프트에 공통인 앞부분
+            suffixes (List[str]): 문장별 프롬프트 뒷부분
+            params (Dict[str, Any]): 생성 파라미터 (`max_tokens`, `stop`, `temperature`, `top_p` 등)
+            on_complete (Optional[CompletionCallback]): 문장 하나가 끝날 때마다 (완료 수, 전체 수)로 호출
+
+        Returns:
+            List[Optional[str]]: 생성 결과 (입력 순서 유지). 컨텍스트 예산을 넘는 문장은 None
+        """
+        self._ensure_context()
+        total = len(suffixes)
+        results: List[Optional[str]] = [None] * total
+
+        prefix_tokens = self.llm.tokenize(prefix.encode("utf-8"), add_bos=True, special=True)
+        if len(prefix_tokens) >= self.n_ctx_per_seq:
+            raise ValueError(f"Prompt prefix too long for batched decoding ({len(prefix_tokens)} tokens)")
+        self._load_prefix(prefix_tokens)
+
+        max_tokens = params.get("max_tokens", 512)
+        stop = [s for s in params.get("stop", []) if s]
+        stop_len = max((len(s) for s in stop), default=0)
+
+        queue = deque()
+        completed = 0
+        for idx, suffix in enumerate(suffixes):
+            tokens = self.llm.tokenize(suffix.encode("utf-8"), add_bos=False, special=True)
+            budget = self.n_ctx_per_seq - len(prefix_tokens) - len(tokens)
+            if not tokens or budget <= 0:
+                # 예산 초과 문장은 호출 측에서 단일 디코딩으로 처리
+                completed += 1
+                continue
+            queue.append((idx, tokens, min(max_tokens, budget)))
+
+        slots = [_Slot(seq_id=i + 1) for i in range(self.n_parallel)]
+
+        def _finish(slot: _Slot):
+            nonlocal completed
+            results[slot.index] = self._decode_text(slot.output, stop)
+            self._ctx.kv_cache_seq_rm(slot.seq_id, -1, -1)
+            slot.index, slot.sampler, slot.last_token, slot.decoder = None, None, None, None
+            completed += 1
+            if on_complete:
+                on_complete(completed, total)
+
+        while queue or any(s.active for s in slots):
+            # 1. 빈 슬롯을 대기열의 다음 문장으로 채움 (접두사 KV를 슬롯 시퀀스로 복사)
+            for slot in slots:
+                if slot.active or not queue:
+                    continue
+                slot.index, slot.pending, slot.max_new = queue.popleft()
+                self._ctx.kv_cache_seq_rm(slot.seq_id, -1, -1)
+                self._ctx.kv_cache_seq_cp(0, slot.seq_id, -1, -1)
+                slot.pos = len(prefix_tokens)
+                slot.output = []
+                slot.text = ""
+                slot.decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+                slot.last_token = None
+                slot.sampler = self._make_sampler(params)
+
+            # 2. 배치 구성: 생성 중인 슬롯은 토큰 1개씩, 프롬프트가 남은 슬롯은 남는 자리만큼
+            self._batch.reset()
+            for slot in slots:
+                slot.i_batch = -1
+                if slot.active and not slot.pending and slot.last_token is not None:
+                    slot.i_batch = self._batch_add(slot.last_token, slot.pos, slot.seq_id, True)
+                    slot.pos += 1
+            for slot in slots:
+                room = self._n_batch - self._batch.n_tokens()
+                if not slot.active or not slot.pending or room <= 0:
+                    continue
+                chunk, slot.pending = slot.pending[:room], slot.pending[room:]
+                for offset, token in enumerate(chunk):
+                    is_last = not slot.pending and offset == len(chunk) - 1
+                    i = self._batch_add(token, slot.pos, slot.seq_id, is_last)
+                    slot.pos += 1
+                    if is_last:
+                        slot.i_batch = i
+
+            if self._batch.n_tokens() == 0:
+                continue
+            self._ctx.decode(self._batch)
+
+            # 3. 로짓이 계산된 슬롯에서 다음 토큰 샘플링
+            for slot in slots:
+                if slot.i_batch < 0:
+                    continue
+                token = slot.sampler.sample(self._ctx, slot.i_batch)
+                if llama_cpp.llama_vocab_is_eog(self.llm._model.vocab, token):
+                    _finish(slot)
+                    continue
+                slot.output.append(token)
+                stopped = self._append_token(slot, token, stop, stop_len) if stop else False
+                if stopped or len(slot.output) >= slot.max_new:
+                    _finish(slot)
+                else:
+                    slot.last_token = token
+
+        return results
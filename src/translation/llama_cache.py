@@ -0,0 +1,86 @@
+"""
+src/translation/llama_cache.py
+==============================
+llama.cpp 기반 로컬 엔진(LFM2, LFM2-KOEN, Qwen, Yanolja)의 프롬프트 접두사(prefix) KV 캐시 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **접두사 1회 평가**: 시스템 프롬프트처럼 문장마다 동일한 접두사를 한 번만 평가(prefill)하고 llama 상태를 스냅샷으로 저장합니다.
+2.  **상태 복원**: 다음 문장부터는 저장된 상태를 복원한 뒤 사용자 텍스트 부분만 평가합니다.
+3.  **폴백**: 상태 저장/복원에 실패하면 기존처럼 컨텍스트를 초기화하고 전체 프롬프트를 평가합니다.
+
+짧은 문장은 프롬프트 토큰의 대부분이 시스템 프롬프트이므로 CPU 환경에서 문장당 지연 시간이 크게 줄어듭니다.
+LFM2처럼 순환(recurrent) 레이어가 있는 하이브리드 모델은 KV 캐시를 부분 삭제할 수 없어
+llama-cpp-python의 자동 접두사 매칭이 동작하지 않으므로, 스냅샷 복원 방식이 필요합니다.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, List, Tuple
+
+
+class PromptPrefixCache:
+    """
+    접두사 문자열별로 llama 상태 스냅샷을 보관하는 LRU 캐시입니다.
+    (src, dest) 언어 쌍마다 접두사가 달라지므로 최근 사용한 몇 개만 유지합니다.
+
+    사용 예시:
+        tokens = self.prefix_cache.prepare(prefix, suffix)
+        output = self.llm(tokens, max_tokens=512, ...)
+    """
+
+    def __init__(self, llm: Any, max_entries: int = 8):
+        """
+        Args:
+            llm (Llama): llama_cpp.Llama 인스턴스
+            max_entries (int): 보관할 최대 스냅샷 수 (스냅샷 하나는 접두사 길이만큼의 KV 캐시 크기)
+        """
+        self.llm = llm
+        self.max_entries = max(max_entries, 1)
+        self._states: OrderedDict[str, Tuple[List[int], Any]] = OrderedDict()
+
+    def _tokenize(self, text: str, add_bos: bool) -> List[int]:
+        # 문자열 프롬프트를 넘길 때와 동일하게 특수 토큰(<|im_start|> 등)을 해석
+        return self.llm.tokenize(text.encode("utf-8"), add_bos=add_bos, special=True)
+
+    def _restore(self, prefix: str) -> List[int]:
+        """접두사 상태를 복원하고 접두사 토큰을 반환합니다. 캐시에 없으면 평가 후 저장합니다."""
+        cached = self._states.get(prefix)
+        if cached is not None:
+            self._states.move_to_end(prefix)
+            prefix_tokens, state = cached
+            self.llm.load_state(state)
+            return prefix_tokens
+
+        prefix_tokens = self._tokenize(prefix, add_bos=True)
+        self.llm.reset()
+        self.llm.eval(prefix_tokens)
+        self._states[prefix] = (prefix_tokens, self.llm.save_state())
+        while len(self._states) > self.max_entries:
+            self._states.popitem(last=False)
+        return prefix_tokens
+
+    def prepare(self, prefix: str, suffix: str) -> List[int]:
+        """
+        접두사 상태를 복원하고, 모델에 전달할 전체 프롬프트 토큰을 반환합니다.
+        반환된 토큰은 복원된 상태의 토큰으로 시작하므로 llama-cpp-python이 접두사 평가를 건너뜁니다.
+
+        Args:
+            prefix (str): 문장마다 동일한 프롬프트 앞부분 (시스템 프롬프트 등)
+            suffix (str): 번역할 텍스트를 포함한 프롬프트 뒷부분
+
+        Returns:
+            List[int]: 전체 프롬프트 토큰 (접두사 토큰 + 뒷부분 토큰)
+        """
+        try:
+            prefix_tokens = self._restore(prefix)
+        except Exception as e:
+            # 상태 저장/복원 실패 시 캐시를 비우고 기존 방식(초기화 후 전체 평가)으로 진행
+            logging.warning(f"[PromptPrefixCache] 접두사 상태 복원 실패, 전체 프롬프트를 평가합니다: {e}")
+            self.clear()
+            self.llm.reset()
+            return self._tokenize(prefix + suffix, add_bos=True)
+        return prefix_tokens + self._tokenize(suffix, add_bos=False)
+
+    def clear(self):
+        """저장된 모든 스냅샷을 삭제합니다."""
+        self._states.clear()
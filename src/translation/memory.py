@@ -0,0 +1,285 @@
+"""
+src/translation/memory.py
+=========================
+디스크 기반 번역 메모리(Translation Memory)를 제공하는 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **번역 결과 영구 저장**: (엔진, 모델 ID, 원본 언어, 대상 언어, 정규화된 원문 해시)를 키로 SQLite에 번역 결과를 저장합니다.
+2.  **캐시 우선 번역**: `translate_batch` 앞단에서 캐시를 조회하여, 캐시 미스(miss) 문장만 실제 엔진으로 전달합니다.
+3.  **동시성 안전성**: 스레드별 커넥션과 SQLite WAL 모드를 사용하여 ThreadPoolExecutor 및 다중 프로세스 환경에서도 안전하게 동작합니다.
+4.  **통계 기록**: 캐시 적중/미스 횟수를 `src.benchmark.global_benchmark`에 기록합니다.
+5.  **파일 간 중복 제거**: 배치 처리(`src.translation.dedup.batch_dedup`) 중에는 다른 파일과 겹치는 문장을 한 번만 번역합니다.
+
+환경 변수:
+- `TRANSLATION_MEMORY`: `0`/`false`/`off`로 설정하면 번역 메모리를 비활성화합니다. (기본값: 활성화)
+- `TRANSLATION_MEMORY_PATH`: SQLite 파일 경로 (기본값: `.cache/translation_memory.sqlite3`)
+"""
+
+import os
+import hashlib
+import logging
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .base import BaseTranslator, ProgressCallback, track_fallbacks
+from .dedup import get_active_dedup
+from src.benchmark import global_benchmark as bench
+
+DEFAULT_MEMORY_PATH = Path(".cache") / "translation_memory.sqlite3"
+
+# SQLite 변수 개수 제한(기본 999)을 넘지 않도록 조회를 나누는 단위
+_LOOKUP_CHUNK = 500
+
+
+def normalize_text(text: str) -> str:
+    """
+    캐시 키 생성을 위해 텍스트를 정규화합니다.
+    유니코드 NFC 정규화 후 연속 공백을 하나로 합치고 양끝 공백을 제거합니다.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_hash(text: str) -> str:
+    """정규화된 텍스트의 SHA-256 해시(16진수 문자열)를 반환합니다."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """
+    SQLite 기반의 영구 번역 메모리입니다.
+
+    하나의 인스턴스를 여러 스레드가 공유할 수 있으며, 커넥션은 스레드별로 생성됩니다.
+    여러 프로세스가 같은 파일을 동시에 사용할 수 있도록 WAL 모드와 busy_timeout을 설정합니다.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Args:
+            db_path (Optional[Path]): SQLite 파일 경로. None이면 환경 변수 또는 기본 경로를 사용합니다.
+        """
+        self.db_path = Path(db_path or os.getenv("TRANSLATION_MEMORY_PATH") or DEFAULT_MEMORY_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """현재 스레드 전용 SQLite 커넥션을 반환합니다 (없으면 생성)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # timeout: 다른 프로세스가 쓰기 잠금을 잡고 있을 때 대기할 시간(초)
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        """번역 메모리 테이블을 생성합니다."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    engine TEXT NOT NULL,
+                    model_id TEXT NOT NULL,
+                    src TEXT NOT NULL,
+                    dest TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    source_text TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (engine, model_id, src, dest, text_hash)
+                )
+                """
+            )
+
+    def lookup(self, engine: str, model_id: str, src: str, dest: str, texts: List[str]) -> Dict[str, str]:
+        """
+        캐시에 저장된 번역 결과를 조회합니다.
+
+        Args:
+            engine (str): 엔진 이름
+            model_id (str): 모델 식별자
+            src (str): 원본 언어 코드
+            dest (str): 대상 언어 코드
+            texts (List[str]): 조회할 원문 리스트
+
+        Returns:
+            Dict[str, str]: {원문: 번역문} (캐시 적중한 항목만 포함)
+        """
+        hash_to_texts: Dict[str, List[str]] = {}
+        for text in texts:
+            hash_to_texts.setdefault(text_hash(text), []).append(text)
+
+        found: Dict[str, str] = {}
+        hashes = list(hash_to_texts)
+        conn = self._connect()
+        for i in range(0, len(hashes), _LOOKUP_CHUNK):
+            chunk = hashes[i:i + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT text_hash, translated_text FROM translations "
+                f"WHERE engine=? AND model_id=? AND src=? AND dest=? AND text_hash IN ({placeholders})",
+                (engine, model_id, src, dest, *chunk),
+            ).fetchall()
+            for h, translated in rows:
+                for text in hash_to_texts[h]:
+                    found[text] = translated
+        return found
+
+    def store(self, engine: str, model_id: str, src: str, dest: str, pairs: Dict[str, str]):
+        """
+        번역 결과를 저장합니다. 번역이 비어 있는 결과는 저장하지 않습니다.
+        원문과 같은 번역(숫자, 코드, 고유명사 등)도 저장하며, 폴백 결과는 호출 측(`translate_batch`)에서 미리 제외합니다.
+        """
+        rows = [
+            (engine, model_id, src, dest, text_hash(orig), orig, trans)
+            for orig, trans in pairs.items()
+            if trans and trans.strip()
+        ]
+        if not rows:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(engine, model_id, src, dest, text_hash, source_text, translated_text) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def translate_batch(
+        self,
+        translator: BaseTranslator,
+        engine: str,
+        sentences: List[str],
+        src: str,
+        dest: str,
+        max_workers: int = 1,
+        progress_cb: Optional[ProgressCallback] = None,
+    ) -> List[str]:
+        """
+        번역 메모리를 거쳐 일괄 번역을 수행합니다.
+        캐시에 없는 문장만 `translator.translate_batch`로 전달하고, 결과를 캐시에 저장합니다.
+        엔진이 `record_fallback`으로 기록한 문장(폴백 결과)은 저장하지 않습니다.
+
+        Args:
+            translator (BaseTranslator): 실제 번역 엔진 인스턴스
+            engine (str): 엔진 이름 (캐시 키)
+            sentences (List[str]): 번역할 문장 리스트
+            src (str): 원본 언어 코드
+            dest (str): 대상 언어 코드
+            max_workers (int): 엔진에 전달할 워커 수
+            progress_cb (Optional[ProgressCallback]): 진행률 콜백 함수
+
+        Returns:
+            List[str]: 번역된 문장 리스트 (입력 순서 유지)
+        """
+        total = len(sentences)
+        if total == 0:
+            return []
+
+        model_id = translator.model_id or ""
+        try:
+            cached = self.lookup(engine, model_id, src, dest, sentences)
+        except sqlite3.Error as e:
+            logging.warning(f"[TranslationMemory] 조회 실패, 캐시 없이 번역합니다: {e}")
+            cached = {}
+
+        misses = [s for s in sentences if s not in cached]
+        hits = total - len(misses)
+        bench.add_stat("Translation Memory (Hit)", 0.0, count=hits, unit="sentences")
+        bench.add_stat("Translation Memory (Miss)", 0.0, count=len(misses), unit="sentences")
+        logging.info(f"[TranslationMemory] 적중 {hits}개 / 미스 {len(misses)}개 ({engine}, {src}->{dest})")
+
+        translated: Dict[str, str] = dict(cached)
+        if misses:
+            # 캐시 적중분은 이미 완료된 것으로 보고 진행률을 보정
+            def _miss_progress(local_ratio: float, msg: str):
+                if progress_cb:
+                    progress_cb((hits + local_ratio * len(misses)) / total, msg)
+
+            with track_fallbacks() as fallbacks:
+                results = translator.translate_batch(
+                    misses,
+                    src=src,
+                    dest=dest,
+                    max_workers=max_workers,
+                    progress_cb=_miss_progress,
+                )
+            new_pairs = dict(zip(misses, results))
+            translated.update(new_pairs)
+            # 폴백(Google 번역, 원문 반환 등)으로 처리된 문장은 이 엔진의 결과로 저장하지 않음 (다음에 다시 시도)
+            if fallbacks:
+                logging.info(f"[TranslationMemory] 폴백 결과 {len(fallbacks)}개는 저장하지 않습니다 ({engine})")
+            try:
+                self.store(engine, model_id, src, dest,
+                           {text: value for text, value in new_pairs.items() if text not in fallbacks})
+            except sqlite3.Error as e:
+                logging.warning(f"[TranslationMemory] 저장 실패(무시됨): {e}")
+        elif progress_cb:
+            progress_cb(1.0, f"({total}/{total})")
+
+        return [translated.get(s, "") for s in sentences]
+
+
+_memory: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def is_memory_enabled() -> bool:
+    """환경 변수 `TRANSLATION_MEMORY`로 번역 메모리 사용 여부를 확인합니다."""
+    return os.getenv("TRANSLATION_MEMORY", "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """
+    프로세스 전역 번역 메모리 인스턴스를 반환합니다.
+    비활성화되어 있거나 초기화에 실패하면 None을 반환합니다.
+    """
+    global _memory
+    if not is_memory_enabled():
+        return None
+    with _memory_lock:
+        if _memory is None:
+            try:
+                _memory = TranslationMemory()
+            except (sqlite3.Error, OSError) as e:
+                logging.warning(f"[TranslationMemory] 초기화 실패, 비활성화합니다: {e}")
+                return None
+        return _memory
+
+
+def translate_with_memory(
+    translator: BaseTranslator,
+    engine: str,
+    sentences: List[str],
+    src: str,
+    dest: str,
+    max_workers: int = 1,
+    progress_cb: Optional[ProgressCallback] = None,
+) -> List[str]:
+    """
+    번역 메모리가 활성화되어 있으면 캐시를 거쳐, 아니면 엔진으로 직접 일괄 번역합니다.
+    `src.core`의 파이프라인에서 사용하는 진입점입니다.
+    """
+    memory = get_translation_memory()
+
+    def _translate(texts: List[str]) -> List[str]:
+        if memory is None:
+            return translator.translate_batch(
+                texts, src=src, dest=dest, max_workers=max_workers, progress_cb=progress_cb
+            )
+        return memory.translate_batch(
+            translator, engine, texts, src, dest, max_workers=max_workers, progress_cb=progress_cb
+        )
+
+    # 여러 파일 배치(`batch_dedup()`)에서는 다른 파일이 번역했거나 번역 중인 문장을 다시 요청하지 않음
+    dedup = get_active_dedup()
+    if dedup is None:
+        return _translate(sentences)
+    return dedup.translate((engine, translator.model_id or "", src, dest), sentences, _translate)
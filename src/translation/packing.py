@@ -0,0 +1,226 @@
+"""
+src/translation/packing.py
+==========================
+여러 문장을 하나의 LLM 요청으로 묶어(packing) 번역하기 위한 유틸리티 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **토큰 예산 기반 묶음 생성**: 문장들을 추정 토큰 수 예산 안에서 하나의 요청 단위로 묶습니다.
+2.  **JSON 프레이밍**: 각 문장에 번호(키)를 붙인 JSON 객체로 요청하고, 같은 키의 JSON 객체로 응답을 받습니다.
+3.  **부분 재시도**: 응답에서 누락되거나 파싱할 수 없는 키의 문장만 다시 나누어 재요청하고, API 요청 자체가 실패하면 폴백 엔진을 사용합니다.
+4.  **요청 재시도**: `complete_with_retry`로 429/503 등 재시도 가능한 API 오류를 지수 백오프(Retry-After가 있으면 그 시간)로 재시도하고,
+    적응형 동시성 제한기에 알려 동시 요청 수를 줄입니다.
+
+OpenAI, Gemini 엔진의 `translate_batch`에서 사용됩니다.
+"""
+
+import json
+import re
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .base import ProgressCallback, record_fallback
+from .executor import parallel_map, report_throttle, retry_after_from_error
+from src.benchmark import global_benchmark as bench
+
+# 코드 블록(```json ... ```) 감싸기 제거용 패턴
+_CODE_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def complete_with_retry(
+    request_fn: Callable[[], Optional[str]],
+    name: str,
+    rate_key: str,
+    retry_markers: Tuple[str, ...],
+    attempts: int = 3,
+) -> str:
+    """
+    LLM API 요청을 보내고 응답 텍스트를 반환합니다.
+    오류 메시지에 retry_markers(대소문자 무시) 중 하나가 있으면 재시도 가능한 오류로 보고 최대 attempts회까지
+    지수 백오프(Retry-After가 있으면 그 시간, 최대 30초)로 재시도하며, 적응형 동시성 제한기에도 알립니다.
+
+    Args:
+        request_fn: 요청을 보내고 응답 텍스트(없으면 None)를 반환하는 함수
+        name: 오류 메시지에 표시할 엔진 이름 (예: "OpenAI")
+        rate_key: 적응형 동시성 제한기 키 (보통 엔진 클래스 이름)
+        retry_markers: 재시도 가능한 오류를 나타내는 문자열 (예: "429", "503", "overloaded")
+
+    Raises:
+        Exception: 재시도 후에도 실패하거나 응답이 비어 있는 경우 마지막 오류
+    """
+    last_error: Exception = RuntimeError(f"Empty response from {name}")
+    for attempt in range(attempts):
+        try:
+            text = request_fn()
+            if text:
+                return text.strip()
+            raise RuntimeError(f"Empty response from {name}")
+        except Exception as e:
+            last_error = e
+            msg = str(e).lower()
+            if any(marker.lower() in msg for marker in retry_markers):
+                retry_after = retry_after_from_error(e)
+                report_throttle(rate_key, retry_after)
+                if attempt < attempts - 1:
+                    time.sleep(min(max(2 ** attempt, retry_after or 0), 30)) # 지수 백오프 (최대 30초)
+                    continue
+            break
+
+    raise last_error
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수를 보수적으로 추정합니다.
+    영문은 약 4자/토큰이지만 한국어·일본어·중국어는 1자에 가까우므로 3자/토큰으로 계산합니다.
+    """
+    return len(text) // 3 + 1
+
+
+def pack_sentences(sentences: List[str], max_tokens: int, max_items: int) -> List[List[int]]:
+    """
+    문장 인덱스를 토큰 예산(max_tokens)과 최대 문장 수(max_items) 안에서 묶습니다.
+    예산보다 긴 문장은 단독 묶음이 됩니다.
+
+    Returns:
+        List[List[int]]: 묶음별 문장 인덱스 리스트 (입력 순서 유지)
+    """
+    packs: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for idx, text in enumerate(sentences):
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append(idx)
+        current_tokens += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+
+def build_packed_prompt(texts: List[str], src_name: str, dest_name: str) -> str:
+    """
+    여러 문장을 번호가 붙은 JSON 객체로 감싼 번역 프롬프트를 생성합니다.
+    """
+    payload = json.dumps({str(i): t for i, t in enumerate(texts)}, ensure_ascii=False)
+    return (
+        f"Translate each value of the JSON object from {src_name} to {dest_name}.\n"
+        f"Maintain technical terms and formatting.\n"
+        f"Return only a JSON object with exactly the same keys, where each value is the translation "
+        f"of the value with the same key. Do not merge, split or omit entries.\n\n"
+        f"{payload}"
+    )
+
+
+def parse_packed_response(response_text: str, expected: int) -> Dict[int, str]:
+    """
+    LLM 응답에서 JSON 객체를 찾아 {인덱스: 번역문} 딕셔너리로 변환합니다.
+    파싱에 실패하면 빈 딕셔너리를, 일부 키만 있으면 유효한 키만 반환합니다.
+    """
+    text = _CODE_FENCE_PATTERN.sub("", (response_text or "").strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        return {}
+    try:
+        data = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    parsed: Dict[int, str] = {}
+    for key, value in data.items():
+        try:
+            idx = int(key)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= idx < expected and isinstance(value, str) and value.strip():
+            parsed[idx] = value.strip()
+    return parsed
+
+
+def translate_packed(
+    sentences: List[str],
+    build_prompt: Callable[[List[str]], str],
+    complete_fn: Callable[[str], str],
+    fallback_fn: Callable[[str], str],
+    single_fn: Optional[Callable[[str], str]] = None,
+    max_workers: int = 1,
+    progress_cb: Optional[ProgressCallback] = None,
+    max_tokens: int = 1500,
+    max_items: int = 50,
+    rate_key: Optional[str] = None,
+    adaptive: bool = False,
+) -> List[str]:
+    """
+    문장들을 묶어서 LLM에 요청하고 결과를 원래 순서대로 돌려줍니다.
+
+    Args:
+        sentences (List[str]): 번역할 문장 리스트
+        build_prompt (Callable): 문장 리스트를 받아 프롬프트를 생성하는 함수
+        complete_fn (Callable): 프롬프트를 받아 응답 텍스트를 반환하는 함수 (재시도 포함, 실패 시 예외)
+        fallback_fn (Callable): API 요청 자체가 실패했을 때 단일 문장을 번역하는 폴백 함수
+        single_fn (Optional[Callable]): 응답에서 누락된 단일 문장을 다시 번역하는 함수 (기본값: fallback_fn)
+        max_workers (int): 동시에 처리할 요청(묶음) 수
+        progress_cb (Optional[ProgressCallback]): 진행률 콜백 함수
+        max_tokens (int): 요청 하나에 담을 원문의 추정 토큰 예산
+        max_items (int): 요청 하나에 담을 최대 문장 수
+        rate_key (Optional[str]): 요청 속도 제한을 공유할 키 (보통 엔진 클래스 이름)
+        adaptive (bool): True면 rate_key별 적응형 동시성 한도 사용 (max_workers는 시작 한도)
+
+    Returns:
+        List[str]: 번역된 문장 리스트 (입력 순서 유지)
+    """
+    total = len(sentences)
+    if total == 0:
+        return []
+    single_fn = single_fn or fallback_fn
+
+    results: List[str] = [""] * total
+    # 빈 문장은 요청하지 않음 (translate와 동일하게 빈 문자열 반환)
+    targets = [i for i, s in enumerate(sentences) if s and s.strip()]
+    packs = [[targets[j] for j in pack] for pack in pack_sentences([sentences[i] for i in targets], max_tokens, max_items)]
+
+    def _translate_pack(indices: List[int]) -> Dict[int, str]:
+        texts = [sentences[i] for i in indices]
+        try:
+            response = complete_fn(build_prompt(texts))
+            bench.add_stat("Packed Requests", 0.0, count=1, volume=len(texts), unit="sentences")
+        except Exception as e:
+            # API 자체가 실패한 경우(재시도 소진)에는 묶음 전체를 폴백 엔진으로 처리
+            logging.error(f"Packed request failed (Fallback per sentence): {e}")
+            bench.add_stat("Packed Fallback", 0.0, count=1, volume=len(texts), unit="sentences")
+            record_fallback(*texts)
+            return {i: fallback_fn(sentences[i]) for i in indices}
+
+        parsed = parse_packed_response(response, len(indices))
+        translated = {indices[k]: v for k, v in parsed.items()}
+        missing = [i for i in indices if i not in translated]
+        if not missing:
+            return translated
+
+        if len(missing) == 1:
+            translated[missing[0]] = single_fn(sentences[missing[0]])
+            return translated
+
+        # 파싱되지 않은 문장만 절반으로 나누어 재요청
+        logging.warning(f"Packed response missing {len(missing)}/{len(indices)} entries. Retrying with smaller packs.")
+        mid = len(missing) // 2
+        translated.update(_translate_pack(missing[:mid]))
+        translated.update(_translate_pack(missing[mid:]))
+        return translated
+
+    completed = total - len(targets)
+    for _, future in parallel_map(_translate_pack, packs, max_workers, rate_key=rate_key, adaptive=adaptive):
+        try:
+            for idx, text in future.result().items():
+                results[idx] = text
+                completed += 1
+        except Exception as e:
+            logging.error(f"Packed translation error: {e}")
+        if progress_cb:
+            progress_cb(completed / total, f"({completed}/{total})")
+
+    return results
@@ -0,0 +1,303 @@
+"""
+src/translation/process_pool.py
+===============================
+로컬 모델 엔진을 여러 프로세스로 복제하여 실행하는 프로세스 풀 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **코어 분할**: 현재 프로세스에 할당된 CPU를 물리 코어 단위로 나누어 복제본마다 겹치지 않게 할당합니다.
+2.  **복제본 실행**: 각 워커 프로세스는 할당된 코어에 고정(affinity)된 상태로 모델을 로드하며,
+    모델 스레드 수(`TRANSLATOR_NUM_THREADS`)를 할당된 물리 코어 수에 맞춥니다.
+3.  **작업 분배**: 문장을 작은 묶음으로 나누어 공유 작업 큐에 넣고, 먼저 끝난 워커가 다음 묶음을 가져갑니다.
+    결과는 입력 순서대로 병합됩니다.
+
+하나의 프로세스로는 코어가 많은 서버를 다 활용할 수 없는 경우(메모리 대역폭 한계 전까지) 복제본 수에 비례해 처리량이 늘어납니다.
+
+환경 변수:
+- `TRANSLATOR_REPLICAS`: 로컬 엔진 복제본(프로세스) 수. `1`이면 현재 프로세스에서 실행 (기본값: 1)
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+import multiprocessing as mp
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .base import BaseTranslator, ProgressCallback
+
+# 결과 큐 대기 중 워커 생존 여부를 확인하는 주기(초)
+_POLL_INTERVAL = 1.0
+
+
+def get_replica_count() -> int:
+    """환경 변수 `TRANSLATOR_REPLICAS`로 복제본 수를 읽습니다."""
+    try:
+        return max(int(os.getenv("TRANSLATOR_REPLICAS", "1")), 1)
+    except ValueError:
+        return 1
+
+
+def _available_cpus() -> List[int]:
+    """현재 프로세스가 사용할 수 있는 논리 CPU 번호 목록을 반환합니다."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _physical_cores(cpus: List[int]) -> List[List[int]]:
+    """
+    논리 CPU를 물리 코어(하이퍼스레딩 형제) 단위로 묶습니다.
+    Linux sysfs의 토폴로지 정보가 없으면 논리 CPU 하나를 코어 하나로 취급합니다.
+    """
+    groups: Dict[Tuple[str, str], List[int]] = {}
+    for cpu in cpus:
+        topology = Path(f"/sys/devices/system/cpu/cpu{cpu}/topology")
+        try:
+            key = (
+                (topology / "physical_package_id").read_text().strip(),
+                (topology / "core_id").read_text().strip(),
+            )
+        except OSError:
+            key = ("cpu", str(cpu))
+        groups.setdefault(key, []).append(cpu)
+    return sorted(groups.values(), key=lambda g: g[0])
+
+
+def partition_cores(replicas: int) -> List[Tuple[Set[int], int]]:
+    """
+    사용 가능한 CPU를 복제본 수만큼 겹치지 않게 나눕니다.
+
+    Args:
+        replicas (int): 복제본 수
+
+    Returns:
+        List[Tuple[Set[int], int]]: 복제본별 (고정할 논리 CPU 집합, 모델 스레드 수)
+    """
+    cores = _physical_cores(_available_cpus())
+    if len(cores) < replicas:
+        # 물리 코어보다 복제본이 많으면 논리 CPU 단위로 나눔
+        cores = [[cpu] for cpu in _available_cpus()]
+    replicas = max(min(replicas, len(cores)), 1)
+
+    partitions = []
+    base, extra = divmod(len(cores), replicas)
+    start = 0
+    for i in range(replicas):
+        size = base + (1 if i < extra else 0)
+        assigned = cores[start:start + size]
+        start += size
+        # 스레드 수는 물리 코어 수에 맞춤 (하이퍼스레딩 형제는 같은 코어를 공유)
+        partitions.append(({cpu for core in assigned for cpu in core}, len(assigned)))
+    return partitions
+
+
+def _worker_main(worker_id: int, engine_name: str, cpus: Set[int], num_threads: int,
+                 task_queue, result_queue):
+    """
+    워커 프로세스 진입점입니다.
+    코어를 고정하고 모델을 로드한 뒤, 작업 큐에서 문장 묶음을 가져와 번역합니다.
+    """
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError as e:
+            logging.warning(f"[ProcessPool] worker {worker_id}: CPU 고정 실패(무시됨): {e}")
+    os.environ["TRANSLATOR_NUM_THREADS"] = str(num_threads)
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    # 워커 안에서 다시 프로세스 풀을 만들지 않도록 함
+    os.environ["TRANSLATOR_REPLICAS"] = "1"
+
+    try:
+        from . import create_translator
+        translator = create_translator(engine_name)
+    except Exception as e:
+        result_queue.put(("init_error", worker_id, None, None, repr(e)))
+        return
+    result_queue.put(("ready", worker_id, None, None, translator.memory_footprint()))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        job_id, chunk_id, sentences, src, dest = task
+        result_queue.put(("taken", worker_id, job_id, chunk_id, None))
+        try:
+            results = translator.translate_batch(sentences, src=src, dest=dest, max_workers=1)
+            result_queue.put(("done", worker_id, job_id, chunk_id, results))
+        except Exception as e:
+            result_queue.put(("error", worker_id, job_id, chunk_id, repr(e)))
+
+
+class ProcessPoolTranslator(BaseTranslator):
+    """
+    로컬 모델 엔진의 복제본 K개를 워커 프로세스로 실행하는 번역기입니다.
+    레지스트리가 `TRANSLATOR_REPLICAS > 1`일 때 로컬 엔진 대신 생성합니다.
+    """
+
+    # 한 번에 하나의 작업(translate_batch 호출)만 처리
+    thread_safe = False
+
+    # 작업 큐에 넣는 문장 묶음의 최대 크기 (작을수록 부하 분산이 고르고, 클수록 배치 디코딩 효율이 높음)
+    chunk_size: int = 16
+
+    def __init__(self, engine_name: str, replicas: int):
+        """
+        Args:
+            engine_name (str): 복제할 엔진 이름
+            replicas (int): 복제본(워커 프로세스) 수
+
+        Raises:
+            RuntimeError: 워커 프로세스에서 모델 로드에 실패한 경우
+        """
+        from . import get_translator_class
+
+        self.engine_name = engine_name
+        self.model_id = get_translator_class(engine_name).model_id
+        self._lock = threading.Lock()
+        self._job_counter = 0
+        self._memory_bytes = 0
+
+        # llama.cpp, CTranslate2 등 네이티브 스레드를 쓰는 라이브러리와 fork는 안전하지 않으므로 spawn 사용
+        ctx = mp.get_context("spawn")
+        self._task_queue = ctx.Queue()
+        self._result_queue = ctx.Queue()
+        self._workers: Dict[int, mp.Process] = {}
+
+        for worker_id, (cpus, num_threads) in enumerate(partition_cores(replicas)):
+            process = ctx.Process(
+                target=_worker_main,
+                args=(worker_id, engine_name, cpus, num_threads, self._task_queue, self._result_queue),
+                name=f"translator-{engine_name}-{worker_id}",
+                daemon=True,
+            )
+            process.start()
+            self._workers[worker_id] = process
+            logging.info(
+                f"[ProcessPool] {engine_name} 복제본 {worker_id} 시작 "
+                f"(CPU {len(cpus)}개, 스레드 {num_threads}개)"
+            )
+
+        self._wait_ready()
+
+    def _wait_ready(self):
+        """모든 워커의 모델 로드 완료를 기다립니다. 하나라도 실패하면 풀을 종료하고 예외를 발생시킵니다."""
+        pending = set(self._workers)
+        while pending:
+            try:
+                kind, worker_id, _, _, payload = self._result_queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                dead = [w for w in pending if not self._workers[w].is_alive()]
+                if dead:
+                    self.close()
+                    raise RuntimeError(f"{self.engine_name} 복제본 프로세스가 모델 로드 중 종료되었습니다.")
+                continue
+            if kind == "init_error":
+                self.close()
+                raise RuntimeError(f"{self.engine_name} 복제본 모델 로드 실패: {payload}")
+            if kind == "ready":
+                self._memory_bytes += payload or 0
+                pending.discard(worker_id)
+
+    @property
+    def replicas(self) -> int:
+        return len(self._workers)
+
+    def memory_footprint(self) -> int:
+        """모든 복제본의 메모리 사용량 합계를 반환합니다."""
+        return self._memory_bytes
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        """텍스트 하나를 복제본 중 하나에서 번역합니다."""
+        return self.translate_batch([text], src, dest)[0]
+
+    def translate_batch(
+        self,
+        sentences: List[str],
+        src: str,
+        dest: str,
+        max_workers: int = 1,
+        progress_cb: Optional[ProgressCallback] = None
+    ) -> List[str]:
+        """
+        문장을 묶음 단위로 공유 작업 큐에 넣고, 모든 복제본이 나누어 번역한 결과를 입력 순서대로 병합합니다.
+        max_workers는 사용하지 않습니다 (병렬도는 복제본 수로 결정).
+
+        Raises:
+            RuntimeError: 모든 복제본 프로세스가 종료된 경우
+        """
+        total = len(sentences)
+        if total == 0:
+            return []
+
+        with self._lock:
+            self._job_counter += 1
+            job_id = self._job_counter
+
+            size = max(1, min(self.chunk_size, -(-total // max(self.replicas, 1))))
+            chunks = {cid: (start, sentences[start:start + size]) for cid, start in enumerate(range(0, total, size))}
+            for cid, (_, chunk) in chunks.items():
+                self._task_queue.put((job_id, cid, chunk, src, dest))
+
+            results: List[str] = [""] * total
+            remaining = set(chunks)
+            in_flight: Dict[int, Optional[int]] = {}
+            completed = 0
+
+            while remaining:
+                try:
+                    kind, worker_id, msg_job, chunk_id, payload = self._result_queue.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    self._recover_dead_workers(job_id, chunks, remaining, in_flight, src, dest)
+                    continue
+                if msg_job != job_id:
+                    continue  # 이전 작업의 늦은 메시지
+
+                if kind == "taken":
+                    in_flight[worker_id] = chunk_id
+                    continue
+                in_flight.pop(worker_id, None)
+                if chunk_id not in remaining:
+                    continue
+
+                start, chunk = chunks[chunk_id]
+                if kind == "done":
+                    results[start:start + len(chunk)] = payload
+                else:
+                    logging.error(f"[ProcessPool] 묶음 번역 실패 (원문 유지): {payload}")
+                    results[start:start + len(chunk)] = chunk
+                remaining.discard(chunk_id)
+                completed += len(chunk)
+                if progress_cb:
+                    progress_cb(completed / total, f"({completed}/{total})")
+
+        return results
+
+    def _recover_dead_workers(self, job_id: int, chunks, remaining: Set[int],
+                              in_flight: Dict[int, Optional[int]], src: str, dest: str):
+        """비정상 종료된 워커가 처리 중이던 묶음을 다시 큐에 넣습니다."""
+        for worker_id, process in list(self._workers.items()):
+            if process.is_alive():
+                continue
+            logging.error(f"[ProcessPool] {self.engine_name} 복제본 {worker_id}이(가) 종료되었습니다 (exitcode={process.exitcode}).")
+            del self._workers[worker_id]
+            chunk_id = in_flight.pop(worker_id, None)
+            if chunk_id is not None and chunk_id in remaining:
+                self._task_queue.put((job_id, chunk_id, chunks[chunk_id][1], src, dest))
+        if not self._workers:
+            raise RuntimeError(f"{self.engine_name} 복제본 프로세스가 모두 종료되었습니다.")
+
+    def close(self):
+        """워커 프로세스를 모두 종료합니다. 레지스트리가 엔진을 언로드할 때 호출됩니다."""
+        for _ in self._workers:
+            try:
+                self._task_queue.put(None)
+            except (OSError, ValueError):
+                pass
+        deadline = time.time() + 10.0
+        for process in self._workers.values():
+            process.join(timeout=max(deadline - time.time(), 0.1))
+            if process.is_alive():
+                process.terminate()
+        self._workers.clear()
@@ -0,0 +1,302 @@
+"""
+src/translation/registry.py
+===========================
+번역 엔진 인스턴스를 프로세스 전역에서 재사용하기 위한 레지스트리 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **엔진 상주**: 한 번 생성한 엔진(특히 NLLB, LFM2, Qwen, Yanolja 등 로컬 모델)을 메모리에 유지하여 파일마다 모델을 다시 로드하지 않습니다.
+2.  **참조 카운팅**: `lease()`로 엔진을 빌려 쓰는 동안에는 절대 언로드되지 않습니다.
+3.  **메모리 예산**: 설정된 RAM 예산을 넘으면 사용 중이 아닌 엔진부터 LRU 순서로 언로드합니다.
+4.  **유휴 시간 만료**: 일정 시간 사용되지 않은 엔진은 백그라운드 스레드가 언로드합니다.
+5.  **복제본 풀**: `TRANSLATOR_REPLICAS > 1`이면 로컬 모델 엔진을 코어가 분할된 프로세스 풀(`ProcessPoolTranslator`)로 생성합니다.
+    복제본 수는 레지스트리 키에 포함되므로, 작업마다 복제본 수가 다르면 그 수에 맞는 엔진을 따로 로드합니다.
+6.  **미리 로드**: `prefetch()`로 엔진을 백그라운드 스레드에서 로드하여, 문서 변환과 엔진 준비를 동시에 진행합니다.
+
+환경 변수:
+- `TRANSLATOR_RAM_BUDGET_MB`: 상주 엔진의 총 메모리 예산(MB). `0`이면 제한 없음 (기본값: 0)
+- `TRANSLATOR_IDLE_TTL`: 유휴 엔진 언로드까지의 시간(초). `0`이면 만료 없음 (기본값: 1800)
+- `ENGINE_PREFETCH`: `0`이면 문서 변환 중 엔진 미리 로드를 끕니다 (기본값: 1)
+"""
+
+import gc
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Tuple
+
+from .base import BaseTranslator
+
+
+@dataclass
+class _RegistryEntry:
+    """레지스트리에 상주하는 엔진 한 개의 상태입니다."""
+    translator: BaseTranslator
+    memory_bytes: int = 0
+    refcount: int = 0
+    last_used: float = field(default_factory=time.time)
+    # 스레드 안전하지 않은 엔진(llama.cpp 등)을 여러 작업이 동시에 쓰지 않도록 직렬화하는 잠금
+    usage_lock: threading.RLock = field(default_factory=threading.RLock)
+
+
+class TranslatorRegistry:
+    """
+    엔진 이름별로 번역기 인스턴스를 하나씩 유지하는 레지스트리입니다.
+    CLI 배치, Streamlit 세션 등 같은 프로세스 안의 모든 작업이 인스턴스를 공유합니다.
+    """
+
+    def __init__(self, ram_budget_mb: Optional[int] = None, idle_ttl: Optional[float] = None):
+        """
+        Args:
+            ram_budget_mb (Optional[int]): 메모리 예산(MB). None이면 환경 변수 또는 0(제한 없음)
+            idle_ttl (Optional[float]): 유휴 만료 시간(초). None이면 환경 변수 또는 1800초
+        """
+        if ram_budget_mb is None:
+            ram_budget_mb = int(os.getenv("TRANSLATOR_RAM_BUDGET_MB", "0"))
+        if idle_ttl is None:
+            idle_ttl = float(os.getenv("TRANSLATOR_IDLE_TTL", "1800"))
+
+        self.ram_budget_bytes = max(ram_budget_mb, 0) * 1024 * 1024
+        self.idle_ttl = max(idle_ttl, 0.0)
+
+        self._entries: Dict[str, _RegistryEntry] = {}
+        self._lock = threading.Lock()
+        # 엔진별 로드 잠금: 같은 엔진을 동시에 두 번 로드하지 않도록 함
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._sweeper: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _resolve(engine_name: str) -> Tuple[str, int]:
+        """
+        엔진 이름에 대한 (레지스트리 키, 복제본 수)를 반환합니다.
+        로컬 모델 엔진은 현재 `TRANSLATOR_REPLICAS` 값을 키에 포함합니다 (예: `nllb@4`).
+        """
+        # 순환 import 방지를 위해 지연 import
+        from . import LOCAL_ENGINES
+        from .process_pool import get_replica_count
+
+        name = engine_name.lower()
+        replicas = get_replica_count() if name in LOCAL_ENGINES else 1
+        return (f"{name}@{replicas}" if replicas > 1 else name), replicas
+
+    @classmethod
+    def _key(cls, engine_name: str) -> str:
+        return cls._resolve(engine_name)[0]
+
+    def acquire(self, engine_name: str) -> BaseTranslator:
+        """
+        엔진 인스턴스를 빌려옵니다. 없으면 생성하여 등록합니다.
+        반드시 `release()`로 반납해야 하며, 가능하면 `lease()` 컨텍스트 매니저를 사용하세요.
+        """
+        key, replicas = self._resolve(engine_name)
+        return self._acquire(engine_name, key, replicas)
+
+    def _acquire(self, engine_name: str, key: str, replicas: int) -> BaseTranslator:
+        """레지스트리 키 `key`의 엔진을 빌려옵니다 (없으면 복제본 `replicas`개로 생성)."""
+        self.evict_idle()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refcount += 1
+                entry.last_used = time.time()
+                return entry.translator
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # 대기하는 동안 다른 스레드가 로드를 마쳤을 수 있음
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refcount += 1
+                    entry.last_used = time.time()
+                    return entry.translator
+
+            t_start = time.time()
+            translator = self._create(engine_name, replicas)
+            memory_bytes = translator.memory_footprint()
+            logging.info(
+                f"[Registry] 엔진 로드 완료: {key} "
+                f"({time.time() - t_start:.2f}초, 약 {memory_bytes / (1024 * 1024):.0f}MB)"
+            )
+
+            with self._lock:
+                self._entries[key] = _RegistryEntry(translator=translator, memory_bytes=memory_bytes, refcount=1)
+                self._enforce_budget_locked(exclude=key)
+
+        self._ensure_sweeper()
+        return translator
+
+    @staticmethod
+    def _create(engine_name: str, replicas: int) -> BaseTranslator:
+        """
+        엔진 인스턴스를 생성합니다.
+        복제본 수가 1보다 크면(로컬 모델 엔진) 복제본 프로세스 풀로 생성합니다.
+        """
+        # 순환 import 방지를 위해 지연 import
+        from . import create_translator
+        from .process_pool import ProcessPoolTranslator
+
+        if replicas > 1:
+            return ProcessPoolTranslator(engine_name, replicas)
+        return create_translator(engine_name)
+
+    def prefetch(self, engine_name: str) -> Optional[threading.Thread]:
+        """
+        엔진을 백그라운드 스레드에서 미리 로드합니다 (예: 문서 변환과 동시에 모델 다운로드/로드).
+        로드가 끝나면 바로 반납하므로 엔진은 레지스트리에 상주하고, 이후 `lease()`는 로드 중이면 기다렸다가 같은 인스턴스를 받습니다.
+        로드 실패는 기록만 하며, 실제 `lease()`에서 다시 시도하여 오류를 전달합니다.
+
+        Returns:
+            Optional[threading.Thread]: 로드 스레드. 이미 로드된 엔진이면 None
+        """
+        key, replicas = self._resolve(engine_name)
+        with self._lock:
+            if key in self._entries:
+                return None
+
+        def _load():
+            try:
+                self._acquire(engine_name, key, replicas)
+            except Exception as e:
+                logging.warning(f"[Registry] 엔진 미리 로드 실패(사용 시 다시 시도): {key}: {e}")
+                return
+            self._release(key)
+
+        thread = threading.Thread(target=_load, name=f"translator-prefetch-{key}", daemon=True)
+        thread.start()
+        return thread
+
+    def release(self, engine_name: str):
+        """`acquire()`로 빌린 엔진을 반납합니다."""
+        self._release(self._key(engine_name))
+
+    def _release(self, key: str):
+        """레지스트리 키 `key`의 엔진을 반납합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refcount = max(entry.refcount - 1, 0)
+            entry.last_used = time.time()
+            self._enforce_budget_locked()
+
+    @contextmanager
+    def lease(self, engine_name: str) -> Iterator[BaseTranslator]:
+        """
+        엔진을 빌려 쓰는 컨텍스트 매니저입니다.
+        스레드 안전하지 않은 엔진은 임대 기간 동안 다른 작업과 직렬화됩니다.
+
+        사용 예시:
+            with get_registry().lease("nllb") as translator:
+                translator.translate_batch(...)
+        """
+        # 임대 중에 환경 변수가 바뀌어도 같은 엔진을 반납하도록 키를 한 번만 계산
+        key, replicas = self._resolve(engine_name)
+        translator = self._acquire(engine_name, key, replicas)
+        entry = self._entries.get(key)
+        usage_lock = None if translator.thread_safe or entry is None else entry.usage_lock
+        try:
+            if usage_lock is not None:
+                usage_lock.acquire()
+            yield translator
+        finally:
+            if usage_lock is not None:
+                usage_lock.release()
+            self._release(key)
+
+    def _unload_locked(self, key: str):
+        """엔진을 레지스트리에서 제거합니다. (`self._lock`을 잡은 상태에서 호출)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        logging.info(f"[Registry] 엔진 언로드: {key}")
+        # 워커 프로세스 등 외부 자원을 가진 엔진은 명시적으로 정리
+        close = getattr(entry.translator, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logging.warning(f"[Registry] 엔진 정리 실패(무시됨): {key}: {e}")
+        del entry
+        gc.collect()
+
+    def _enforce_budget_locked(self, exclude: Optional[str] = None):
+        """
+        메모리 예산을 초과하면 사용 중이 아닌 엔진을 오래된 순서(LRU)로 언로드합니다.
+        사용 중인 엔진만으로 예산을 넘으면 경고만 남깁니다.
+        """
+        if not self.ram_budget_bytes:
+            return
+        total = sum(e.memory_bytes for e in self._entries.values())
+        if total <= self.ram_budget_bytes:
+            return
+
+        idle = sorted(
+            (k for k, e in self._entries.items() if e.refcount == 0 and k != exclude),
+            key=lambda k: self._entries[k].last_used,
+        )
+        for key in idle:
+            total -= self._entries[key].memory_bytes
+            self._unload_locked(key)
+            if total <= self.ram_budget_bytes:
+                return
+        logging.warning(
+            f"[Registry] 사용 중인 엔진만으로 메모리 예산을 초과합니다 "
+            f"({total / (1024 * 1024):.0f}MB > {self.ram_budget_bytes / (1024 * 1024):.0f}MB)"
+        )
+
+    def evict_idle(self):
+        """유휴 만료 시간이 지난 미사용 엔진을 언로드합니다."""
+        if not self.idle_ttl:
+            return
+        now = time.time()
+        with self._lock:
+            expired = [
+                k for k, e in self._entries.items()
+                if e.refcount == 0 and now - e.last_used > self.idle_ttl
+            ]
+            for key in expired:
+                self._unload_locked(key)
+
+    def _ensure_sweeper(self):
+        """유휴 엔진을 주기적으로 정리하는 데몬 스레드를 시작합니다 (한 번만)."""
+        if not self.idle_ttl or self._sweeper is not None:
+            return
+
+        def _sweep():
+            while True:
+                time.sleep(min(self.idle_ttl, 60.0))
+                try:
+                    self.evict_idle()
+                except Exception as e:
+                    logging.warning(f"[Registry] 유휴 엔진 정리 실패(무시됨): {e}")
+
+        self._sweeper = threading.Thread(target=_sweep, name="translator-registry-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def clear(self):
+        """사용 중이 아닌 모든 엔진을 언로드합니다."""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.refcount == 0]:
+                self._unload_locked(key)
+
+
+def is_prefetch_enabled() -> bool:
+    """환경 변수 `ENGINE_PREFETCH`로 문서 변환 중 엔진 미리 로드 여부를 읽습니다."""
+    return os.getenv("ENGINE_PREFETCH", "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+_registry: Optional[TranslatorRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> TranslatorRegistry:
+    """프로세스 전역 번역기 레지스트리를 반환합니다."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = TranslatorRegistry()
+        return _registry
@@ -4,7 +4,9 @@ src/translation/utils.py
 번역 관련 유틸리티 함수들을 모아둔 모듈입니다.
 """
 
-from typing import Optional
+import os
+from pathlib import Path
+from typing import List, Optional
 from .base import BaseTranslator
 
 # 언어 코드 → 언어명 매핑 (OpenAI/Gemini 프롬프트 명확화용)
@@ -24,6 +26,83 @@ LANGUAGE_NAMES = {
     'auto': 'the source language',
 }
 
+def get_num_threads() -> int:
+    """
+    로컬 모델(llama.cpp, CTranslate2)이 사용할 CPU 스레드 수를 반환합니다.
+    환경 변수 `TRANSLATOR_NUM_THREADS`가 있으면 그 값을, 없으면 현재 프로세스에 할당된
+    CPU 수의 절반(하이퍼스레딩 제외한 물리 코어 수 추정)을 사용합니다.
+    """
+    try:
+        num_threads = int(os.getenv("TRANSLATOR_NUM_THREADS", "0"))
+    except ValueError:
+        num_threads = 0
+    if num_threads > 0:
+        return num_threads
+    if hasattr(os, "sched_getaffinity"):
+        cpu_count = len(os.sched_getaffinity(0))
+    else:
+        cpu_count = os.cpu_count() or 8
+    return max(cpu_count // 2, 1)
+
+def is_model_offline() -> bool:
+    """
+    모델 파일을 허브에 확인하지 않고 로컬 캐시/디렉토리에서만 찾을지 여부입니다.
+    환경 변수 `MODEL_OFFLINE` 또는 `HF_HUB_OFFLINE`이 켜져 있으면 True입니다.
+    """
+    return any(
+        os.getenv(name, "0").strip().lower() in ("1", "true", "yes", "on")
+        for name in ("MODEL_OFFLINE", "HF_HUB_OFFLINE")
+    )
+
+def _local_model_dir(repo_id: str) -> Optional[Path]:
+    """환경 변수 `MODEL_DIR`이 있으면 `<MODEL_DIR>/<repo_id>` 경로를 반환합니다."""
+    root = os.getenv("MODEL_DIR", "").strip()
+    return Path(root) / repo_id if root else None
+
+def download_model_file(repo_id: str, filename: str) -> str:
+    """
+    허브 저장소의 모델 파일 경로를 반환합니다 (없으면 다운로드).
+
+    - `MODEL_DIR`이 설정되어 있고 `<MODEL_DIR>/<repo_id>/<filename>`이 있으면 허브에 접속하지 않고 그 파일을 사용합니다.
+      없으면 그 위치로 다운로드합니다.
+    - `MODEL_OFFLINE=1`이면 캐시에 있는 파일만 사용합니다 (최신 버전 확인 요청 없음).
+    """
+    from huggingface_hub import hf_hub_download
+
+    local_dir = _local_model_dir(repo_id)
+    if local_dir is not None and (local_dir / filename).is_file():
+        return str(local_dir / filename)
+    return hf_hub_download(
+        repo_id=repo_id, filename=filename, local_dir=local_dir, local_files_only=is_model_offline()
+    )
+
+def download_model_snapshot(repo_id: str, allow_patterns: Optional[List[str]] = None) -> str:
+    """
+    허브 저장소 전체(또는 allow_patterns에 맞는 파일)의 로컬 디렉토리 경로를 반환합니다 (없으면 다운로드).
+    `MODEL_DIR`, `MODEL_OFFLINE`은 `download_model_file`과 같이 적용됩니다.
+    """
+    from huggingface_hub import snapshot_download
+
+    local_dir = _local_model_dir(repo_id)
+    if local_dir is not None and local_dir.is_dir() and any(local_dir.iterdir()):
+        return str(local_dir)
+    return snapshot_download(
+        repo_id=repo_id, allow_patterns=allow_patterns, local_dir=local_dir, local_files_only=is_model_offline()
+    )
+
+# 토크나이저만 받을 때 필요한 파일 (모델 가중치 제외)
+TOKENIZER_FILES = ["*.json", "*.model", "*.txt"]
+
+def load_tokenizer(repo_id: str):
+    """
+    transformers 토크나이저를 로드합니다.
+    `MODEL_DIR`이 있으면 토크나이저 파일만 그 아래에 받아 두고 로컬 경로에서 로드합니다.
+    """
+    from transformers import AutoTokenizer
+
+    source = download_model_snapshot(repo_id, allow_patterns=TOKENIZER_FILES) if _local_model_dir(repo_id) else repo_id
+    return AutoTokenizer.from_pretrained(source, local_files_only=is_model_offline())
+
 def to_deepl_lang(code: str | None) -> str | None:
     """우리 프로젝트 언어코드(en, ko, ja ...)를 DeepL 코드(EN, KO, JA ...)로 변환"""
     if not code:
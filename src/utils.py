@@ -8,23 +8,26 @@ src/utils.py
 2.  **파일 압축**: 결과 폴더를 ZIP 파일로 압축합니다.
 3.  **이미지 주입**: 로컬 이미지를 Base64로 인코딩하여 HTML에 임베딩합니다 (웹 보안 문제 해결).
 4.  **히스토리 로드**: `output/` 디렉토리를 스캔하여 이전 번역 기록을 불러옵니다.
+5.  **출력 폴더 생성**: 작업마다 겹치지 않는 출력 폴더(`{파일명}_{출발}_to_{도착}_{타임스탬프}`)를 만듭니다.
 """
 
 import re
 import base64
 
 import os
-import nltk
 import logging
 from pathlib import Path
 from pathlib import Path
 from datetime import datetime
-from typing import Union, Optional
-from docling_core.types.doc import DoclingDocument, TableItem, PictureItem
+from typing import TYPE_CHECKING, Union, Optional
+
+# nltk, docling_core는 사용하는 함수 안에서 임포트 (히스토리 로드 등 가벼운 기능만 쓰는 경우 로드 생략)
+if TYPE_CHECKING:
+    from docling_core.types.doc import DoclingDocument, TableItem, PictureItem
 
 def save_and_get_image_path(
-    item: Union[TableItem, PictureItem],
-    doc: DoclingDocument,
+    item: Union["TableItem", "PictureItem"],
+    doc: "DoclingDocument",
     output_dir: Path,
     base_filename: str,
     counters: dict
@@ -42,6 +45,8 @@ def save_and_get_image_path(
     Returns:
         str: 저장된 이미지의 상대 경로 (예: "images/file_table_1.png") 또는 None
     """
+    from docling_core.types.doc import TableItem, PictureItem
+
     # 이미지 폴더 생성
     images_dir = output_dir / "images"
     images_dir.mkdir(exist_ok=True)
@@ -76,11 +81,20 @@ def save_and_get_image_path(
             
     return None
 
+# NLTK 리소스 확인 완료 여부 (프로세스당 한 번만 확인)
+_nltk_ready = False
+
+
 def ensure_nltk_resources():
     """
     문장 분리(Tokenization)에 필요한 NLTK 리소스를 확인하고, 없으면 다운로드합니다.
-    'punkt', 'punkt_tab' 모델을 사용합니다.
+    'punkt', 'punkt_tab' 모델을 사용합니다. 확인은 프로세스당 한 번만 수행합니다.
     """
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    import nltk
+
     try:
         nltk.data.find("tokenizers/punkt")
         nltk.data.find("tokenizers/punkt_tab")
@@ -89,6 +103,7 @@ def ensure_nltk_resources():
         nltk.download("punkt", quiet=True)
         nltk.download("punkt_tab", quiet=True)
         logging.info("NLTK 모델 다운로드 완료.")
+    _nltk_ready = True
 
 
 
@@ -123,10 +138,38 @@ def inject_images(html_content: str, folder_path: Path) -> str:
     pattern = r'src="(images/[^"]+)"'
     return re.sub(pattern, replace_match, html_content)
 
+# 출력 폴더명 패턴: {filename}_{src}_to_{dest}_{YYYYMMDD_HHMMSS}[_{n}]
+# filename에 언더스코어가 포함될 수 있으므로 뒤에서부터 매칭
+# 같은 초에 같은 이름의 파일을 처리하면 두 번째 폴더부터 _2, _3 ... 이 붙음
+_OUTPUT_DIR_PATTERN = re.compile(r"^(.*)_([a-z]{2})_to_([a-z]{2})_(\d{8}_\d{6})(?:_\d+)?$")
+
+def create_output_dir(base_filename: str, source_lang: str, target_lang: str, root: Path = Path("output")) -> Path:
+    """
+    작업 하나의 출력 폴더를 새로 만들어 반환합니다.
+    폴더는 exist_ok=False로 생성하므로, 같은 이름의 파일을 동시에 처리(배치, 여러 사용자)해도
+    서로의 HTML과 이미지를 덮어쓰지 않고 `_2`, `_3` ... 이 붙은 별도 폴더를 사용합니다.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    name = f"{base_filename}_{source_lang}_to_{target_lang}_{timestamp}"
+    root.mkdir(parents=True, exist_ok=True)
+    n = 1
+    while True:
+        output_dir = root / (name if n == 1 else f"{name}_{n}")
+        try:
+            output_dir.mkdir()
+            return output_dir
+        except FileExistsError:
+            n += 1
+
+def parse_output_dir_name(name: str) -> Optional[tuple]:
+    """출력 폴더명을 (파일명, 출발 언어, 도착 언어, 타임스탬프 문자열)로 나눕니다. 형식이 다르면 None."""
+    match = _OUTPUT_DIR_PATTERN.match(name)
+    return match.groups() if match else None
+
 def load_history_from_disk(output_dir: Path = Path("output")) -> list:
     """
     output 디렉토리를 스캔하여 이전 번역 히스토리를 로드합니다.
-    폴더명 형식: {filename}_{src}_to_{dest}_{timestamp}
+    폴더명 형식: {filename}_{src}_to_{dest}_{timestamp}[_{n}]
     
     Args:
         output_dir (Path): 스캔할 출력 디렉토리 경로. 기본값은 "output".
@@ -139,17 +182,11 @@ def load_history_from_disk(output_dir: Path = Path("output")) -> list:
     if not output_dir.exists():
         return history
 
-    # 폴더명 파싱을 위한 정규식 (미리 컴파일하여 효율성 증대)
-    # filename에 언더스코어가 포함될 수 있으므로 뒤에서부터 매칭
-    # timestamp: YYYYMMDD_HHMMSS (15 chars)
-    # lang: 2 chars
-    pattern = re.compile(r"^(.*)_([a-z]{2})_to_([a-z]{2})_(\d{8}_\d{6})$")
-
     for entry in output_dir.iterdir():
         if entry.is_dir():
-            match = pattern.match(entry.name)
-            if match:
-                filename, src, dest, timestamp_str = match.groups()
+            parsed = parse_output_dir_name(entry.name)
+            if parsed:
+                filename, src, dest, timestamp_str = parsed
                 
                 # 타임스탬프 포맷팅 (가독성 좋게)
                 try:
@@ -0,0 +1,152 @@
+"""
+src/warmup.py
+=============
+Docling 모델과 번역 엔진을 미리 준비하는 워밍업 모듈입니다.
+
+이 모듈은 다음 기능을 수행합니다:
+1.  **Docling 모델 준비**: 변환기를 만들고 PDF 파이프라인(레이아웃, TableFormer, 수식 모델)을 미리 로드합니다.
+    `DOCLING_ARTIFACTS_PATH`가 설정되어 있으면 모델 파일을 그 경로에 받아 두고, 이후 허브 접속 없이 그 경로에서 로드합니다.
+2.  **번역 엔진 준비**: 선택한 엔진을 레지스트리에 로드하여 상주시킵니다 (로컬 모델은 `MODEL_DIR` 또는 허브 캐시에 받아 둠).
+3.  **API / 명령**: 서비스 코드(Streamlit 앱 등)는 `warmup()`을 호출하여 프로세스 안에 모델을 상주시키고,
+    배포 시에는 `python -m src.warmup`으로 모델 파일을 미리 받아 두어 첫 요청이 다운로드를 기다리지 않게 합니다.
+
+오프라인 설정:
+- `DOCLING_ARTIFACTS_PATH`: Docling 모델 디렉토리 (Docling이 직접 읽는 환경 변수)
+- `MODEL_DIR`: 로컬 번역 모델 디렉토리 (`<MODEL_DIR>/<repo_id>/...`)
+- `MODEL_OFFLINE=1`: 번역 모델을 허브에 확인하지 않고 로컬 파일만 사용
+
+사용 예시:
+    python -m src.warmup --engine nllb --engine google --download
+"""
+
+import os
+import sys
+import time
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.translation.registry import get_registry
+
+
+def download_docling_models(output_dir: Optional[str] = None) -> Optional[str]:
+    """
+    이 프로젝트의 PDF 파이프라인이 사용하는 Docling 모델(레이아웃, TableFormer, 수식)을 받아 둡니다.
+    OCR과 그림 분류 모델은 사용하지 않으므로 받지 않습니다.
+
+    Returns:
+        Optional[str]: 모델 디렉토리. 경로가 지정되지 않았으면 None (Docling 기본 캐시 사용, 첫 변환 시 다운로드)
+    """
+    output_dir = output_dir or os.getenv("DOCLING_ARTIFACTS_PATH")
+    if not output_dir:
+        return None
+
+    from pathlib import Path
+    from docling.utils.model_downloader import download_models
+
+    download_models(
+        output_dir=Path(output_dir),
+        with_layout=True,
+        with_tableformer=True,
+        with_code_formula=True,
+        with_picture_classifier=False,
+        with_rapidocr=False,
+        with_easyocr=False,
+    )
+    return output_dir
+
+
+def warmup_converter(converter: Any):
+    """변환기의 PDF 파이프라인을 초기화하여 모델을 미리 로드합니다 (첫 변환에서 로드하지 않도록)."""
+    from docling.datamodel.base_models import InputFormat
+
+    converter.initialize_pipeline(InputFormat.PDF)
+
+
+def warmup_engines(engines: Iterable[str]) -> Dict[str, float]:
+    """
+    번역 엔진을 레지스트리에 로드하여 상주시킵니다.
+
+    Returns:
+        Dict[str, float]: 엔진별 로드 시간(초)
+    """
+    registry = get_registry()
+    timings = {}
+    for engine in engines:
+        t_start = time.time()
+        registry.acquire(engine)
+        registry.release(engine)
+        timings[engine] = time.time() - t_start
+    return timings
+
+
+def warmup(
+    engines: Iterable[str] = ("google",),
+    converters: Optional[List[Any]] = None,
+    speed_modes: Iterable[str] = ("balanced",),
+    docling: bool = True,
+    download: bool = False,
+) -> Dict[str, Any]:
+    """
+    Docling 모델과 번역 엔진을 미리 준비합니다.
+
+    Args:
+        engines: 로드할 번역 엔진 이름 목록
+        converters: 이미 만든 변환기 목록 (없으면 speed_modes별로 새로 생성)
+        speed_modes: 변환기를 새로 만들 때의 속도 모드 목록 ("balanced", "fast")
+        docling: Docling 모델을 준비할지 여부
+        download: `DOCLING_ARTIFACTS_PATH`로 Docling 모델 파일을 먼저 받을지 여부
+
+    Returns:
+        Dict[str, Any]: 단계별 소요 시간과 준비된 변환기 목록 ("converters")
+    """
+    result: Dict[str, Any] = {"converters": converters or []}
+
+    if docling:
+        if download:
+            t_start = time.time()
+            path = download_docling_models()
+            if path:
+                result["docling_download"] = time.time() - t_start
+                logging.info(f"[Warmup] Docling 모델 다운로드 완료: {path}")
+
+        t_start = time.time()
+        if not result["converters"]:
+            from src.core import create_converter
+
+            result["converters"] = [create_converter(speed_mode=mode) for mode in speed_modes]
+        for converter in result["converters"]:
+            warmup_converter(converter)
+        result["docling"] = time.time() - t_start
+        logging.info(f"[Warmup] Docling 파이프라인 준비 완료 ({result['docling']:.2f}초)")
+
+    result["engines"] = warmup_engines(engines)
+    for engine, elapsed in result["engines"].items():
+        logging.info(f"[Warmup] 엔진 준비 완료: {engine} ({elapsed:.2f}초)")
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Docling 모델과 번역 엔진 워밍업")
+    parser.add_argument("--engine", action="append", default=None, help="준비할 번역 엔진 (여러 번 지정 가능, 기본값: google)")
+    parser.add_argument("--fast", action="store_true", help="Fast 모드 변환기도 준비")
+    parser.add_argument("--no-docling", action="store_true", help="Docling 모델은 준비하지 않음")
+    parser.add_argument("--download", action="store_true", help="DOCLING_ARTIFACTS_PATH에 Docling 모델 파일을 먼저 받음")
+    args = parser.parse_args()
+
+    try:
+        warmup(
+            engines=args.engine or ["google"],
+            speed_modes=["balanced", "fast"] if args.fast else ["balanced"],
+            docling=not args.no_docling,
+            download=args.download,
+        )
+    except Exception as e:
+        logging.error(f"[Warmup] 실패: {e}")
+        sys.exit(1)